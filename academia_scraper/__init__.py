@@ -4,6 +4,7 @@ Academia das Apostas Brasil Scraper Package
 
 from .models import Odds, Tip
 from .scraper import AcademiaScraperImproved
+from .driver_pool import DriverPool
 
-__all__ = ['Odds', 'Tip', 'AcademiaScraperImproved']
+__all__ = ['Odds', 'Tip', 'AcademiaScraperImproved', 'DriverPool']
 
@@ -0,0 +1,280 @@
+"""
+Motor assíncrono sem navegador (asyncio + aiohttp)
+
+Alternativa ao AcademiaScraperImproved para quando o HTML estático basta:
+a página principal e as de detalhes são baixadas com aiohttp (no máximo
+ASYNC_CONCURRENCY requisições simultâneas), o parsing com lxml roda em um
+pequeno pool de threads para não travar o loop e as tips são enviadas de
+forma assíncrona. As regras de listagem (listing.py) e de extração
+(extraction.py) são as mesmas do scraper com Selenium, assim como o cache
+de detalhes, o índice de deduplicação e o outbox.
+
+Não há fallback para o Selenium: partidas cujo #_preview depende de
+JavaScript são enviadas só com os dados da listagem.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Dict, List, Optional
+
+import aiohttp
+
+from .browser import USER_AGENT
+from .cache import DetailCache
+from .config import env_bool, env_int
+from .dedup import DedupIndex
+from .extraction import extract_details
+from .http_engine import LxmlPage
+from .frontier import CrawlFrontier, listing_seeds
+from .listing import MAIN_PAGE_URL, next_page_url, parse_listing
+from .metrics import (
+    DETAIL_FETCHES,
+    LAST_RUN,
+    LAST_RUN_SUCCESS,
+    MATCHES_DISCOVERED,
+    export_metrics,
+    start_metrics_server,
+    timed
+)
+from .outbox import TipOutbox, idempotency_key
+from .rate_limit import limiter_for, retry_after_seconds, snapshot as rate_limit_snapshot
+from .selector_stats import save_selector_stats
+from .submission import SubmissionResult, TipSubmitter, clean_tip
+
+
+logger = logging.getLogger(__name__)
+
+REQUEST_HEADERS = {
+    'User-Agent': USER_AGENT,
+    'Accept': 'text/html,application/xhtml+xml',
+    'Accept-Language': 'pt-BR,pt;q=0.9,en;q=0.8',
+}
+
+
+def parse_details(html: bytes, encoding: Optional[str]) -> Optional[Dict]:
+    """Extrai os detalhes do HTML estático (None se o #_preview não estiver nele)"""
+    page = LxmlPage(html, encoding)
+    if not page.has_preview():
+        return None
+    return extract_details(page)
+
+
+def parse_main_page(html: bytes, encoding: Optional[str], base_url: str, listing_date: Optional[date] = None):
+    """Todas as partidas válidas de uma listagem e o link da próxima página"""
+    page = LxmlPage(html, encoding)
+    return parse_listing(page, sys.maxsize, base_url, listing_date), next_page_url(page, base_url)
+
+
+class AsyncAcademiaScraper:
+    """Listagem, detalhes e envio em um único loop asyncio"""
+
+    def __init__(self, api_base_url: str = "http://localhost:8000", max_matches: Optional[int] = None,
+                 concurrency: Optional[int] = None, parse_workers: Optional[int] = None,
+                 main_page_url: Optional[str] = None, timeout: int = 15):
+        self.api_base_url = api_base_url
+        self.main_page_url = main_page_url or os.getenv('SCRAPER_BASE_URL', MAIN_PAGE_URL)
+        self.max_matches = max_matches if max_matches is not None else env_int('MAX_MATCHES', 5)
+        # Requisições de páginas simultâneas e threads de parsing
+        self.concurrency = concurrency if concurrency is not None else env_int('ASYNC_CONCURRENCY', 32)
+        self.parse_workers = parse_workers if parse_workers is not None else env_int('ASYNC_PARSE_WORKERS', 2)
+        self.timeout = timeout
+        self.outbox = TipOutbox() if env_bool('OUTBOX', True) else None
+        self.dedup = DedupIndex() if env_bool('DEDUP', True) else None
+        # Configuração, deduplicação e registro dos resultados vêm do TipSubmitter;
+        # o envio em si é feito pelo aiohttp (exceto no modo API_BULK)
+        self.submitter = TipSubmitter(outbox=self.outbox, dedup=self.dedup)
+        self.detail_cache = DetailCache() if env_bool('DETAIL_CACHE', True) else None
+        self._parser: Optional[ThreadPoolExecutor] = None
+
+    async def _parse(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._parser, func, *args)
+
+    async def fetch(self, session: aiohttp.ClientSession, url: str):
+        """Baixa uma página; retorna (conteúdo, charset) ou None em caso de erro"""
+        try:
+            async with limiter_for(url).async_slot() as ticket, session.get(url) as response:
+                ticket.record(response.status, retry_after=retry_after_seconds(response.headers.get('Retry-After')))
+                if response.status != 200:
+                    logger.warning("HTTP %d ao buscar página", response.status,
+                                   extra={'url': url, 'status_code': response.status})
+                    return None
+                return await response.read(), response.charset
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.warning("Erro ao buscar página: %s", e, extra={'url': url})
+            return None
+
+    async def get_main_page_data(self, session: aiohttp.ClientSession) -> List[Dict]:
+        """Partidas válidas das listagens da fronteira (sem detalhes)"""
+        known = self.detail_cache.contains if self.detail_cache else None
+        frontier = CrawlFrontier(listing_seeds(self.main_page_url), max_matches=self.max_matches, known=known)
+        follow = env_bool('FOLLOW_PAGINATION', True)
+        matches = []
+        while True:
+            url = frontier.next_listing()
+            if url is None:
+                break
+            logger.info("Acessando listagem", extra={'url': url})
+            with timed('main_page_load'):
+                page = await self.fetch(session, url)
+            if page is None:
+                continue
+            rows, next_url = await self._parse(parse_main_page, *page, url, frontier.listing_date(url))
+            if follow:
+                frontier.add_next_page(next_url, url)
+            matches.extend(frontier.accept(rows))
+
+        MATCHES_DISCOVERED.inc(len(matches))
+        logger.info("Fronteira: %d listagens visitadas, %d partidas, %d repetidas ignoradas",
+                    frontier.pages_visited, frontier.accepted, frontier.duplicates, extra=frontier.summary())
+        if not matches:
+            logger.warning("Tabela de partidas ausente no HTML estático (use o scraper com Selenium)")
+        return matches
+
+    async def get_match_details(self, session: aiohttp.ClientSession, url: str) -> Optional[Dict]:
+        """Detalhes da partida (cache local, depois HTTP)"""
+        if self.detail_cache:
+            cached = self.detail_cache.get(url)
+            if cached is not None:
+                DETAIL_FETCHES.inc(engine='cache', outcome='hit')
+                return cached
+
+        with timed('detail_fetch'):
+            page = await self.fetch(session, url)
+            details = await self._parse(parse_details, *page) if page else None
+
+        if details is None:
+            logger.info("Bloco #_preview ausente no HTML estático", extra={'url': url})
+            DETAIL_FETCHES.inc(engine='async', outcome='miss')
+            return None
+
+        DETAIL_FETCHES.inc(engine='async', outcome='ok')
+        if self.detail_cache and (details.get('odds') or details.get('prediction')):
+            self.detail_cache.set(url, details)
+        return details
+
+    async def submit(self, session: aiohttp.ClientSession, tip_data: Dict) -> SubmissionResult:
+        """Envia uma tip (mesmo payload e Idempotency-Key do TipSubmitter)"""
+        tip_id = tip_data.get('id')
+        headers = {'Idempotency-Key': idempotency_key(tip_data)}
+        if self.submitter.replaying:
+            await asyncio.to_thread(self.submitter.wait_for_replay)
+        try:
+            with timed('send_to_api'):
+                async with limiter_for(self.submitter.api_url).async_slot() as ticket, \
+                        session.post(self.submitter.api_url, json=clean_tip(tip_data), headers=headers) as response:
+                    status = response.status
+                    ticket.record(status, retry_after=retry_after_seconds(response.headers.get('Retry-After')))
+                    body = await response.text()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error("Erro na requisição para API: %s", e, extra={'tip_id': tip_id})
+            return self.submitter.record_result(tip_data, SubmissionResult(tip_id, False, error=str(e)))
+
+        if status in (200, 201):
+            logger.info("Tip cadastrada com sucesso", extra={'tip_id': tip_id, 'status_code': status})
+            return self.submitter.record_result(tip_data, SubmissionResult(tip_id, True, status))
+
+        logger.error("Erro ao cadastrar tip: %d - %s", status, body[:500],
+                     extra={'tip_id': tip_id, 'status_code': status})
+        return self.submitter.record_result(tip_data, SubmissionResult(tip_id, False, status, body[:500]))
+
+    async def process_match(self, session: aiohttp.ClientSession, api_session: aiohttp.ClientSession,
+                            fetch_limit: asyncio.Semaphore, send_limit: asyncio.Semaphore,
+                            match: Dict) -> Optional[SubmissionResult]:
+        """Detalhes e envio de uma partida (None se não precisar ser enviada)"""
+        if match.get('detail_url'):
+            async with fetch_limit:
+                details = await self.get_match_details(session, match['detail_url'])
+            if details:
+                match.update(details)
+
+        if not self.submitter.should_send(match):
+            logger.info("Tip já enviada sem alterações - ignorando", extra={'tip_id': match['id']})
+            return None
+        if self.submitter.bulk:
+            return match
+        async with send_limit:
+            return await self.submit(api_session, match)
+
+    async def run(self) -> bool:
+        """Equivalente assíncrono de AcademiaScraperImproved.run"""
+        start_metrics_server()
+        success = False
+        replay_task = None
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        self._parser = ThreadPoolExecutor(max_workers=max(self.parse_workers, 1),
+                                          thread_name_prefix='async-parse')
+        try:
+            logger.info("Iniciando motor assíncrono (%d requisições simultâneas)", self.concurrency)
+            # Reenvia em paralelo as tips que falharam em execuções anteriores
+            # (os envios desta execução esperam o reenvio terminar)
+            if self.outbox:
+                self.submitter.begin_replay()
+                replay_task = asyncio.ensure_future(asyncio.to_thread(self.submitter.replay_outbox))
+
+            connector = aiohttp.TCPConnector(limit=self.concurrency)
+            async with aiohttp.ClientSession(headers=REQUEST_HEADERS, timeout=timeout,
+                                             connector=connector) as session, \
+                    aiohttp.ClientSession(timeout=timeout) as api_session:
+                with timed('pipeline'):
+                    matches = await self.get_main_page_data(session)
+                    fetch_limit = asyncio.Semaphore(self.concurrency)
+                    send_limit = asyncio.Semaphore(max(self.submitter.max_in_flight, 1))
+                    outcomes = await asyncio.gather(*(
+                        self.process_match(session, api_session, fetch_limit, send_limit, match)
+                        for match in matches))
+
+                    pending = [item for item in outcomes if isinstance(item, dict)]
+                    results = [item for item in outcomes if isinstance(item, SubmissionResult)]
+                    if pending:
+                        # API_BULK: lotes enviados pelo TipSubmitter (com fallback tip a tip)
+                        batches = [pending[i:i + self.submitter.batch_size]
+                                   for i in range(0, len(pending), self.submitter.batch_size)]
+                        for batch_results in await asyncio.gather(*(
+                                asyncio.to_thread(self.submitter.submit_batch, batch) for batch in batches)):
+                            results.extend(batch_results)
+
+            if not matches:
+                logger.error("Nenhum dado foi extraído da página")
+                return success
+
+            success_count = sum(result.ok for result in results)
+            logger.info("Processo concluído: %d/%d partidas cadastradas com sucesso",
+                        success_count, len(results),
+                        extra={'sent': success_count, 'total': len(results)})
+            success = True
+
+        except Exception as e:
+            logger.exception("Erro durante execução: %s", e)
+        finally:
+            if replay_task:
+                await replay_task
+            limits = rate_limit_snapshot()
+            if limits:
+                logger.info("Limites por host ao fim da execução", extra={'rate_limits': limits})
+            save_selector_stats()
+            self.close()
+            LAST_RUN.set(time.time())
+            LAST_RUN_SUCCESS.set(1 if success else 0)
+            export_metrics()
+        return success
+
+    def close(self):
+        """Fecha o pool de parsing, os armazenamentos e a sessão do TipSubmitter"""
+        if self._parser:
+            self._parser.shutdown(wait=False)
+            self._parser = None
+        self.submitter.close()
+        if self.outbox:
+            self.outbox.close()
+            self.outbox = None
+        if self.dedup:
+            self.dedup.close()
+            self.dedup = None
+        if self.detail_cache:
+            self.detail_cache.close()
+            self.detail_cache = None
@@ -0,0 +1,190 @@
+"""
+Criação e configuração das sessões do Chrome (Selenium)
+
+No modo enxuto (LEAN_BROWSING, padrão), o Chrome usa a estratégia de
+carregamento "eager", não baixa imagens e bloqueia via CDP fontes, mídia,
+anúncios e rastreadores. Cada tipo de página tem uma allowlist do que
+precisa carregar (o #_preview depende do CSS do site).
+"""
+
+import logging
+import os
+import time
+from typing import Iterable, List, Optional
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+
+from .config import env_bool, env_int
+from .driver_cache import DriverResolutionCache, acquire_profile, profiles_enabled
+from .metrics import BROWSER_STARTUP
+
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# Padrões de URL bloqueados no modo enxuto (Network.setBlockedURLs), por categoria
+LEAN_BLOCKLIST = {
+    'image': ['*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico', '*.avif'],
+    'media': ['*.mp4', '*.webm', '*.mp3', '*.m3u8'],
+    'font': ['*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot', '*fonts.googleapis.com*', '*fonts.gstatic.com*'],
+    'stylesheet': ['*.css', '*.css?*'],
+    'tracker': [
+        '*googletagmanager.com*', '*google-analytics.com*', '*doubleclick.net*',
+        '*googlesyndication.com*', '*adservice.google.*', '*googleadservices.com*',
+        '*facebook.net*', '*connect.facebook.*', '*hotjar.com*', '*criteo.*',
+        '*taboola.com*', '*outbrain.com*', '*scorecardresearch.com*', '*quantserve.com*',
+        '*adnxs.com*', '*amazon-adsystem.com*', '*onesignal.com*', '*cookielaw.org*',
+    ],
+}
+
+# Categorias liberadas por tipo de página: as abas da listagem e os blocos
+# do #_preview (toggle_content) são mostrados/escondidos pelo CSS do site,
+# e o .text do Selenium só devolve o que está visível
+PAGE_ALLOWLIST = {
+    'main': {'stylesheet'},
+    'detail': {'stylesheet'},
+    'default': set(),
+}
+
+
+def blocked_url_patterns(page_type: str = 'default', extra: Iterable[str] = ()) -> List[str]:
+    """Padrões bloqueados para um tipo de página (blocklist menos a allowlist)"""
+    allowed = PAGE_ALLOWLIST.get(page_type, PAGE_ALLOWLIST['default'])
+    patterns = [pattern for category, items in LEAN_BLOCKLIST.items()
+                if category not in allowed for pattern in items]
+    return patterns + [pattern for pattern in extra if pattern]
+
+
+def lean_browsing_enabled() -> bool:
+    return env_bool('LEAN_BROWSING', True)
+
+
+def apply_page_profile(driver, page_type: str):
+    """Ajusta o bloqueio de recursos antes de navegar para um tipo de página
+
+    O bloqueio vale por aba (alvo do CDP), então o perfil aplicado é
+    lembrado por window handle e só é reenviado quando muda.
+    """
+    if not lean_browsing_enabled():
+        return
+    try:
+        handle = driver.current_window_handle
+        applied = getattr(driver, '_lean_profiles', None)
+        if applied is None:
+            applied = driver._lean_profiles = {}
+        if applied.get(handle) == page_type:
+            return
+
+        extra = os.getenv('LEAN_EXTRA_BLOCKED', '').split(',')
+        if handle not in applied:
+            # Esquece as abas já fechadas (uma por página de detalhes)
+            if len(applied) >= 16:
+                for closed in set(applied) - set(driver.window_handles):
+                    del applied[closed]
+            driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs',
+                               {'urls': blocked_url_patterns(page_type, (p.strip() for p in extra))})
+        applied[handle] = page_type
+    except Exception as e:
+        # Driver sem suporte a CDP: segue carregando tudo
+        logger.debug("Bloqueio de recursos indisponível: %s", e)
+
+
+def driver_alive(driver) -> bool:
+    """Verifica se a sessão ainda responde (Chrome e chromedriver vivos)"""
+    try:
+        return driver.execute_script("return 1;") == 1
+    except Exception:
+        return False
+
+
+def build_chrome_options(lean: Optional[bool] = None) -> Options:
+    """Monta as opções do Chrome headless usadas por todas as sessões"""
+    lean = lean_browsing_enabled() if lean is None else lean
+    chrome_options = Options()
+    # Executa sem interface gráfica
+    chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--window-size=1920,1080")
+    chrome_options.add_argument(f"--user-agent={USER_AGENT}")
+
+    if lean:
+        # Devolve o controle no DOMContentLoaded; as esperas de readiness.py
+        # aguardam a tabela e o #_preview
+        chrome_options.page_load_strategy = 'eager'
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+        })
+        for flag in ("--disable-extensions", "--disable-background-networking",
+                     "--disable-default-apps", "--disable-sync", "--mute-audio",
+                     "--no-first-run", "--disable-features=Translate,MediaRouter,OptimizationHints"):
+            chrome_options.add_argument(flag)
+    return chrome_options
+
+
+def _local_chromedriver() -> tuple:
+    """Chromedriver do modo local: cache em /app/data ou webdriver-manager"""
+    if not env_bool('DRIVER_CACHE', True):
+        return ChromeDriverManager().install(), 'resolved'
+    return DriverResolutionCache().resolve(lambda: ChromeDriverManager().install())
+
+
+def create_chrome_driver() -> webdriver.Chrome:
+    """Cria uma nova sessão do Chrome (Docker ou webdriver-manager)"""
+    start = time.perf_counter()
+    chrome_options = build_chrome_options()
+
+    # Verifica se está rodando no Docker (variáveis de ambiente)
+    chrome_bin = os.getenv('CHROME_BIN')
+    chromedriver_path = os.getenv('CHROMEDRIVER_PATH')
+
+    if chrome_bin and chromedriver_path:
+        # Modo Docker: usa ChromeDriver do sistema
+        logger.info("Ambiente Docker detectado, usando o Chromium do sistema")
+        chrome_options.binary_location = chrome_bin
+        service = Service(chromedriver_path)
+        resolver = 'system'
+    else:
+        # Modo local: chromedriver em cache, webdriver-manager só se o Chrome mudou
+        chromedriver_path, resolver = _local_chromedriver()
+        logger.info("Modo local: chromedriver %s (%s)", chromedriver_path, resolver)
+        service = Service(chromedriver_path)
+
+    # Perfil persistente: o cache de disco guarda o CSS/JS do site entre execuções
+    profile = acquire_profile() if profiles_enabled() else None
+    if profile:
+        chrome_options.add_argument(f"--user-data-dir={profile.path}")
+        chrome_options.add_argument(f"--disk-cache-size={env_int('CHROME_DISK_CACHE_MB', 100) * 1024 * 1024}")
+
+    try:
+        driver = webdriver.Chrome(service=service, options=chrome_options)
+    except Exception:
+        if profile:
+            profile.release()
+        raise
+    driver._profile_slot = profile
+    driver.set_page_load_timeout(30)
+    apply_page_profile(driver, 'default')
+
+    profile_state = 'temp' if not profile else ('warm' if profile.warm else 'cold')
+    BROWSER_STARTUP.observe(time.perf_counter() - start, driver=resolver, profile=profile_state)
+    return driver
+
+
+def quit_driver(driver):
+    """Encerra a sessão e libera o perfil que ela travava"""
+    try:
+        driver.quit()
+    except Exception:
+        pass
+    profile = getattr(driver, '_profile_slot', None)
+    if profile:
+        profile.release()
@@ -0,0 +1,94 @@
+"""
+Cache persistente dos detalhes das partidas (SQLite em /app/data)
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from .config import env_int, get_data_dir
+
+
+class DetailCache:
+    """Guarda odds/predição/description/liga por URL de detalhes.
+
+    Entradas expiram após ttl_seconds e, acima de max_entries, as menos
+    acessadas recentemente são removidas.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl_seconds: Optional[int] = None,
+                 max_entries: Optional[int] = None):
+        self.path = path or os.path.join(get_data_dir(), 'detail_cache.sqlite3')
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else env_int('DETAIL_CACHE_TTL', 12 * 3600)
+        self.max_entries = max_entries if max_entries is not None else env_int('DETAIL_CACHE_MAX_ENTRIES', 5000)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS match_details (
+                url TEXT PRIMARY KEY,
+                details TEXT NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Retorna os detalhes em cache (None se ausente ou expirado)"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT details FROM match_details WHERE url = ? AND stored_at >= ?",
+                (url, now - self.ttl_seconds)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE match_details SET accessed_at = ? WHERE url = ?", (now, url))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def contains(self, url: str) -> bool:
+        """Indica se há detalhes válidos em cache (sem contar acerto nem falha)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM match_details WHERE url = ? AND stored_at >= ?",
+                (url, time.time() - self.ttl_seconds)
+            ).fetchone()
+        return row is not None
+
+    def set(self, url: str, details: Dict):
+        """Salva os detalhes de uma partida e aplica a política de remoção"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO match_details (url, details, stored_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (url, json.dumps(details, ensure_ascii=False), now, now)
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float):
+        self._conn.execute(
+            "DELETE FROM match_details WHERE stored_at < ?", (now - self.ttl_seconds,))
+        self._conn.execute(
+            """
+            DELETE FROM match_details WHERE url IN (
+                SELECT url FROM match_details ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_entries,)
+        )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
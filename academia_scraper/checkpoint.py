@@ -0,0 +1,155 @@
+"""
+Checkpoint da execução em andamento, para retomar depois de uma queda
+
+Cada partida descoberta é gravada com seu estado (pending -> enriched ->
+sent). Se o Chrome cair ou o container for morto pelo OOM no meio da
+execução, a próxima execução retoma do ponto em que parou: com a descoberta
+completa, a página principal nem é recarregada; partidas com detalhes já
+extraídos não voltam a ser renderizadas e as já enviadas são puladas.
+
+Uma execução concluída apaga o checkpoint. Checkpoints antigos
+(CHECKPOINT_MAX_AGE) ou de outra descoberta (outra página principal ou
+outro conjunto de listagens em LISTING_URLS/LISTING_DAYS) são descartados.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .config import env_int, get_data_dir
+
+
+logger = logging.getLogger(__name__)
+
+PENDING = 'pending'
+ENRICHED = 'enriched'
+SENT = 'sent'
+
+
+def crawl_key(base_url: str, listings: Iterable[str]) -> str:
+    """Identidade de uma descoberta: página principal e conjunto de listagens"""
+    digest = hashlib.sha1('\n'.join(sorted(set(listings))).encode('utf-8')).hexdigest()
+    return f"{base_url}#{digest[:16]}"
+
+
+class RunCheckpoint:
+    """Estado persistente de uma execução (uma por diretório de dados)"""
+
+    def __init__(self, path: Optional[str] = None, max_age: Optional[int] = None):
+        self.path = path or os.path.join(get_data_dir(), 'checkpoint.sqlite3')
+        self.max_age = max_age if max_age is not None else env_int('CHECKPOINT_MAX_AGE', 6 * 3600)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS checkpoint_run (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                source_url TEXT NOT NULL,
+                started_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                discovery_done INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS checkpoint_matches (
+                id TEXT PRIMARY KEY,
+                position INTEGER NOT NULL,
+                state TEXT NOT NULL,
+                data TEXT NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+        self.resumed = False
+
+    def begin(self, source_url: str) -> bool:
+        """Inicia uma execução; retorna True se está retomando uma interrompida
+
+        source_url identifica a descoberta (crawl_key): só um checkpoint com
+        a mesma chave é retomado.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT source_url, updated_at FROM checkpoint_run WHERE id = 1").fetchone()
+            resumable = bool(row) and row[0] == source_url and now - row[1] <= self.max_age
+            if resumable:
+                self._conn.execute("UPDATE checkpoint_run SET updated_at = ? WHERE id = 1", (now,))
+            else:
+                self._conn.execute("DELETE FROM checkpoint_matches")
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO checkpoint_run (id, source_url, started_at, updated_at) "
+                    "VALUES (1, ?, ?, ?)", (source_url, now, now))
+            self._conn.commit()
+            self.resumed = resumable
+            if resumable:
+                counts = dict(self._conn.execute(
+                    "SELECT state, COUNT(*) FROM checkpoint_matches GROUP BY state").fetchall())
+                logger.info("Retomando execução interrompida: %d enviadas, %d com detalhes, %d pendentes",
+                            counts.get(SENT, 0), counts.get(ENRICHED, 0), counts.get(PENDING, 0),
+                            extra={'checkpoint': counts})
+        return self.resumed
+
+    def discovered_matches(self) -> Optional[List[Dict]]:
+        """Partidas da descoberta completa de uma execução retomada (None se incompleta)"""
+        with self._lock:
+            row = self._conn.execute("SELECT discovery_done FROM checkpoint_run WHERE id = 1").fetchone()
+            if not self.resumed or not row or not row[0]:
+                return None
+            rows = self._conn.execute("SELECT data FROM checkpoint_matches ORDER BY position").fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def record(self, match: Dict) -> Tuple[str, Dict]:
+        """Registra uma partida descoberta; retorna (estado, partida) do checkpoint
+
+        Uma partida que já tinha detalhes volta com os dados completos.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT state, data FROM checkpoint_matches WHERE id = ?", (match['id'],)).fetchone()
+            if row:
+                return row[0], json.loads(row[1])
+            position = self._conn.execute("SELECT COUNT(*) FROM checkpoint_matches").fetchone()[0]
+            self._conn.execute(
+                "INSERT INTO checkpoint_matches (id, position, state, data) VALUES (?, ?, ?, ?)",
+                (match['id'], position, PENDING, json.dumps(match, ensure_ascii=False)))
+            self._touch()
+        return PENDING, match
+
+    def mark_enriched(self, match: Dict):
+        """Guarda a partida com os detalhes já extraídos"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE checkpoint_matches SET state = ?, data = ? WHERE id = ? AND state != ?",
+                (ENRICHED, json.dumps(match, ensure_ascii=False), match['id'], SENT))
+            self._touch()
+
+    def mark_sent(self, match_id: str):
+        with self._lock:
+            self._conn.execute("UPDATE checkpoint_matches SET state = ? WHERE id = ?", (SENT, match_id))
+            self._touch()
+
+    def mark_discovery_done(self):
+        """A lista de partidas está completa: uma retomada não recarrega a página principal"""
+        with self._lock:
+            self._conn.execute("UPDATE checkpoint_run SET discovery_done = 1 WHERE id = 1")
+            self._touch()
+
+    def finish(self):
+        """Execução concluída: nada a retomar"""
+        with self._lock:
+            self._conn.execute("DELETE FROM checkpoint_matches")
+            self._conn.execute("DELETE FROM checkpoint_run")
+            self._conn.commit()
+        self.resumed = False
+
+    def _touch(self):
+        self._conn.execute("UPDATE checkpoint_run SET updated_at = ? WHERE id = 1", (time.time(),))
+        self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
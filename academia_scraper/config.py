@@ -0,0 +1,50 @@
+"""
+Configurações do scraper lidas de variáveis de ambiente
+"""
+
+import logging
+import os
+
+
+logger = logging.getLogger(__name__)
+
+
+def env_int(name: str, default: int) -> int:
+    """Lê um inteiro de uma variável de ambiente (usa o padrão se inválido)"""
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning("Valor inválido para %s: %r - usando %s", name, value, default)
+        return default
+
+
+def env_float(name: str, default: float) -> float:
+    """Lê um número decimal de uma variável de ambiente (usa o padrão se inválido)"""
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        logger.warning("Valor inválido para %s: %r - usando %s", name, value, default)
+        return default
+
+
+def env_bool(name: str, default: bool) -> bool:
+    """Lê um booleano de uma variável de ambiente (true/false, 1/0, yes/no)"""
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def get_data_dir() -> str:
+    """Diretório de dados persistentes (volume /app/data no Docker)"""
+    data_dir = os.getenv('DATA_DIR')
+    if not data_dir:
+        data_dir = '/app/data' if os.path.isdir('/app/data') else os.path.join(os.getcwd(), 'data')
+    os.makedirs(data_dir, exist_ok=True)
+    return data_dir
@@ -0,0 +1,190 @@
+"""
+Modo daemon: um processo de longa duração com o navegador sempre aquecido
+
+Em vez de o cron subir Python, importar tudo e abrir o Chrome a cada
+execução, o daemon mantém uma única instância de AcademiaScraperImproved e
+dispara as execuções por um agendador interno. Cada agenda é diária (HH:MM)
+ou periódica (a cada N minutos/horas) e pode limitar o número de partidas:
+
+    DAEMON_SCHEDULES="full=06:00*50,refresh=30m*10"
+
+Com RUN_ON_START, a primeira agenda roda uma vez logo ao iniciar e todas
+seguem depois o horário normal (uma única execução no boot, não uma por
+agenda). Antes de cada execução (e periodicamente enquanto ocioso) o daemon
+confere se o Chrome ainda responde e o reinicia se necessário.
+"""
+
+import logging
+import os
+import re
+import signal
+import threading
+from dataclasses import dataclass
+from datetime import datetime, time as dtime, timedelta
+from typing import Callable, List, Optional
+
+from .config import env_bool, env_float
+from .metrics import REGISTRY
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SCHEDULES = "full=06:00"
+
+_SCHEDULE_RE = re.compile(
+    r'^(?P<name>[\w-]+)=(?:(?P<at>\d{1,2}:\d{2})|(?P<every>\d+)(?P<unit>[smh]))(?:\*(?P<max>\d+))?$')
+
+_UNIT_SECONDS = {'s': 1, 'm': 60, 'h': 3600}
+
+DAEMON_RUNS = REGISTRY.counter(
+    'scraper_daemon_runs_total', 'Execuções do daemon por agenda e resultado', ('schedule', 'outcome'))
+BROWSER_RESTARTS = REGISTRY.counter(
+    'scraper_browser_restarts_total', 'Reinícios do Chrome feitos pelo health check do daemon')
+
+
+@dataclass
+class Schedule:
+    """Uma agenda do daemon: diária (at) ou periódica (every)"""
+    name: str
+    at: Optional[dtime] = None
+    every: Optional[timedelta] = None
+    max_matches: Optional[int] = None
+
+    def next_run(self, now: datetime) -> datetime:
+        """Próximo horário de execução depois de `now`"""
+        if self.every:
+            return now + self.every
+        candidate = datetime.combine(now.date(), self.at)
+        if candidate <= now:
+            candidate += timedelta(days=1)
+        return candidate
+
+
+def parse_schedules(spec: str) -> List[Schedule]:
+    """Lê agendas no formato "nome=HH:MM" ou "nome=Nm", com "*N" opcional de partidas"""
+    schedules = []
+    for item in (part.strip() for part in spec.split(',')):
+        if not item:
+            continue
+        match = _SCHEDULE_RE.match(item)
+        if not match:
+            raise ValueError(f"Agenda inválida: {item!r} (use nome=HH:MM ou nome=30m, com *N opcional)")
+
+        max_matches = int(match.group('max')) if match.group('max') else None
+        if match.group('at'):
+            hour, minute = (int(value) for value in match.group('at').split(':'))
+            schedules.append(Schedule(match.group('name'), at=dtime(hour, minute), max_matches=max_matches))
+        else:
+            seconds = int(match.group('every')) * _UNIT_SECONDS[match.group('unit')]
+            if seconds <= 0:
+                raise ValueError(f"Intervalo inválido na agenda {item!r}")
+            schedules.append(Schedule(match.group('name'), every=timedelta(seconds=seconds),
+                                      max_matches=max_matches))
+    if not schedules:
+        raise ValueError("Nenhuma agenda configurada")
+    return schedules
+
+
+class ScraperDaemon:
+    """Agendador em processo que reaproveita o scraper (e o Chrome) entre execuções"""
+
+    def __init__(self, scraper_factory: Callable, schedules: Optional[List[Schedule]] = None,
+                 run_on_start: Optional[bool] = None, health_interval: Optional[float] = None,
+                 now: Callable[[], datetime] = datetime.now):
+        self.scraper_factory = scraper_factory
+        self.schedules = schedules or parse_schedules(os.getenv('DAEMON_SCHEDULES', DEFAULT_SCHEDULES))
+        self.run_on_start = run_on_start if run_on_start is not None else env_bool('RUN_ON_START', False)
+        self.health_interval = health_interval if health_interval is not None \
+            else env_float('DAEMON_HEALTH_INTERVAL', 300.0)
+        self.now = now
+        self.scraper = None
+        self._stop = threading.Event()
+
+    def stop(self, *_):
+        """Pede o encerramento (termina a execução em andamento antes de sair)"""
+        logger.info("Encerrando o daemon")
+        self._stop.set()
+
+    def _install_signal_handlers(self):
+        if threading.current_thread() is not threading.main_thread():
+            return
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+    def _start_scraper(self) -> bool:
+        """Cria o scraper, tentando de novo com espera crescente se o Chrome não subir"""
+        delay = 5.0
+        while not self._stop.is_set():
+            try:
+                self.scraper = self.scraper_factory()
+                return True
+            except Exception as e:
+                logger.error("Falha ao iniciar o scraper: %s (nova tentativa em %.0fs)", e, delay)
+                self._stop.wait(delay)
+                delay = min(delay * 2, 300.0)
+        return False
+
+    def health_check(self):
+        """Reinicia o Chrome se ele tiver morrido desde a última execução"""
+        try:
+            if self.scraper.ensure_browser():
+                BROWSER_RESTARTS.inc()
+        except Exception as e:
+            logger.error("Falha ao reiniciar o Chrome: %s", e)
+
+    def run_job(self, schedule: Schedule) -> bool:
+        """Executa uma rodada do scraper para a agenda"""
+        logger.info("Iniciando execução agendada '%s'", schedule.name, extra={'schedule': schedule.name})
+        self.health_check()
+
+        default_max = self.scraper.max_matches
+        if schedule.max_matches:
+            self.scraper.max_matches = schedule.max_matches
+        try:
+            ok = self.scraper.run(keep_alive=True)
+        except Exception as e:
+            logger.exception("Erro na execução '%s': %s", schedule.name, e)
+            ok = False
+        finally:
+            self.scraper.max_matches = default_max
+
+        DAEMON_RUNS.inc(schedule=schedule.name, outcome='ok' if ok else 'error')
+        return ok
+
+    def run_forever(self):
+        """Loop principal: espera a próxima agenda vencer e executa, até receber SIGTERM"""
+        self._install_signal_handlers()
+        if not self._start_scraper():
+            return
+
+        try:
+            if self.run_on_start:
+                # Uma única execução no boot (primeira agenda); depois, os horários normais
+                self.run_job(self.schedules[0])
+
+            now = self.now()
+            due = {s.name: s.next_run(now) for s in self.schedules}
+            for schedule in self.schedules:
+                logger.info("Agenda '%s': próxima execução às %s", schedule.name,
+                            due[schedule.name].strftime('%Y-%m-%d %H:%M:%S'))
+
+            while not self._stop.is_set():
+                schedule = min(self.schedules, key=lambda s: due[s.name])
+                wait = (due[schedule.name] - self.now()).total_seconds()
+                if wait > 0:
+                    # Acorda periodicamente para manter o Chrome saudável
+                    self._stop.wait(min(wait, self.health_interval))
+                    if not self._stop.is_set() and wait > self.health_interval:
+                        self.health_check()
+                    continue
+
+                self.run_job(schedule)
+                # Agendas que venceram durante a execução rodam em seguida;
+                # a que acabou de rodar é reagendada a partir de agora
+                due[schedule.name] = schedule.next_run(self.now())
+                logger.info("Agenda '%s': próxima execução às %s", schedule.name,
+                            due[schedule.name].strftime('%Y-%m-%d %H:%M:%S'))
+        finally:
+            if self.scraper:
+                self.scraper.close()
+            logger.info("Daemon encerrado")
@@ -0,0 +1,96 @@
+"""
+Índice de deduplicação das tips enviadas (na execução e entre execuções)
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from .config import env_int, get_data_dir
+from .identity import content_hash
+
+
+class DedupIndex:
+    """Decide se uma tip precisa ser enviada.
+
+    Só envia tips novas ou cujo conteúdo mudou desde o último envio com
+    sucesso; repetições dentro da mesma execução também são ignoradas.
+    """
+
+    def __init__(self, path: Optional[str] = None, retention_days: Optional[int] = None):
+        self.path = path or os.path.join(get_data_dir(), 'sent_tips.sqlite3')
+        self.retention_days = retention_days if retention_days is not None else env_int('DEDUP_RETENTION_DAYS', 14)
+        self._lock = threading.Lock()
+        self._seen_in_run = set()
+        self._ids_in_run = set()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS sent_tips (
+                id TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                sent_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "DELETE FROM sent_tips WHERE sent_at < ?",
+            (time.time() - self.retention_days * 86400,)
+        )
+        self._conn.commit()
+        self.skipped = 0
+
+    def begin_run(self):
+        """Começa uma nova execução (modo daemon: esquece as tips vistas na anterior)"""
+        with self._lock:
+            self._seen_in_run = set()
+            self._ids_in_run = set()
+
+    def should_send(self, tip: Dict) -> bool:
+        """True se a tip é nova ou mudou; registra a tip como vista nesta execução"""
+        tip_hash = content_hash(tip)
+        with self._lock:
+            if (tip['id'], tip_hash) in self._seen_in_run:
+                self.skipped += 1
+                return False
+            self._seen_in_run.add((tip['id'], tip_hash))
+            self._ids_in_run.add(tip['id'])
+
+            row = self._conn.execute(
+                "SELECT content_hash FROM sent_tips WHERE id = ?", (tip['id'],)).fetchone()
+            if row and row[0] == tip_hash:
+                self.skipped += 1
+                return False
+        return True
+
+    def seen_in_run(self, tip_id: str) -> bool:
+        """True se a partida já apareceu nesta execução (com qualquer conteúdo)"""
+        with self._lock:
+            return tip_id in self._ids_in_run
+
+    def already_sent(self, tip: Dict) -> bool:
+        """True se este mesmo conteúdo já foi entregue (só o índice persistido)
+
+        Não consulta nem altera as tips vistas na execução: ter visto uma
+        tip não significa que ela foi entregue.
+        """
+        tip_hash = content_hash(tip)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content_hash FROM sent_tips WHERE id = ?", (tip['id'],)).fetchone()
+        return bool(row) and row[0] == tip_hash
+
+    def mark_sent(self, tip: Dict):
+        """Registra o conteúdo enviado com sucesso"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sent_tips (id, content_hash, sent_at) VALUES (?, ?, ?)",
+                (tip['id'], content_hash(tip), time.time())
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
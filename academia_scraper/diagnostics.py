@@ -0,0 +1,217 @@
+"""
+Capturas de diagnóstico das páginas que falharam
+
+Quando uma cascata de seletores não encontra nada (tabela da listagem,
+bloco de análise dos detalhes) ou a listagem cai no método alternativo, o
+HTML da página é guardado comprimido (gzip), com um screenshot opcional e
+os metadados da captura, em DATA_DIR/diagnostics. As capturas são
+identificadas pela execução (run ID) e pela URL e formam um anel limitado
+por DIAGNOSTICS_MAX_MB: as mais antigas são apagadas primeiro.
+
+Execuções sem falhas não capturam nada. Uma captura pode ser reprocessada
+depois com as regras atuais, por exemplo para testar um seletor novo:
+
+    python -m academia_scraper.diagnostics             # lista as capturas
+    python -m academia_scraper.diagnostics <captura>   # reprocessa uma captura
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional
+
+from .config import env_bool, env_int, get_data_dir
+from .metrics import REGISTRY
+
+
+logger = logging.getLogger(__name__)
+
+DIAGNOSTIC_SNAPSHOTS = REGISTRY.counter(
+    'scraper_diagnostic_snapshots_total', 'Capturas de diagnóstico de páginas que falharam', ('reason',))
+
+# Motivos de captura
+MAIN_TABLE = 'main_table'
+LISTING_ERROR = 'listing_error'
+DETAIL = 'detail'
+
+HTML_SUFFIX = '.html.gz'
+META_SUFFIX = '.json'
+SCREENSHOT_SUFFIX = '.png'
+
+
+def new_run_id() -> str:
+    """Identificador da execução (ordenável pela data)"""
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+
+def url_key(url: str) -> str:
+    return hashlib.sha1(url.encode('utf-8')).hexdigest()[:10]
+
+
+class DiagnosticsRing:
+    """Diretório de capturas com tamanho máximo (anel por data de captura)"""
+
+    def __init__(self, directory: Optional[str] = None, max_mb: Optional[int] = None,
+                 screenshots: Optional[bool] = None):
+        self.directory = directory or os.path.join(get_data_dir(), 'diagnostics')
+        self.max_bytes = (max_mb if max_mb is not None else env_int('DIAGNOSTICS_MAX_MB', 50)) * 1024 * 1024
+        self.screenshots = screenshots if screenshots is not None else env_bool('DIAGNOSTICS_SCREENSHOTS', True)
+        self.run_id = new_run_id()
+        self._sequence = 0
+        self._captured = set()
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def begin_run(self) -> str:
+        """Começa uma nova execução (modo daemon: várias por processo)"""
+        with self._lock:
+            self.run_id = new_run_id()
+            self._sequence = 0
+            self._captured = set()
+        return self.run_id
+
+    def capture(self, url: str, reason: str, html: Optional[str], screenshot: Optional[bytes] = None,
+                **details) -> Optional[str]:
+        """Guarda o HTML (e o screenshot) de uma página; retorna o nome da captura
+
+        A mesma URL é capturada no máximo uma vez por motivo em cada execução.
+        """
+        if html is None:
+            return None
+        with self._lock:
+            if (reason, url) in self._captured:
+                return None
+            self._captured.add((reason, url))
+            self._sequence += 1
+            name = f"{self.run_id}-{self._sequence:03d}-{reason}-{url_key(url)}"
+            run_id = self.run_id
+
+        base = os.path.join(self.directory, name)
+        try:
+            with gzip.open(base + HTML_SUFFIX, 'wt', encoding='utf-8') as f:
+                f.write(html)
+            if screenshot:
+                with open(base + SCREENSHOT_SUFFIX, 'wb') as f:
+                    f.write(screenshot)
+            meta = {'name': name, 'run_id': run_id, 'url': url, 'reason': reason,
+                    'captured_at': time.time(), 'screenshot': bool(screenshot), **details}
+            with open(base + META_SUFFIX, 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False)
+        except OSError as e:
+            logger.warning("Falha ao gravar captura de diagnóstico: %s", e, extra={'url': url})
+            return None
+
+        DIAGNOSTIC_SNAPSHOTS.inc(reason=reason)
+        logger.warning("Captura de diagnóstico salva: %s", name,
+                       extra={'url': url, 'reason': reason, 'run_id': run_id})
+        self.prune()
+        return name
+
+    def capture_driver(self, driver, url: str, reason: str, **details) -> Optional[str]:
+        """Captura a página aberta em uma sessão do Selenium"""
+        if (reason, url) in self._captured:
+            return None
+        try:
+            html = driver.page_source
+        except Exception as e:
+            logger.warning("Não foi possível ler o HTML para diagnóstico: %s", e, extra={'url': url})
+            return None
+        screenshot = None
+        if self.screenshots:
+            try:
+                screenshot = driver.get_screenshot_as_png()
+            except Exception as e:
+                logger.debug("Screenshot de diagnóstico indisponível: %s", e)
+        try:
+            details.setdefault('current_url', driver.current_url)
+            details.setdefault('title', driver.title)
+        except Exception:
+            pass
+        return self.capture(url, reason, html, screenshot, **details)
+
+    def snapshots(self) -> List[Dict]:
+        """Metadados das capturas, da mais antiga para a mais recente"""
+        found = []
+        for entry in os.listdir(self.directory):
+            if not entry.endswith(META_SUFFIX):
+                continue
+            try:
+                with open(os.path.join(self.directory, entry), encoding='utf-8') as f:
+                    found.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        found.sort(key=lambda meta: (meta.get('captured_at', 0), meta.get('name', '')))
+        return found
+
+    def load(self, name: str) -> Dict:
+        """Metadados e HTML de uma captura (para reprocessar)"""
+        base = os.path.join(self.directory, name)
+        with open(base + META_SUFFIX, encoding='utf-8') as f:
+            meta = json.load(f)
+        with gzip.open(base + HTML_SUFFIX, 'rt', encoding='utf-8') as f:
+            meta['html'] = f.read()
+        return meta
+
+    def _files(self, name: str) -> List[str]:
+        base = os.path.join(self.directory, name)
+        return [base + suffix for suffix in (HTML_SUFFIX, SCREENSHOT_SUFFIX, META_SUFFIX)
+                if os.path.exists(base + suffix)]
+
+    def prune(self) -> int:
+        """Apaga as capturas mais antigas até caber em DIAGNOSTICS_MAX_MB"""
+        snapshots = self.snapshots()
+        sizes = {meta['name']: sum(os.path.getsize(path) for path in self._files(meta['name']))
+                 for meta in snapshots}
+        total = sum(sizes.values())
+        removed = 0
+        # A captura mais recente fica mesmo que sozinha passe do limite
+        for meta in snapshots[:-1]:
+            if total <= self.max_bytes:
+                break
+            for path in self._files(meta['name']):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= sizes[meta['name']]
+            removed += 1
+        return removed
+
+
+def replay(snapshot: Dict) -> Dict:
+    """Reprocessa o HTML de uma captura com as regras atuais de listagem/extração"""
+    from .extraction import extract_details
+    from .http_engine import LxmlPage
+    from .listing import find_table, parse_listing
+    from .selector_stats import isolated_stats
+
+    page = LxmlPage(snapshot['html'])
+    # Reprocessar uma captura não pode mudar os seletores pulados nas execuções reais
+    with isolated_stats():
+        if snapshot['reason'] == DETAIL:
+            return {'has_preview': page.has_preview(), 'details': extract_details(page)}
+        _, winner = find_table(page)
+        matches = parse_listing(page, sys.maxsize, snapshot.get('current_url') or snapshot['url'])
+    return {'table_selector': winner, 'matches': len(matches)}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    ring = DiagnosticsRing()
+    if not argv:
+        for meta in ring.snapshots():
+            print(f"{meta['name']}  {meta['reason']:<14} {meta['url']}")
+        return 0
+    for name in argv:
+        print(json.dumps({'name': name, **replay(ring.load(name))}, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
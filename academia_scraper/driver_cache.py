@@ -0,0 +1,178 @@
+"""
+Inicialização rápida do Chrome: resolução do chromedriver em cache e perfis reaproveitáveis
+
+No modo local o ChromeDriverManager().install() consulta a rede a cada
+execução. Aqui o caminho e a versão do chromedriver resolvido ficam em
+/app/data/chromedriver.json e só são resolvidos de novo quando a versão
+principal do Chrome instalado muda (ou o binário some).
+
+Os perfis do Chrome ficam em /app/data/chrome-profiles/session-N: o cache
+de disco (CSS/JS do site) sobrevive entre execuções. Cada sessão ativa
+trava um perfil com flock, porque o Chrome não aceita duas instâncias no
+mesmo diretório.
+"""
+
+import fcntl
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import time
+from typing import Callable, Optional, Tuple
+
+from .config import env_bool, env_int, get_data_dir
+
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILE = 'chromedriver.json'
+
+# Binários procurados quando CHROME_BIN não está definido
+CHROME_CANDIDATES = (
+    'google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome',
+    '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome',
+)
+
+# Arquivos de trava que o Chrome deixa no perfil quando morre
+_SINGLETON_FILES = ('SingletonLock', 'SingletonSocket', 'SingletonCookie')
+
+_VERSION_RE = re.compile(r'(\d+)\.(\d+)\.(\d+)\.(\d+)')
+
+
+def _run_version(binary: str) -> Optional[str]:
+    """Versão (x.y.z.w) informada por `<binário> --version`, sem acessar a rede"""
+    try:
+        output = subprocess.run([binary, '--version'], capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = _VERSION_RE.search(output or '')
+    return match.group(0) if match else None
+
+
+def _major(version: Optional[str]) -> Optional[str]:
+    return version.split('.', 1)[0] if version else None
+
+
+def find_chrome_binary() -> Optional[str]:
+    """Caminho do Chrome instalado (CHROME_BIN ou os nomes mais comuns)"""
+    chrome_bin = os.getenv('CHROME_BIN')
+    if chrome_bin:
+        return chrome_bin
+    for candidate in CHROME_CANDIDATES:
+        path = candidate if os.path.isabs(candidate) else shutil.which(candidate)
+        if path and os.path.exists(path):
+            return path
+    return None
+
+
+def browser_version() -> Optional[str]:
+    binary = find_chrome_binary()
+    return _run_version(binary) if binary else None
+
+
+class DriverResolutionCache:
+    """Lembra o chromedriver resolvido e a versão do Chrome para a qual ele serve"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(get_data_dir(), CACHE_FILE)
+
+    def load(self) -> dict:
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save(self, entry: dict):
+        tmp_path = f'{self.path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def resolve(self, installer: Callable[[], str]) -> Tuple[str, str]:
+        """Retorna (caminho do chromedriver, origem: cached ou resolved)
+
+        `installer` só é chamado (com acesso à rede) se o cache não servir;
+        se ele falhar, um chromedriver em cache ainda existente é usado
+        mesmo com versão diferente.
+        """
+        entry = self.load()
+        cached_path = entry.get('path')
+        cached_ok = bool(cached_path) and os.path.exists(cached_path)
+        current = browser_version()
+
+        # Versão do Chrome desconhecida (ex.: Windows): confia no cache
+        if cached_ok and (current is None or _major(current) == _major(entry.get('browser_version'))):
+            return cached_path, 'cached'
+
+        if cached_ok:
+            logger.info("Chrome mudou de versão (%s -> %s), resolvendo o chromedriver de novo",
+                        entry.get('browser_version'), current)
+        try:
+            path = installer()
+        except Exception as e:
+            if cached_ok:
+                logger.warning("Falha ao resolver o chromedriver (%s); usando o do cache", e)
+                return cached_path, 'cached'
+            raise
+
+        try:
+            self.save({'path': path, 'driver_version': _run_version(path), 'browser_version': current,
+                       'resolved_at': time.time()})
+        except OSError as e:
+            logger.warning("Não foi possível gravar o cache do chromedriver: %s", e)
+        return path, 'resolved'
+
+
+def profiles_enabled() -> bool:
+    return env_bool('BROWSER_PROFILE', True)
+
+
+def profiles_root() -> str:
+    return os.getenv('BROWSER_PROFILE_DIR') or os.path.join(get_data_dir(), 'chrome-profiles')
+
+
+class ProfileSlot:
+    """Diretório de perfil do Chrome travado para uma única sessão"""
+
+    def __init__(self, path: str, lock_file, warm: bool):
+        self.path = path
+        self.warm = warm
+        self._lock_file = lock_file
+
+    def release(self):
+        if self._lock_file:
+            try:
+                fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+            finally:
+                self._lock_file.close()
+                self._lock_file = None
+
+
+def acquire_profile(root: Optional[str] = None, slots: Optional[int] = None) -> Optional[ProfileSlot]:
+    """Trava o primeiro perfil livre (None se todos estiverem em uso)"""
+    root = root or profiles_root()
+    slots = slots if slots is not None else env_int('BROWSER_PROFILE_SLOTS', 8)
+    for index in range(slots):
+        path = os.path.join(root, f'session-{index}')
+        os.makedirs(path, exist_ok=True)
+        lock_file = open(os.path.join(path, '.scraper.lock'), 'w')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            continue
+
+        # Com a trava em mãos nenhum Chrome usa este perfil: as travas do
+        # próprio Chrome são restos de uma execução que morreu (em outro
+        # container ele recusaria o perfil como "em uso em outro computador")
+        for name in _SINGLETON_FILES:
+            try:
+                os.remove(os.path.join(path, name))
+            except FileNotFoundError:
+                pass
+        warm = os.path.isdir(os.path.join(path, 'Default'))
+        return ProfileSlot(path, lock_file, warm)
+    return None
@@ -0,0 +1,130 @@
+"""
+Pool de sessões do Chrome para buscar páginas de detalhes em paralelo
+"""
+
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Iterable, List, Optional, TypeVar
+
+from .browser import create_chrome_driver, driver_alive, quit_driver
+from .watchdog import SessionWatchdog, recycle_session
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+class DriverPool:
+    """Mantém N sessões headless do Chrome e distribui tarefas entre elas.
+
+    Cada sessão é usada por apenas uma thread por vez; as tarefas recebem a
+    sessão como argumento e os resultados voltam na mesma ordem da entrada.
+    """
+
+    def __init__(self, size: int, factory: Callable = create_chrome_driver,
+                 watchdog: Optional[SessionWatchdog] = None):
+        self.size = size
+        self._factory = factory
+        self._drivers = []
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        # Troca as sessões que passarem dos limites de páginas/memória
+        self.watchdog = watchdog or SessionWatchdog()
+
+    def start(self):
+        """Inicia as sessões do pool (mantém as que subirem com sucesso)"""
+        logger.info("Iniciando pool com %d sessões do Chrome", self.size)
+        for i in range(self.size):
+            try:
+                driver = self._factory()
+            except Exception as e:
+                logger.error("Erro ao iniciar sessão %d do pool: %s", i + 1, e)
+                continue
+            self._drivers.append(driver)
+            self._idle.put(driver)
+
+        if not self._drivers:
+            raise RuntimeError("Nenhuma sessão do Chrome pôde ser iniciada para o pool")
+
+        logger.info("Pool pronto com %d sessões", len(self._drivers))
+        return self
+
+    @property
+    def active_sessions(self) -> int:
+        return len(self._drivers)
+
+    @property
+    def drivers(self) -> List:
+        """Sessões atuais do pool (cópia)"""
+        with self._lock:
+            return list(self._drivers)
+
+    @contextmanager
+    def session(self):
+        """Empresta uma sessão livre do pool (bloqueia até haver uma)"""
+        driver = self._idle.get()
+        try:
+            yield driver
+        finally:
+            self._idle.put(self._recycle_if_needed(driver))
+
+    def _recycle_if_needed(self, driver):
+        """Sessão devolvida ao pool: nova se a atual passou dos limites do watchdog"""
+        reason = self.watchdog.recycle_reason(driver)
+        if not reason:
+            return driver
+        replacement = recycle_session(driver, self._factory, reason)
+        if replacement is not driver:
+            with self._lock:
+                self._drivers = [replacement if item is driver else item for item in self._drivers]
+        return replacement
+
+    def map_ordered(self, func: Callable[[T, object], R], items: Iterable[T]) -> List[R]:
+        """Executa func(item, driver) para cada item, preservando a ordem"""
+        items = list(items)
+        if not items:
+            return []
+
+        def task(item):
+            with self.session() as driver:
+                return func(item, driver)
+
+        with ThreadPoolExecutor(max_workers=self.active_sessions) as executor:
+            return list(executor.map(task, items))
+
+    def heal(self) -> int:
+        """Substitui as sessões que morreram; retorna quantas foram recriadas
+
+        Só deve ser chamado com o pool ocioso (entre execuções).
+        """
+        replaced = 0
+        drivers = []
+        for driver in self._drivers:
+            if driver_alive(driver):
+                drivers.append(driver)
+                continue
+            quit_driver(driver)
+            try:
+                drivers.append(self._factory())
+                replaced += 1
+            except Exception as e:
+                logger.error("Erro ao recriar sessão do pool: %s", e)
+
+        self._drivers = drivers
+        self._idle = queue.Queue()
+        for driver in drivers:
+            self._idle.put(driver)
+        if replaced:
+            logger.warning("%d sessões do pool recriadas", replaced)
+        return replaced
+
+    def close(self):
+        """Fecha todas as sessões do pool"""
+        for driver in self._drivers:
+            quit_driver(driver)
+        self._drivers = []
+        self._idle = queue.Queue()
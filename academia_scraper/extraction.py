@@ -0,0 +1,406 @@
+"""
+Regras de extração das páginas de detalhes
+
+As cascatas de seletores ficam aqui, independentes do backend: cada função
+recebe uma "página" com dois métodos, select(selector) -> lista de elementos
+e text(elemento) -> str. Assim o mesmo conjunto de regras roda tanto no
+Selenium (SeleniumPage) quanto sobre o HTML estático via lxml (LxmlPage).
+"""
+
+import logging
+import re
+from dataclasses import asdict
+from typing import Dict, List, Optional
+
+from .metrics import observe_cascade
+from .models import Odds
+from .selector_stats import ordered, record_hit
+
+
+logger = logging.getLogger(__name__)
+
+
+# Seletores ESPECÍFICOS para odds
+ODDS_SELECTORS = [
+    # Seletor específico fornecido
+    "bet-suggestion > preview_bet_odd > div.preview_bet > p.preview_odd",
+    ".bet-suggestion .preview_bet_odd .preview_bet p.preview_odd",
+    ".preview_bet p.preview_odd",
+    "p.preview_odd",
+
+    # Seletores genéricos como fallback
+    "[class*='odd']",
+    "[class*='bet']",
+    "[class*='quote']",
+    "[class*='price']",
+    ".odds",
+    ".bet-odds"
+]
+# Fallbacks genéricos de cada cascata: vencer com um deles não indica que os
+# seletores específicos pararam de funcionar (ver selector_stats)
+ODDS_GENERIC = frozenset(ODDS_SELECTORS[ODDS_SELECTORS.index("[class*='odd']"):])
+
+# PRIMEIRA INFORMAÇÃO da description: Sugestão de aposta
+DESCRIPTION_SUGGESTION_SELECTORS = [
+    "#_preview div.preview_main_container article div.preview_resume div.preview_intro.toggle_content",
+    "div.preview_resume div.preview_intro.toggle_content",
+    "div.preview_intro.toggle_content",
+    ".preview_intro.toggle_content"
+]
+
+# SEGUNDA INFORMAÇÃO da description: Previsão
+DESCRIPTION_PREVIEW_SELECTORS = [
+    "#_preview div.preview_main_container article div.preview_pre_intro div.preview_body",
+    "div.preview_pre_intro div.preview_body",
+    "div.preview_body"
+]
+
+# PREDICTION = APENAS a Sugestão de aposta (texto curto)
+# Busca diretamente o primeiro <p> dentro de div.preview_bet (ignora p.preview_odd)
+PREDICTION_SELECTORS = [
+    "#_preview div.preview_main_container article div.preview_container div.preview_resume div.bet-suggestion div.preview_bet_odd div.preview_bet p:not(.preview_odd)",
+    "#_preview div.preview_main_container article div.bet-suggestion div.preview_bet_odd div.preview_bet p:not(.preview_odd)",
+    "div.bet-suggestion div.preview_bet_odd div.preview_bet p:not(.preview_odd)",
+    "div.preview_bet_odd div.preview_bet p:not(.preview_odd)",
+    "div.preview_bet p:not(.preview_odd)",
+    # Fallback: pega o primeiro p de qualquer forma
+    "div.preview_bet p:first-child",
+    "div.preview_bet p",
+]
+PREDICTION_GENERIC = frozenset(PREDICTION_SELECTORS[PREDICTION_SELECTORS.index("div.preview_bet p:first-child"):])
+
+# FALLBACK: Seletores antigos caso os novos não funcionem
+PREDICTION_FALLBACK_SELECTORS = [
+    "bet-suggestion > preview_bet_odd > div.preview_bet > p",
+    ".bet-suggestion .preview_bet_odd .preview_bet > p",
+    ".preview_bet > p",
+    "div.preview_bet p",
+    "[class*='prediction']",
+    "[class*='tip']",
+    "[class*='recommendation']",
+    "[class*='forecast']",
+    ".prediction",
+    ".tip",
+    ".recommendation"
+]
+PREDICTION_FALLBACK_GENERIC = frozenset(
+    PREDICTION_FALLBACK_SELECTORS[PREDICTION_FALLBACK_SELECTORS.index("[class*='prediction']"):])
+
+LEAGUE_GAMEHEAD_SELECTOR = "td.stats-game-head-date ul li.gamehead"
+
+# ESTRATÉGIA 2: Seletores alternativos de liga
+LEAGUE_SELECTORS = [
+    ".stats-game-head-date ul li.gamehead",
+    "ul li.gamehead",
+    "[class*='league']",
+    "[class*='competition']",
+    "[class*='tournament']",
+    "[class*='championship']",
+    ".league",
+    ".competition"
+]
+LEAGUE_GENERIC = frozenset(LEAGUE_SELECTORS[LEAGUE_SELECTORS.index("[class*='league']"):])
+
+PREMIUM_SELECTORS = [
+    "[class*='premium']",
+    "[class*='vip']",
+    "[class*='pro']",
+    "[class*='paid']",
+    ".premium",
+    ".vip"
+]
+
+# Bloco que indica que a página de detalhes tem a análise renderizada
+PREVIEW_BLOCK_SELECTOR = "#_preview"
+
+
+# Todas as cascatas usadas por extract_details (ordem preservada, sem repetição)
+DETAIL_SELECTORS = list(dict.fromkeys(
+    ODDS_SELECTORS + PREDICTION_SELECTORS + PREDICTION_FALLBACK_SELECTORS
+    + DESCRIPTION_SUGGESTION_SELECTORS + DESCRIPTION_PREVIEW_SELECTORS
+    + [LEAGUE_GAMEHEAD_SELECTOR] + LEAGUE_SELECTORS
+))
+
+# Máximo de textos coletados por seletor no snapshot em lote
+SNAPSHOT_MAX_ELEMENTS = 100
+
+# Avalia todos os seletores no navegador em uma única chamada e devolve
+# {seletor: [textos]} (null para seletor inválido). Elementos não
+# renderizados retornam '' como no .text do Selenium.
+BATCH_SNAPSHOT_SCRIPT = """
+var selectors = arguments[0], maxElements = arguments[1], result = {};
+function visibleText(el) {
+    if (!el.getClientRects().length) { return ''; }
+    var style = window.getComputedStyle(el);
+    if (style.visibility === 'hidden' || style.display === 'none') { return ''; }
+    return el.innerText || '';
+}
+for (var i = 0; i < selectors.length; i++) {
+    var texts = [];
+    try {
+        var nodes = document.querySelectorAll(selectors[i]);
+        for (var j = 0; j < nodes.length && j < maxElements; j++) {
+            texts.push(visibleText(nodes[j]));
+        }
+    } catch (e) {
+        texts = null;
+    }
+    result[selectors[i]] = texts;
+}
+return result;
+"""
+
+
+class SeleniumPage:
+    """Adaptador de página sobre um WebDriver do Selenium"""
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def select(self, selector: str) -> list:
+        from selenium.webdriver.common.by import By
+        return self.driver.find_elements(By.CSS_SELECTOR, selector)
+
+    def text(self, element) -> str:
+        return element.text
+
+
+class SnapshotPage:
+    """Adaptador de página sobre textos já coletados ({seletor: [textos]})
+
+    Os "elementos" são os próprios textos; seletores ausentes ou inválidos
+    levantam exceção, como o find_elements faria, para manter o fluxo das
+    cascatas.
+    """
+
+    def __init__(self, texts: Dict[str, Optional[List[str]]]):
+        self.texts = texts
+
+    def select(self, selector: str) -> list:
+        texts = self.texts.get(selector)
+        if texts is None:
+            raise ValueError(f"Seletor indisponível no snapshot: {selector}")
+        return texts
+
+    def text(self, element) -> str:
+        return element
+
+
+def snapshot_page(driver, selectors: List[str] = DETAIL_SELECTORS) -> SnapshotPage:
+    """Coleta os textos de todas as cascatas com um único execute_script"""
+    texts = driver.execute_script(BATCH_SNAPSHOT_SCRIPT, selectors, SNAPSHOT_MAX_ELEMENTS)
+    return SnapshotPage(texts or {})
+
+
+def extract_odds(page) -> List[Odds]:
+    """Extrai odds da página de detalhes"""
+    odds = []
+    winner = None
+
+    candidates = ordered('odds', ODDS_SELECTORS)
+    for selector in candidates:
+        try:
+            odds_elements = page.select(selector)
+            logger.debug("Testando seletor de odds '%s': %d elementos", selector, len(odds_elements))
+
+            # Pega apenas o PRIMEIRO elemento (apenas 1 odd)
+            if odds_elements:
+                element = odds_elements[0]
+                try:
+                    odd_text = page.text(element).strip()
+
+                    # Extrai números do texto (ex: "Odd 1.95" -> "1.95")
+                    match = re.search(r'\d+\.?\d*', odd_text)
+                    if match:
+                        odd_value = float(match.group())
+                        odds.append(Odds(house="Bet365", value=odd_value))
+                        logger.debug("Odd encontrada: %s (texto original: '%s')", odd_value, odd_text)
+                except:
+                    pass
+
+            if odds:
+                logger.debug("Odd cadastrada com seletor '%s'", selector)
+                winner = selector
+                break
+        except Exception as e:
+            continue
+
+    observe_cascade('odds', ODDS_SELECTORS.index(winner) if winner else None)
+    record_hit('odds', winner, candidates, ODDS_GENERIC)
+    if not odds:
+        logger.info("Nenhuma odd encontrada")
+
+    return odds
+
+
+def _first_text(page, selectors: List[str], label: str, cascade: str) -> Optional[str]:
+    """Retorna o texto do primeiro elemento com mais de 3 caracteres"""
+    text = None
+    winner = None
+    candidates = ordered(cascade, selectors)
+    for selector in candidates:
+        try:
+            elements = page.select(selector)
+            logger.debug("Testando seletor de %s '%s': %d elementos", label, selector, len(elements))
+            if elements:
+                text = page.text(elements[0]).strip()
+                if text and len(text) > 3:
+                    logger.debug("%s encontrada: %s...", label.capitalize(), text[:50])
+                    winner = selector
+                    break
+        except Exception as e:
+            continue
+    observe_cascade(cascade, selectors.index(winner) if winner else None)
+    record_hit(cascade, winner, candidates)
+    return text
+
+
+def extract_description(page) -> str:
+    """Extrai description da página de detalhes (Sugestão de aposta + Previsão)"""
+    descriptions = []
+
+    suggestion_text = _first_text(page, DESCRIPTION_SUGGESTION_SELECTORS, "sugestão",
+                                  'description_suggestion')
+    if suggestion_text:
+        descriptions.append(f"**Sugestão de aposta:**\n{suggestion_text}")
+
+    preview_text = _first_text(page, DESCRIPTION_PREVIEW_SELECTORS, "previsão", 'description_preview')
+    if preview_text:
+        descriptions.append(f"**Previsão:**\n{preview_text}")
+
+    # Concatena as duas informações
+    if descriptions:
+        final_description = "\n\n".join(descriptions)
+        logger.debug("Description completa extraída (%d caracteres)", len(final_description))
+        return final_description
+
+    logger.info("Nenhuma description encontrada")
+    return ""
+
+
+def extract_prediction(page) -> Optional[str]:
+    """Extrai predição da página de detalhes (APENAS a sugestão de aposta curta)"""
+    candidates = ordered('prediction', PREDICTION_SELECTORS)
+    for selector in candidates:
+        try:
+            elements = page.select(selector)
+            logger.debug("Testando seletor de predição '%s': %d elementos", selector, len(elements))
+            if elements:
+                suggestion_text = page.text(elements[0]).strip()
+                # Verifica se não é a odd (não deve começar com "Odd" nem ser só número)
+                if suggestion_text and len(suggestion_text) > 3 and not suggestion_text.lower().startswith('odd') and not re.match(r'^\d+\.?\d*$', suggestion_text):
+                    logger.debug("Predição (sugestão) encontrada: %s...", suggestion_text[:50])
+                    observe_cascade('prediction', PREDICTION_SELECTORS.index(selector))
+                    record_hit('prediction', selector, candidates, PREDICTION_GENERIC)
+                    return suggestion_text
+        except Exception as e:
+            continue
+    record_hit('prediction', None, candidates)
+
+    logger.debug("Tentando seletores de fallback para predição")
+    candidates = ordered('prediction_fallback', PREDICTION_FALLBACK_SELECTORS)
+    for selector in candidates:
+        try:
+            pred_elements = page.select(selector)
+            logger.debug("Testando seletor de fallback '%s': %d elementos", selector, len(pred_elements))
+
+            for pred_element in pred_elements:
+                prediction = page.text(pred_element).strip()
+                if prediction and len(prediction) > 3 and not re.match(r'^\d+\.?\d*$', prediction):
+                    logger.debug("Predição encontrada com fallback '%s': %s...", selector, prediction[:50])
+                    observe_cascade('prediction',
+                                    len(PREDICTION_SELECTORS) + PREDICTION_FALLBACK_SELECTORS.index(selector))
+                    record_hit('prediction_fallback', selector, candidates, PREDICTION_FALLBACK_GENERIC)
+                    return prediction
+
+        except Exception:
+            continue
+
+    observe_cascade('prediction', None)
+    record_hit('prediction_fallback', None, candidates)
+    logger.info("Nenhuma predição encontrada")
+    return None
+
+
+def extract_league(page) -> Optional[str]:
+    """Extrai a liga a partir do cabeçalho da partida (li.gamehead)"""
+    try:
+        logger.debug("Procurando por li.gamehead")
+        gamehead_elements = page.select(LEAGUE_GAMEHEAD_SELECTOR)
+
+        if len(gamehead_elements) > 1:
+            # Pula os primeiros e tenta os seguintes
+            for element in gamehead_elements[2:]:
+                league = page.text(element).strip()
+                if league and len(league) > 3:
+                    logger.debug("Liga encontrada pulando o primeiro li.gamehead: %s", league)
+                    observe_cascade('league', 0)
+                    return league
+        elif len(gamehead_elements) == 1:
+            logger.debug("Apenas 1 li.gamehead encontrado")
+        else:
+            logger.debug("Nenhum li.gamehead encontrado")
+    except Exception as e:
+        logger.debug("Erro ao buscar li.gamehead: %s", e)
+
+    # O li.gamehead (posição 0) tem regra própria e fica fora das estatísticas
+    candidates = ordered('league', LEAGUE_SELECTORS)
+    for selector in candidates:
+        try:
+            elements = page.select(selector)
+            if len(elements) > 1:
+                # Pula o primeiro
+                league = page.text(elements[1]).strip()
+                if league and len(league) > 3:
+                    logger.debug("Liga encontrada com seletor '%s' (2º elemento): %s", selector, league)
+                    observe_cascade('league', 1 + LEAGUE_SELECTORS.index(selector))
+                    record_hit('league', selector, candidates, LEAGUE_GENERIC)
+                    return league
+        except:
+            continue
+
+    observe_cascade('league', None)
+    record_hit('league', None, candidates)
+    logger.info("Nenhum seletor de liga funcionou")
+    return None
+
+
+def check_premium(page) -> bool:
+    """Verifica se o conteúdo é premium"""
+    for selector in PREMIUM_SELECTORS:
+        try:
+            if page.select(selector):
+                return True
+        except:
+            continue
+
+    return False
+
+
+def extract_details(page) -> Dict:
+    """Extrai odds, predição, description e liga de uma página de detalhes"""
+    details = {}
+
+    # Procura por odds
+    odds = extract_odds(page)
+    details['odds'] = [asdict(odd) for odd in odds]
+
+    # Procura por predição
+    prediction = extract_prediction(page)
+    if prediction:
+        details['prediction'] = prediction
+
+    # Procura por description (nova propriedade)
+    description = extract_description(page)
+    if description:
+        details['description'] = description
+
+    # Procura por liga
+    league = extract_league(page)
+    if league:
+        details['league'] = league
+
+    # Verifica se é premium (DESABILITADO)
+    # details['isPremium'] = check_premium(page)
+
+    return details
@@ -0,0 +1,128 @@
+"""
+Fronteira de rastreamento: várias páginas de listagem por execução
+
+Em vez de ler só a tabela da página principal, a execução percorre uma
+fila de listagens (datas, esportes, competições e suas páginas seguintes)
+com limites por execução de páginas e de partidas. URLs de detalhes
+repetidas entre listagens são descartadas, e em cada listagem as partidas
+ainda desconhecidas (sem detalhes em cache) vêm primeiro.
+
+As listagens vêm de LISTING_URLS, relativas à página principal, e podem
+usar {date} (AAAA-MM-DD) para as datas de LISTING_DAYS:
+
+    LISTING_URLS="/,/stats/livescores/{date}"   LISTING_DAYS="0,1"
+
+Cada listagem expandida de {date} guarda o seu dia (listing_date), que as
+páginas seguintes herdam: é a data das partidas dela (matchTime e ID).
+"""
+
+import logging
+import os
+from collections import deque
+from datetime import date, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import urldefrag, urljoin
+
+from .config import env_int
+
+
+logger = logging.getLogger(__name__)
+
+
+def listing_seeds(base_url: str, spec: Optional[str] = None, days: Optional[str] = None,
+                  today: Optional[date] = None) -> List[Tuple[str, Optional[date]]]:
+    """(URL absoluta, dia) das listagens configuradas (padrão: só a página principal)
+
+    O dia só é conhecido nas listagens com {date}; nas demais é None (hoje).
+    """
+    spec = spec if spec is not None else os.getenv('LISTING_URLS', '')
+    days = days if days is not None else os.getenv('LISTING_DAYS', '0')
+    today = today or date.today()
+    offsets = [int(day) for day in days.split(',') if day.strip().lstrip('-').isdigit()] or [0]
+
+    seeds = []
+    for template in (part.strip() for part in spec.split(',')):
+        if not template:
+            continue
+        if '{date}' in template:
+            for offset in offsets:
+                day = today + timedelta(days=offset)
+                seeds.append((urljoin(base_url, template.replace('{date}', day.isoformat())), day))
+        else:
+            seeds.append((urljoin(base_url, template), None))
+    return seeds or [(base_url, None)]
+
+
+class CrawlFrontier:
+    """Fila de listagens e conjunto de partidas já vistas nesta execução"""
+
+    def __init__(self, seeds: Iterable[Union[str, Tuple[str, Optional[date]]]], max_pages: Optional[int] = None,
+                 max_matches: int = 5, known: Optional[Callable[[str], bool]] = None):
+        self.max_pages = max_pages if max_pages is not None else env_int('FRONTIER_MAX_PAGES', 10)
+        self.max_matches = max_matches
+        # Diz se os detalhes de uma URL já são conhecidos (ex.: estão no cache)
+        self.known = known
+        self._queue = deque()
+        self._queued = set()
+        self._dates: Dict[str, Optional[date]] = {}
+        self.seen_details = set()
+        self.pages_visited = 0
+        self.accepted = 0
+        self.duplicates = 0
+        for seed in seeds:
+            url, listing_date = seed if isinstance(seed, tuple) else (seed, None)
+            self.add_listing(url, listing_date)
+
+    @property
+    def remaining(self) -> int:
+        return max(self.max_matches - self.accepted, 0)
+
+    def add_listing(self, url: Optional[str], listing_date: Optional[date] = None) -> bool:
+        """Enfileira uma listagem (ex.: a próxima página) ainda não enfileirada"""
+        if not url:
+            return False
+        url = urldefrag(url)[0]
+        if url in self._queued:
+            return False
+        self._queued.add(url)
+        self._queue.append(url)
+        self._dates[url] = listing_date
+        return True
+
+    def add_next_page(self, url: Optional[str], current: str) -> bool:
+        """Enfileira a próxima página de uma listagem (mesmo dia da atual)"""
+        return self.add_listing(url, self.listing_date(current))
+
+    def listing_date(self, url: str) -> Optional[date]:
+        """Dia das partidas de uma listagem (None = hoje)"""
+        return self._dates.get(urldefrag(url)[0])
+
+    def next_listing(self) -> Optional[str]:
+        """Próxima listagem a visitar (None ao atingir algum limite)"""
+        if not self._queue or not self.remaining or self.pages_visited >= self.max_pages:
+            return None
+        self.pages_visited += 1
+        return self._queue.popleft()
+
+    def accept(self, matches: List[Dict]) -> List[Dict]:
+        """Filtra as partidas de uma listagem: sem repetidas, desconhecidas primeiro, até o limite"""
+        fresh = []
+        for match in matches:
+            key = match.get('detail_url') or match['id']
+            if key in self.seen_details:
+                self.duplicates += 1
+                continue
+            self.seen_details.add(key)
+            fresh.append(match)
+
+        if self.known:
+            # sorted é estável: a ordem da listagem se mantém dentro de cada grupo
+            fresh.sort(key=lambda match: bool(match.get('detail_url')) and self.known(match['detail_url']))
+
+        fresh = fresh[:self.remaining]
+        self.accepted += len(fresh)
+        return fresh
+
+    def summary(self) -> Dict[str, int]:
+        return {'pages': self.pages_visited, 'matches': self.accepted,
+                'duplicates': self.duplicates, 'pending_pages': len(self._queue)}
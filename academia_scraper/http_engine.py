@@ -0,0 +1,181 @@
+"""
+Backend de extração sem navegador: requests + lxml
+
+Busca as páginas de detalhes com uma requests.Session (conexões reutilizadas)
+e aplica as mesmas regras de extraction.py sobre uma árvore lxml. Quando o
+HTML estático não traz o bloco #_preview, retorna None para que o scraper
+use o Selenium como fallback.
+"""
+
+import logging
+from typing import Dict, Optional
+
+import lxml.html
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .browser import USER_AGENT
+from .extraction import PREVIEW_BLOCK_SELECTOR, extract_details
+from .rate_limit import limiter_for, retry_after_seconds
+from .revalidation import fragment_hash
+
+
+logger = logging.getLogger(__name__)
+
+
+# Elementos que quebram linha no texto renderizado (como o .text do Selenium)
+BLOCK_TAGS = {
+    'address', 'article', 'aside', 'blockquote', 'dd', 'div', 'dl', 'dt',
+    'fieldset', 'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3',
+    'h4', 'h5', 'h6', 'header', 'hr', 'li', 'main', 'nav', 'ol', 'p', 'pre',
+    'section', 'table', 'tbody', 'thead', 'tfoot', 'tr', 'ul'
+}
+
+# Células de tabela: o Selenium separa o texto de células vizinhas com espaço
+CELL_TAGS = {'td', 'th'}
+
+# Conteúdo que nunca aparece no texto visível
+SKIP_TAGS = {'script', 'style', 'noscript', 'template'}
+
+
+def element_text(element) -> str:
+    """Aproxima o texto visível de um elemento lxml (equivalente ao .text do Selenium)"""
+    parts = []
+
+    def walk(el):
+        tag = el.tag if isinstance(el.tag, str) else None
+        if tag in SKIP_TAGS:
+            return
+        if tag == 'br':
+            parts.append('\n')
+        is_block = tag in BLOCK_TAGS
+        if is_block:
+            parts.append('\n')
+        if tag and el.text:
+            parts.append(el.text)
+        for child in el:
+            walk(child)
+            if child.tail:
+                parts.append(child.tail)
+        if is_block:
+            parts.append('\n')
+        elif tag in CELL_TAGS:
+            parts.append(' ')
+
+    walk(element)
+    lines = (' '.join(line.split()) for line in ''.join(parts).split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+
+class LxmlPage:
+    """Adaptador de página sobre o HTML estático (árvore lxml)"""
+
+    def __init__(self, html, encoding: Optional[str] = None):
+        if isinstance(html, bytes):
+            parser = lxml.html.HTMLParser(encoding=encoding or 'utf-8')
+            self.tree = lxml.html.document_fromstring(html, parser=parser)
+        else:
+            self.tree = lxml.html.document_fromstring(html)
+
+    def select(self, selector: str) -> list:
+        return self.tree.cssselect(selector)
+
+    def text(self, element) -> str:
+        return element_text(element)
+
+    def has_preview(self) -> bool:
+        """Indica se a análise (#_preview) está presente no HTML estático"""
+        return bool(self.select(PREVIEW_BLOCK_SELECTOR))
+
+    def fragment_html(self, selector: str) -> Optional[str]:
+        """HTML do primeiro elemento do seletor (None se ausente)"""
+        elements = self.select(selector)
+        if not elements:
+            return None
+        return lxml.html.tostring(elements[0], encoding='unicode')
+
+
+def build_session(pool_size: int = 10) -> requests.Session:
+    """Cria uma Session com pool de conexões keep-alive e retentativas leves"""
+    session = requests.Session()
+    retry = Retry(total=2, backoff_factor=0.5,
+                  status_forcelist=(502, 503, 504), allowed_methods=('GET', 'HEAD'))
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update({
+        'User-Agent': USER_AGENT,
+        'Accept': 'text/html,application/xhtml+xml',
+        'Accept-Language': 'pt-BR,pt;q=0.9,en;q=0.8',
+    })
+    return session
+
+
+def response_encoding(response: requests.Response) -> Optional[str]:
+    """Charset declarado no Content-Type (None deixa o lxml usar o padrão)"""
+    if 'charset' in response.headers.get('Content-Type', '').lower():
+        return response.encoding
+    return None
+
+
+class HttpDetailFetcher:
+    """Extrai detalhes das partidas sem abrir o Chrome"""
+
+    def __init__(self, session: Optional[requests.Session] = None, timeout: int = 15,
+                 revalidator=None):
+        self.session = session or build_session()
+        self.timeout = timeout
+        self.revalidator = revalidator
+
+    def fetch_page(self, url: str, headers: Optional[Dict[str, str]] = None) -> Optional[requests.Response]:
+        """Baixa uma página (None em caso de erro HTTP; 304 é devolvido)"""
+        with limiter_for(url).slot() as ticket:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+            ticket.record(response.status_code, retry_after=retry_after_seconds(response.headers.get('Retry-After')))
+        if response.status_code not in (200, 304):
+            logger.warning("HTTP %d ao buscar página", response.status_code,
+                           extra={'url': url, 'status_code': response.status_code})
+            return None
+        return response
+
+    def get_match_details(self, url: str) -> Optional[Dict]:
+        """Retorna os detalhes da partida ou None se o HTML estático não bastar"""
+        try:
+            logger.debug("Acessando detalhes via HTTP", extra={'url': url})
+            headers = self.revalidator.conditional_headers(url) if self.revalidator else None
+            response = self.fetch_page(url, headers)
+            if response is None:
+                return None
+
+            if response.status_code == 304:
+                logger.info("Detalhes não modificados (304)", extra={'url': url})
+                return self.revalidator.payload(url)
+
+            page = LxmlPage(response.content, response_encoding(response))
+            preview_html = page.fragment_html(PREVIEW_BLOCK_SELECTOR)
+            if preview_html is None:
+                logger.info("Bloco #_preview ausente no HTML estático", extra={'url': url})
+                return None
+
+            if not self.revalidator:
+                return extract_details(page)
+
+            preview_hash = fragment_hash(preview_html)
+            details = self.revalidator.unchanged_payload(url, preview_hash)
+            if details is not None:
+                logger.info("Bloco #_preview inalterado, reaproveitando detalhes", extra={'url': url})
+            else:
+                details = extract_details(page)
+
+            self.revalidator.store(url, preview_hash, details,
+                                   etag=response.headers.get('ETag'),
+                                   last_modified=response.headers.get('Last-Modified'))
+            return details
+
+        except Exception as e:
+            logger.warning("Erro ao buscar detalhes via HTTP: %s", e, extra={'url': url})
+            return None
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,44 @@
+"""
+Identidade estável das partidas (IDs determinísticos entre execuções)
+"""
+
+import hashlib
+import json
+import re
+import unicodedata
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """Minúsculas, sem acentos, pontuação ou espaços repetidos"""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    text = re.sub(r'[^\w\s]', ' ', text.lower())
+    return ' '.join(text.split())
+
+
+def match_identity(teams: str, league: str, match_date: str, detail_url: Optional[str] = None) -> str:
+    """Texto canônico que identifica a partida
+
+    Com página de detalhes, o caminho da URL basta: ele identifica o jogo
+    independentemente do dia em que foi coletado e de variações no texto da
+    linha. Sem ela, times, liga e a data da partida.
+    """
+    detail_path = urlparse(detail_url or '').path.rstrip('/').lower()
+    if detail_path:
+        return detail_path
+    return '|'.join([normalize_text(teams), normalize_text(league), match_date or '', ''])
+
+
+def stable_match_id(teams: str, league: str, match_date: str, detail_url: Optional[str] = None) -> str:
+    """ID determinístico: a mesma partida gera o mesmo ID em toda execução"""
+    identity = match_identity(teams, league, match_date, detail_url)
+    return f"match_{hashlib.sha1(identity.encode('utf-8')).hexdigest()[:16]}"
+
+
+def content_hash(tip: Dict) -> str:
+    """Hash do conteúdo enviado para a API (detecta tips alteradas)"""
+    payload = {k: v for k, v in tip.items() if k != 'detail_url'}
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
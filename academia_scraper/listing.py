@@ -0,0 +1,187 @@
+"""
+Regras da página principal (listagem de partidas), compartilhadas entre os motores
+
+O scraper com Selenium e o motor assíncrono montam as partidas da mesma
+forma: mesmos seletores da tabela, mesmo critério de link de detalhes e o
+mesmo dicionário de partida (ID determinístico e confidence estável).
+"""
+
+import logging
+import random
+from datetime import date
+from typing import Dict, Iterator, Optional, Tuple
+from urllib.parse import urljoin
+
+from .http_engine import LxmlPage
+from .identity import stable_match_id
+from .metrics import observe_cascade
+from .selector_stats import ordered, record_hit
+from .text_utils import RowClassification, classify_row, extract_time_from_text
+
+
+logger = logging.getLogger(__name__)
+
+
+MAIN_PAGE_URL = "https://www.academiadasapostasbrasil.com/"
+
+# Seletores da tabela de partidas, do mais específico ao mais genérico
+TABLE_SELECTORS = [
+    ".widget-double-container-left.mb-content .widget-double.livescores.large .tabs_framed.small_tabs .fh_main_tab tbody",
+    ".livescores tbody",
+    ".widget-double tbody",
+    ".mb-content tbody",
+    "tbody"
+]
+# Fallback genérico: qualquer tbody (ver selector_stats)
+TABLE_GENERIC = frozenset(["tbody"])
+
+# Links para a próxima página de uma listagem paginada
+NEXT_PAGE_SELECTORS = [
+    "a[rel='next']",
+    ".pagination a.next",
+    ".pagination li.next a",
+    ".pager .next a",
+    "a.next_page",
+]
+
+# Trechos de URL que identificam o link da página de detalhes
+DETAIL_LINK_KEYWORDS = ("match", "game", "fixture")
+
+
+def is_detail_link(href: Optional[str]) -> bool:
+    """Indica se o link aponta para uma página de detalhes de partida"""
+    if not href:
+        return False
+    href = href.lower()
+    return any(keyword in href for keyword in DETAIL_LINK_KEYWORDS)
+
+
+def build_match_data(text: str, number: int, link_url: Optional[str] = None,
+                     classification: Optional[RowClassification] = None,
+                     listing_date: Optional[date] = None) -> Dict:
+    """Cria os dados básicos de uma partida a partir do texto da linha
+
+    listing_date é o dia das partidas da listagem (padrão: hoje, como na
+    página principal).
+    """
+    # Classifica o texto (reaproveita a classificação já feita na linha)
+    classification = classification or classify_row(text)
+
+    # Extrai horário e adiciona a data da partida. Linhas sem HH:MM (ao vivo,
+    # "67'") ficam só com a data: o relógio mudaria o conteúdo da tip (e o
+    # content_hash) a cada execução e ela seria reenviada sempre
+    match_time = extract_time_from_text(text, fallback_to_now=False)
+    match_date = (listing_date or date.today()).isoformat()
+    match_time = f"{match_date} {match_time}" if match_time else match_date
+
+    # Gera ID determinístico (mesma partida = mesmo ID em toda execução)
+    match_id = stable_match_id(classification.teams, classification.league, match_date, link_url)
+
+    # Gera confidence entre 60 e 90 (estável para o mesmo ID)
+    confidence = random.Random(match_id).randint(60, 90)
+
+    return {
+        'id': match_id,
+        'category': classification.category,
+        'league': classification.league,
+        'teams': classification.teams,
+        'matchTime': match_time,
+        'prediction': 'Predição não disponível',
+        'description': '',
+        'odds': [],
+        'confidence': confidence,
+        'detail_url': link_url
+    }
+
+
+def redate_match(match: Dict, listing_date: Optional[date] = None) -> Dict:
+    """Cópia de uma partida guardada (revalidação) com a data de hoje ou da listagem
+
+    Refaz matchTime, ID e confidence como build_match_data faria agora com a
+    mesma linha.
+    """
+    match = dict(match)
+    match_date = (listing_date or date.today()).isoformat()
+    hour = (match.get('matchTime') or '').partition(' ')[2]
+    match['matchTime'] = f"{match_date} {hour}" if hour else match_date
+    match['id'] = stable_match_id(match.get('teams'), match.get('league'), match_date, match.get('detail_url'))
+    match['confidence'] = random.Random(match['id']).randint(60, 90)
+    return match
+
+
+def find_table(page) -> Tuple[Optional[object], Optional[int]]:
+    """Primeira tabela encontrada pela cascata (elemento, posição do seletor em TABLE_SELECTORS)"""
+    candidates = ordered('main_table', TABLE_SELECTORS)
+    for selector in candidates:
+        elements = page.select(selector)
+        if elements:
+            record_hit('main_table', selector, candidates, TABLE_GENERIC)
+            return elements[0], TABLE_SELECTORS.index(selector)
+    record_hit('main_table', None, candidates)
+    return None, None
+
+
+def iter_table_rows(page, table, max_matches: int, base_url: str = '',
+                    listing_date: Optional[date] = None) -> Iterator[Dict]:
+    """Gera as partidas válidas (não terminadas) de uma tabela lxml, sem detalhes
+
+    Os links relativos são resolvidos contra base_url, como o href do Selenium;
+    listing_date é o dia das partidas da listagem (None = hoje).
+    """
+    found = 0
+    for number, row in enumerate(table.iter('tr'), start=1):
+        if found >= max_matches:
+            break
+        cells = list(row.iter('td'))
+        if len(cells) < 2:
+            continue
+
+        row_text = page.text(row).strip()
+        classification = classify_row(row_text)
+        if classification.finished:
+            logger.debug("Partida terminada na linha %d - ignorando", number)
+            continue
+
+        link_url = None
+        for link in row.iterfind('.//a[@href]'):
+            href = urljoin(base_url, link.get('href'))
+            if is_detail_link(href):
+                link_url = href
+                break
+
+        found += 1
+        yield build_match_data(row_text, number, link_url, classification, listing_date)
+
+
+def next_page_url(page, base_url: str = '') -> Optional[str]:
+    """URL absoluta da próxima página da listagem (None se não houver)"""
+    for selector in NEXT_PAGE_SELECTORS:
+        for link in page.select(selector):
+            href = link.get('href')
+            if href and not href.startswith(('#', 'javascript:')):
+                return urljoin(base_url, href)
+    return None
+
+
+def parse_listing(page, max_matches: int, base_url: str = '', listing_date: Optional[date] = None) -> list:
+    """Partidas da página principal a partir do HTML (LxmlPage)"""
+    table, winner = find_table(page)
+    observe_cascade('main_table', winner)
+    if table is None:
+        return []
+    return list(iter_table_rows(page, table, max_matches, base_url, listing_date))
+
+
+def parse_table_html(table_html: str, max_matches: int, base_url: str = '',
+                     listing_date: Optional[date] = None) -> list:
+    """Partidas a partir do outerHTML da tabela (ou do tbody) capturado no navegador
+
+    Substitui as chamadas por linha e por célula ao chromedriver por um
+    único parse local; o resultado é o mesmo de create_basic_match_data.
+    """
+    # Um <tbody>/<tr> solto fora de <table> é descartado pelo parser HTML
+    page = LxmlPage(table_html if table_html.lstrip()[:6].lower() == '<table' else f'<table>{table_html}</table>')
+    tables = page.select('table')
+    if not tables:
+        return []
+    return list(iter_table_rows(page, tables[0], max_matches, base_url, listing_date))
@@ -0,0 +1,146 @@
+"""
+Logging estruturado do scraper
+
+Os módulos usam logging.getLogger(__name__); setup_logging() liga o logger
+raiz a um QueueHandler, então o loop de scraping só enfileira o registro e
+uma thread (QueueListener) faz a formatação e a escrita no console e no
+arquivo. O arquivo é rotacionado por tamanho ou por horário e as cópias
+antigas são comprimidas com gzip.
+"""
+
+import atexit
+import copy
+import gzip
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import sys
+from datetime import datetime, timezone
+from typing import Optional
+
+from .config import env_bool, env_int
+
+
+# Atributos padrão do LogRecord (o restante vem do extra= e vira campo do JSON)
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+TEXT_FORMAT = '%(asctime)s %(levelname)-7s %(name)s: %(message)s'
+
+# Bibliotecas muito verbosas no nível INFO/DEBUG
+NOISY_LOGGERS = ('selenium', 'urllib3', 'WDM', 'webdriver_manager')
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Um objeto JSON por linha: ts, level, logger, msg e os campos do extra="""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler que mantém o traceback separado da mensagem"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve a mensagem e o traceback na thread de origem (args e
+        # exc_info podem não ser serializáveis nem válidos depois)
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _gzip_namer(name: str) -> str:
+    return name + '.gz'
+
+
+def _gzip_rotator(source: str, dest: str):
+    """Comprime o arquivo rotacionado e remove o original"""
+    with open(source, 'rb') as src, gzip.open(dest, 'wb') as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(source)
+
+
+def default_log_file() -> str:
+    logs_dir = '/app/logs' if os.path.isdir('/app/logs') else os.path.join(os.getcwd(), 'logs')
+    return os.path.join(logs_dir, 'scraper.log')
+
+
+def build_file_handler(path: str, rotation: str = 'size') -> logging.Handler:
+    """Arquivo com rotação comprimida (LOG_ROTATION=size ou time)"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    backups = env_int('LOG_BACKUP_COUNT', 7)
+    if rotation == 'time':
+        handler = logging.handlers.TimedRotatingFileHandler(
+            path, when=os.getenv('LOG_ROTATE_WHEN', 'midnight'), backupCount=backups, encoding='utf-8')
+    else:
+        handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=env_int('LOG_MAX_BYTES', 10 * 1024 * 1024), backupCount=backups,
+            encoding='utf-8')
+    handler.namer = _gzip_namer
+    handler.rotator = _gzip_rotator
+    return handler
+
+
+def setup_logging(level: Optional[str] = None, log_file: Optional[str] = None,
+                  fmt: Optional[str] = None) -> logging.handlers.QueueListener:
+    """Configura o logging do processo (idempotente) e retorna o QueueListener"""
+    global _listener
+    if _listener:
+        return _listener
+
+    level = (level or os.getenv('LOG_LEVEL', 'INFO')).upper()
+    fmt = fmt or os.getenv('LOG_FORMAT', 'json')
+    log_file = log_file if log_file is not None else os.getenv('LOG_FILE', default_log_file())
+    formatter = JsonFormatter() if fmt == 'json' else logging.Formatter(TEXT_FORMAT)
+
+    handlers = []
+    if env_bool('LOG_CONSOLE', True):
+        handlers.append(logging.StreamHandler(sys.stdout))
+    if log_file:
+        try:
+            handlers.append(build_file_handler(log_file, os.getenv('LOG_ROTATION', 'size')))
+        except OSError as e:
+            print(f"⚠️ Não foi possível abrir o arquivo de log {log_file}: {e}", file=sys.stderr)
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.Queue(-1)
+    root = logging.getLogger()
+    root.handlers = [StructuredQueueHandler(log_queue)]
+    root.setLevel(level)
+    for name in NOISY_LOGGERS:
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return _listener
+
+
+def shutdown_logging():
+    """Escreve os registros pendentes na fila e para a thread de escrita"""
+    global _listener
+    if _listener:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,297 @@
+"""
+Métricas do scraper no formato de texto do Prometheus
+
+Contadores, gauges e histogramas simples (thread-safe, sem dependências)
+registrados em um registro global. Ao fim de cada execução as métricas são
+gravadas em um arquivo .prom em /app/logs (textfile collector do
+node_exporter); com METRICS_PORT, também ficam expostas em /metrics.
+"""
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .config import env_bool, env_int
+from .procfs import descendants_rss_bytes
+
+
+logger = logging.getLogger(__name__)
+
+
+# Limites (em segundos) dos histogramas de duração
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _Metric:
+    metric_type = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        with self._lock:
+            return [(self.name, dict(zip(self.labelnames, key)), value)
+                    for key, value in sorted(self._values.items())]
+
+    def get(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+
+class Counter(_Metric):
+    """Valor que só cresce (eventos, falhas, fallbacks)"""
+    metric_type = 'counter'
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    """Valor instantâneo (memória, profundidade de fila)"""
+    metric_type = 'gauge'
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """Distribuição de durações em buckets cumulativos"""
+    metric_type = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            # [contagem por bucket..., soma, total]
+            series = self._series.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        result = []
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                labels = dict(zip(self.labelnames, key))
+                for bound, count in zip(self.buckets, series):
+                    result.append((f'{self.name}_bucket', dict(labels, le=_format_value(bound)), count))
+                result.append((f'{self.name}_sum', labels, series[-2]))
+                result.append((f'{self.name}_count', labels, series[-1]))
+        return result
+
+    def get(self, **labels) -> float:
+        """Número de observações da série"""
+        with self._lock:
+            series = self._series.get(self._key(labels))
+            return series[-1] if series else 0.0
+
+
+class MetricsRegistry:
+    """Conjunto de métricas exportado em um único texto"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """Texto no formato de exposição do Prometheus"""
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.metric_type}')
+            for name, labels, value in metric.samples():
+                lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, path: str):
+        """Grava o arquivo .prom de forma atômica (o coletor nunca lê pela metade)"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    'scraper_stage_duration_seconds', 'Duração de cada etapa do scraper', ('stage',))
+SELECTOR_CASCADE = REGISTRY.counter(
+    'scraper_selector_cascade_total',
+    'Resultado das cascatas de seletores (primary, fallback ou miss)', ('cascade', 'result'))
+DETAIL_FETCHES = REGISTRY.counter(
+    'scraper_detail_fetches_total', 'Páginas de detalhes por backend e resultado', ('engine', 'outcome'))
+TIPS_SUBMITTED = REGISTRY.counter(
+    'scraper_tips_submitted_total', 'Tips enviadas para a API por resultado', ('outcome',))
+RETRIES = REGISTRY.counter(
+    'scraper_retries_total', 'Novas tentativas e fallbacks por tipo', ('kind',))
+MATCHES_DISCOVERED = REGISTRY.counter(
+    'scraper_matches_discovered_total', 'Partidas válidas encontradas na página principal')
+QUEUE_DEPTH = REGISTRY.gauge(
+    'scraper_queue_depth', 'Itens aguardando em cada fila do pipeline', ('queue',))
+BROWSER_STARTUP = REGISTRY.histogram(
+    'scraper_browser_startup_seconds',
+    'Tempo para abrir uma sessão do Chrome por origem do chromedriver e estado do perfil',
+    ('driver', 'profile'))
+CHROME_RSS = REGISTRY.gauge(
+    'scraper_chrome_rss_bytes', 'Memória residente do chromedriver e do Chrome')
+LAST_RUN = REGISTRY.gauge(
+    'scraper_last_run_timestamp_seconds', 'Horário do fim da última execução')
+LAST_RUN_SUCCESS = REGISTRY.gauge(
+    'scraper_last_run_success', 'Resultado da última execução (1 = sucesso)')
+
+# Intervalo mínimo entre leituras do /proc
+RSS_SAMPLE_INTERVAL = 5.0
+_last_rss_sample = 0.0
+_server: Optional[ThreadingHTTPServer] = None
+
+
+def timed(stage: str):
+    """Context manager que registra a duração de uma etapa"""
+    return STAGE_SECONDS.time(stage=stage)
+
+
+def observe_cascade(cascade: str, index: Optional[int]):
+    """Registra qual posição da cascata venceu (None = nenhum seletor serviu)"""
+    if index is None:
+        result = 'miss'
+    else:
+        result = 'primary' if index == 0 else 'fallback'
+    SELECTOR_CASCADE.inc(cascade=cascade, result=result)
+
+
+def sample_chrome_rss(force: bool = False):
+    """Atualiza a memória dos processos filhos (no máximo a cada RSS_SAMPLE_INTERVAL)"""
+    global _last_rss_sample
+    now = time.monotonic()
+    if not force and now - _last_rss_sample < RSS_SAMPLE_INTERVAL:
+        return
+    _last_rss_sample = now
+    CHROME_RSS.set(descendants_rss_bytes(os.getpid()))
+
+
+def metrics_enabled() -> bool:
+    return env_bool('METRICS', True)
+
+
+def textfile_path() -> str:
+    """Arquivo do textfile collector (METRICS_TEXTFILE ou logs/scraper.prom)"""
+    path = os.getenv('METRICS_TEXTFILE')
+    if path:
+        return path
+    logs_dir = '/app/logs' if os.path.isdir('/app/logs') else os.path.join(os.getcwd(), 'logs')
+    return os.path.join(logs_dir, 'scraper.prom')
+
+
+def export_metrics(path: Optional[str] = None):
+    """Grava as métricas no arquivo do textfile collector"""
+    if not metrics_enabled():
+        return
+    path = path or textfile_path()
+    try:
+        REGISTRY.write_textfile(path)
+        logger.info("Métricas gravadas em %s", path)
+    except OSError as e:
+        logger.warning("Não foi possível gravar as métricas: %s", e)
+
+
+def start_metrics_server(port: Optional[int] = None, host: str = '0.0.0.0') -> Optional[ThreadingHTTPServer]:
+    """Expõe /metrics em uma thread (METRICS_PORT; 0 desativa)"""
+    global _server
+    port = port if port is not None else env_int('METRICS_PORT', 0)
+    if _server or port <= 0 or not metrics_enabled():
+        return _server
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = REGISTRY.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    try:
+        _server = ThreadingHTTPServer((host, port), Handler)
+    except OSError as e:
+        logger.warning("Endpoint de métricas indisponível na porta %d: %s", port, e)
+        return None
+    _server.daemon_threads = True
+    threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+    logger.info("Métricas disponíveis em http://%s:%d/metrics", host, port)
+    return _server
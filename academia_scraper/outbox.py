@@ -0,0 +1,170 @@
+"""
+Fila de saída persistente das tips (SQLite em /app/data)
+
+Tips que falham no envio ficam guardadas com o número de tentativas e o
+horário da próxima tentativa (backoff exponencial com jitter). Nas execuções
+seguintes são reenviadas com a mesma chave de idempotência, dentro de um
+orçamento de tempo para nunca travar o scraping. Tips cuja partida já
+apareceu na execução atual não são reenviadas: o conteúdo novo vale mais
+que o guardado, e o envio dele resolve a entrada do outbox.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .config import env_float, env_int, get_data_dir
+from .identity import content_hash, stable_match_id
+from .metrics import RETRIES
+
+
+logger = logging.getLogger(__name__)
+
+
+# Respostas 4xx que não adianta repetir (exceto timeout e rate limit)
+RETRYABLE_CLIENT_STATUS = (408, 409, 425, 429)
+
+
+def idempotency_key(tip: Dict) -> str:
+    """Chave estável da partida (o próprio ID determinístico da tip)"""
+    if tip.get('id'):
+        return tip['id']
+    match_date = (tip.get('matchTime') or '').split(' ')[0]
+    return stable_match_id(tip.get('teams'), tip.get('league'), match_date, tip.get('detail_url'))
+
+
+def batch_idempotency_key(tips: List[Dict]) -> str:
+    """Chave de um lote: o mesmo conjunto de tips com o mesmo conteúdo gera a mesma chave"""
+    parts = sorted(f"{idempotency_key(tip)}:{content_hash(tip)}" for tip in tips)
+    digest = hashlib.sha256('\n'.join(parts).encode('utf-8')).hexdigest()
+    return f"batch_{digest[:32]}"
+
+
+def is_retryable(status_code: Optional[int]) -> bool:
+    """Erros de rede, 5xx e alguns 4xx merecem nova tentativa"""
+    if status_code is None:
+        return True
+    return status_code >= 500 or status_code in RETRYABLE_CLIENT_STATUS
+
+
+class TipOutbox:
+    """Outbox com retentativas limitadas e reenvio idempotente"""
+
+    def __init__(self, path: Optional[str] = None, max_attempts: Optional[int] = None,
+                 base_delay: Optional[float] = None, max_delay: Optional[float] = None):
+        self.path = path or os.path.join(get_data_dir(), 'outbox.sqlite3')
+        self.max_attempts = max_attempts if max_attempts is not None else env_int('OUTBOX_MAX_ATTEMPTS', 8)
+        self.base_delay = base_delay if base_delay is not None else env_float('OUTBOX_BASE_DELAY', 60.0)
+        self.max_delay = max_delay if max_delay is not None else env_float('OUTBOX_MAX_DELAY', 6 * 3600.0)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS outbox (
+                key TEXT PRIMARY KEY,
+                tip TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL,
+                last_error TEXT,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def backoff(self, attempts: int) -> float:
+        """Espera até a próxima tentativa (exponencial com jitter de ±50%)"""
+        delay = min(self.max_delay, self.base_delay * (2 ** max(attempts - 1, 0)))
+        return delay * random.uniform(0.5, 1.5)
+
+    def record_failure(self, key: str, tip: Dict, error: str, retryable: bool = True):
+        """Registra uma falha de envio e agenda a próxima tentativa"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT attempts FROM outbox WHERE key = ?", (key,)).fetchone()
+            attempts = (row[0] if row else 0) + 1
+            status = 'pending' if retryable and attempts < self.max_attempts else 'dead'
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO outbox (key, tip, status, attempts, next_attempt_at, last_error, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (key, json.dumps(tip, ensure_ascii=False), status, attempts,
+                 now + self.backoff(attempts), error, now)
+            )
+            self._conn.commit()
+
+        if status == 'dead':
+            logger.error("Tip descartada após %d tentativas: %s", attempts, error,
+                         extra={'tip_id': tip.get('id'), 'attempts': attempts})
+        else:
+            logger.warning("Tip guardada no outbox (tentativa %d/%d)", attempts, self.max_attempts,
+                           extra={'tip_id': tip.get('id'), 'attempts': attempts})
+
+    def mark_sent(self, key: str):
+        """Remove do outbox uma tip enviada com sucesso"""
+        with self._lock:
+            self._conn.execute("DELETE FROM outbox WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def due(self, limit: int = 100) -> List[Tuple[str, Dict]]:
+        """Tips pendentes cuja próxima tentativa já venceu"""
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT key, tip FROM outbox
+                WHERE status = 'pending' AND next_attempt_at <= ?
+                ORDER BY next_attempt_at LIMIT ?
+                """,
+                (time.time(), limit)
+            ).fetchall()
+        return [(key, json.loads(tip)) for key, tip in rows]
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM outbox WHERE status = 'pending'").fetchone()[0]
+
+    def replay(self, submitter, time_budget: Optional[float] = None, limit: int = 100) -> Tuple[int, int]:
+        """Reenvia as tips vencidas dentro do orçamento de tempo; retorna (enviadas, falhas)"""
+        time_budget = time_budget if time_budget is not None else env_float('OUTBOX_REPLAY_BUDGET', 30.0)
+        deadline = time.monotonic() + time_budget
+        due = self.due(limit)
+        if not due:
+            return 0, 0
+
+        logger.info("Reenviando %d tips pendentes do outbox", len(due))
+        sent = failed = 0
+        for key, tip in due:
+            if time.monotonic() >= deadline:
+                logger.info("Orçamento de tempo do outbox esgotado; o restante fica para a próxima execução")
+                break
+            if submitter.already_sent(tip):
+                # Já entregue por outra execução com o mesmo conteúdo
+                self.mark_sent(key)
+                continue
+            if submitter.seen_in_run(tip):
+                # Substituída pelo conteúdo desta execução (enviado por ela se mudou)
+                logger.info("Tip do outbox substituída pela versão desta execução", extra={'tip_id': tip.get('id')})
+                self.mark_sent(key)
+                continue
+            RETRIES.inc(kind='outbox_replay')
+            if submitter.send(tip).ok:
+                sent += 1
+            else:
+                failed += 1
+
+        logger.info("Outbox: %d reenviadas, %d falharam novamente", sent, failed,
+                    extra={'sent': sent, 'failed': failed})
+        return sent, failed
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
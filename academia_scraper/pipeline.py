@@ -0,0 +1,181 @@
+"""
+Pipeline em streaming: descoberta -> detalhes -> envio
+
+As etapas rodam em threads ligadas por filas limitadas, então cada tip é
+enviada assim que seus detalhes ficam prontos e a extração de uma partida
+se sobrepõe ao envio da anterior. Se a execução cair no meio, as tips já
+enviadas não se perdem e o checkpoint permite retomar do ponto da queda.
+"""
+
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from .checkpoint import ENRICHED, SENT
+from .config import env_int
+from .metrics import MATCHES_DISCOVERED, QUEUE_DEPTH
+from .submission import SubmissionResult
+
+
+logger = logging.getLogger(__name__)
+
+
+# Marca de fim de fluxo entre as etapas
+_DONE = object()
+
+
+class StreamingPipeline:
+    """Liga iter_main_page_rows, enrich_match e o TipSubmitter do scraper.
+
+    Sem pool de sessões, os detalhes são buscados na própria thread de
+    descoberta (o driver principal não pode ser usado por duas threads);
+    com pool, cada sessão vira um worker da etapa de detalhes.
+    """
+
+    def __init__(self, scraper, queue_size: Optional[int] = None):
+        self.scraper = scraper
+        self.submitter = scraper.submitter
+        self.queue_size = queue_size if queue_size is not None else env_int('PIPELINE_QUEUE_SIZE', 16)
+        self.detail_queue = queue.Queue(maxsize=self.queue_size)
+        self.submit_queue = queue.Queue(maxsize=self.queue_size)
+        self.checkpoint = scraper.checkpoint
+        self.discovered = 0
+        self.resumed = 0
+
+    def run(self) -> List[SubmissionResult]:
+        """Executa o pipeline e retorna o status de cada tip enviada"""
+        pool = self.scraper.driver_pool
+        enrich_workers = pool.active_sessions if pool else 0
+
+        threads = [threading.Thread(target=self._discover, args=(enrich_workers,),
+                                    name="pipeline-discover", daemon=True)]
+        for i in range(enrich_workers):
+            threads.append(threading.Thread(target=self._enrich, name=f"pipeline-enrich-{i+1}",
+                                            daemon=True))
+        for thread in threads:
+            thread.start()
+
+        results = self._submit(max(enrich_workers, 1))
+
+        for thread in threads:
+            thread.join()
+        return results
+
+    def _discover(self, enrich_workers: int):
+        """Etapa 1: gera as partidas da página principal"""
+        # Sem workers de detalhes, a descoberta já entrega a partida completa
+        target = self.detail_queue if enrich_workers else self.submit_queue
+        checkpoint = self.checkpoint
+        try:
+            # Execução retomada com a descoberta completa: não recarrega a página
+            stored = checkpoint.discovered_matches() if checkpoint else None
+            if stored is not None:
+                logger.info("Reaproveitando %d partidas descobertas antes da interrupção", len(stored))
+            for match in (stored if stored is not None else self.scraper.iter_main_page_rows()):
+                self.discovered += 1
+                MATCHES_DISCOVERED.inc()
+                if checkpoint:
+                    state, match = checkpoint.record(match)
+                    if state == SENT:
+                        self.resumed += 1
+                        continue
+                    if state == ENRICHED:
+                        # Detalhes já extraídos antes da queda: direto para o envio
+                        self.resumed += 1
+                        self.submit_queue.put(match)
+                        continue
+                if not enrich_workers:
+                    self.scraper.enrich_match(match)
+                    if checkpoint:
+                        checkpoint.mark_enriched(match)
+                target.put(match)
+                QUEUE_DEPTH.set(target.qsize(), queue='detail' if enrich_workers else 'submit')
+
+            if checkpoint and stored is None and not self.scraper.discovery_failed:
+                checkpoint.mark_discovery_done()
+        except Exception as e:
+            logger.exception("Erro na descoberta de partidas: %s", e)
+        finally:
+            for _ in range(max(enrich_workers, 1)):
+                target.put(_DONE)
+
+    def _enrich(self):
+        """Etapa 2: busca os detalhes com uma sessão do pool
+
+        A sessão é emprestada a cada partida para que o pool possa
+        reciclá-la entre duas páginas (watchdog de memória).
+        """
+        while True:
+            match = self.detail_queue.get()
+            QUEUE_DEPTH.set(self.detail_queue.qsize(), queue='detail')
+            if match is _DONE:
+                self.submit_queue.put(_DONE)
+                return
+            try:
+                with self.scraper.driver_pool.session() as driver:
+                    self.scraper.enrich_match(match, driver=driver)
+                if self.checkpoint:
+                    self.checkpoint.mark_enriched(match)
+            except Exception as e:
+                logger.warning("Erro ao enriquecer partida: %s", e, extra={'match_id': match.get('id')})
+            self.submit_queue.put(match)
+            QUEUE_DEPTH.set(self.submit_queue.qsize(), queue='submit')
+
+    def _checkpoint_results(self, future):
+        """Marca no checkpoint as tips entregues (na API ou no outbox)"""
+        if not self.checkpoint or future.exception():
+            return
+        result = future.result()
+        for item in (result if isinstance(result, list) else [result]):
+            if item.ok or self.submitter.outbox:
+                self.checkpoint.mark_sent(item.tip_id)
+
+    def _submit(self, producers: int) -> List[SubmissionResult]:
+        """Etapa 3: envia as tips conforme chegam (máx. max_in_flight simultâneas)"""
+        results = []
+        futures = []
+        batch = []
+        in_flight = threading.Semaphore(max(self.submitter.max_in_flight, 1))
+
+        with ThreadPoolExecutor(max_workers=max(self.submitter.max_in_flight, 1)) as executor:
+            def dispatch(func, payload):
+                in_flight.acquire()
+                future = executor.submit(func, payload)
+                future.add_done_callback(self._checkpoint_results)
+                future.add_done_callback(lambda _: in_flight.release())
+                futures.append(future)
+
+            finished = 0
+            sent = 0
+            while finished < producers:
+                match = self.submit_queue.get()
+                QUEUE_DEPTH.set(self.submit_queue.qsize(), queue='submit')
+                if match is _DONE:
+                    finished += 1
+                    continue
+
+                if not self.submitter.should_send(match):
+                    logger.info("Tip já enviada sem alterações - ignorando", extra={'tip_id': match['id']})
+                    if self.checkpoint:
+                        self.checkpoint.mark_sent(match['id'])
+                    continue
+
+                sent += 1
+                self.scraper.print_match(match, sent, max(self.discovered, sent))
+                if self.submitter.bulk:
+                    batch.append(match)
+                    if len(batch) >= self.submitter.batch_size:
+                        dispatch(self.submitter.submit_batch, batch)
+                        batch = []
+                else:
+                    dispatch(self.submitter.submit, match)
+
+            if batch:
+                dispatch(self.submitter.submit_batch, batch)
+
+        for future in futures:
+            result = future.result()
+            results.extend(result if isinstance(result, list) else [result])
+        return results
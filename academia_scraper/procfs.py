@@ -0,0 +1,83 @@
+"""
+Leitura de memória de processos via /proc (Linux)
+
+Fora do Linux, ou se o processo sumir no meio da leitura, as funções
+retornam valores vazios em vez de levantar exceção.
+"""
+
+import os
+from typing import Dict, List
+
+
+PROC_DIR = '/proc'
+
+
+def read_rss_bytes(pid: int) -> int:
+    """RSS atual de um processo em bytes (0 se indisponível)"""
+    try:
+        with open(os.path.join(PROC_DIR, str(pid), 'status'), encoding='ascii', errors='ignore') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0
+
+
+def parent_map() -> Dict[int, int]:
+    """{pid: ppid} de todos os processos visíveis"""
+    parents = {}
+    try:
+        entries = os.listdir(PROC_DIR)
+    except OSError:
+        return parents
+
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(os.path.join(PROC_DIR, entry, 'stat'), encoding='ascii', errors='ignore') as f:
+                stat = f.read()
+            # O nome do processo vem entre parênteses e pode conter espaços
+            parents[int(entry)] = int(stat.rsplit(')', 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+    return parents
+
+
+def descendants(pid: int) -> List[int]:
+    """PIDs de todos os descendentes de um processo (filhos, netos...)"""
+    children: Dict[int, List[int]] = {}
+    for child, parent in parent_map().items():
+        children.setdefault(parent, []).append(child)
+
+    found = []
+    stack = list(children.get(pid, []))
+    while stack:
+        current = stack.pop()
+        found.append(current)
+        stack.extend(children.get(current, []))
+    return found
+
+
+def read_state(pid: int) -> str:
+    """Estado do processo no /proc/<pid>/stat ('R', 'S', 'Z'...; vazio se indisponível)"""
+    try:
+        with open(os.path.join(PROC_DIR, str(pid), 'stat'), encoding='ascii', errors='ignore') as f:
+            return f.read().rsplit(')', 1)[1].split()[0]
+    except (OSError, IndexError):
+        return ''
+
+
+def read_cmdline(pid: int) -> List[str]:
+    """Argumentos de linha de comando de um processo (vazio se indisponível)"""
+    try:
+        with open(os.path.join(PROC_DIR, str(pid), 'cmdline'), 'rb') as f:
+            return [arg.decode('utf-8', 'ignore') for arg in f.read().split(b'\0') if arg]
+    except OSError:
+        return []
+
+
+def descendants_rss_bytes(pid: int) -> int:
+    """Soma do RSS dos descendentes (chromedriver + processos do Chrome)"""
+    return sum(read_rss_bytes(child) for child in descendants(pid))
@@ -0,0 +1,280 @@
+"""
+Limite de requisições por host com paralelismo adaptativo (AIMD)
+
+Cada host (site e API de tips) tem um token bucket, que limita as
+requisições por segundo, e um limite de requisições simultâneas ajustado
+no estilo AIMD: sobe de um em um enquanto as respostas chegam rápidas e
+sem erro, e cai pela metade diante de 429, 5xx, timeouts (inclusive os do
+Selenium) ou latência acima do alvo. Um 429 com Retry-After também pausa
+o bucket.
+
+    with limiter_for(url).slot() as ticket:
+        response = session.get(url)
+        ticket.record(response.status_code)
+
+Os carregamentos do Selenium usam um limiter separado do mesmo host
+(limiter_for(url, BROWSER)), com alvo de latência próprio: uma página
+renderizada leva segundos e não deve reduzir o paralelismo do motor HTTP.
+
+O estado atual de cada host fica em snapshot() e nas métricas
+scraper_rate_limit_rps e scraper_concurrency_limit.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from .config import env_bool, env_float, env_int
+from .metrics import REGISTRY
+
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_RPS = REGISTRY.gauge(
+    'scraper_rate_limit_rps', 'Requisições por segundo permitidas por host', ('host',))
+CONCURRENCY_LIMIT = REGISTRY.gauge(
+    'scraper_concurrency_limit', 'Requisições simultâneas permitidas por host (AIMD)', ('host',))
+THROTTLE_EVENTS = REGISTRY.counter(
+    'scraper_throttle_events_total', 'Sinais de sobrecarga por host e motivo', ('host', 'reason'))
+
+# Intervalo mínimo entre duas reduções (uma rajada de erros conta uma vez)
+DECREASE_COOLDOWN = 2.0
+
+# Tipos de cliente com limiter próprio por host
+HTTP = 'http'
+BROWSER = 'browser'
+
+
+class TokenBucket:
+    """Até `rate` requisições por segundo, com rajadas de até `burst`"""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Reserva um token; retorna quantos segundos esperar antes de usá-lo"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def pause(self, seconds: float):
+        """Suspende o bucket (ex.: Retry-After de um 429)"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+class Ticket:
+    """Resultado de uma requisição, informado ao limiter ao sair do slot"""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.status: Optional[int] = None
+        self.throttled = False
+        self.retry_after: Optional[float] = None
+        self.recorded = False
+
+    def record(self, status: Optional[int] = None, throttled: bool = False,
+               retry_after: Optional[float] = None):
+        """status HTTP da resposta; throttled para timeouts e afins"""
+        self.status = status
+        self.throttled = throttled
+        self.retry_after = retry_after
+        self.recorded = True
+
+
+class HostLimiter:
+    """Token bucket e controle AIMD de paralelismo de um host"""
+
+    def __init__(self, host: str, rate: float, burst: float, initial: int, min_limit: int,
+                 max_limit: int, latency_target: float):
+        self.host = host
+        self.bucket = TokenBucket(rate, burst)
+        self.max_rate = rate
+        self.min_limit = max(min_limit, 1)
+        self.max_limit = max(max_limit, self.min_limit)
+        self.limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self.latency_target = latency_target
+        self.in_flight = 0
+        self.latency_ewma: Optional[float] = None
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+        self._publish()
+
+    def _publish(self):
+        RATE_LIMIT_RPS.set(round(self.bucket.rate, 3), host=self.host)
+        CONCURRENCY_LIMIT.set(int(self.limit), host=self.host)
+
+    def _try_enter(self) -> bool:
+        if self.in_flight < int(self.limit):
+            self.in_flight += 1
+            return True
+        return False
+
+    @contextmanager
+    def slot(self):
+        """Espera vaga no limite de simultâneas e um token do bucket"""
+        with self._cond:
+            while not self._try_enter():
+                self._cond.wait()
+        ticket = Ticket()
+        try:
+            wait = self.bucket.reserve()
+            if wait > 0:
+                time.sleep(wait)
+            ticket.started = time.monotonic()
+            yield ticket
+        except Exception:
+            if not ticket.recorded:
+                ticket.record(throttled=True)
+            raise
+        finally:
+            self._finish(ticket)
+
+    @asynccontextmanager
+    async def async_slot(self):
+        """Versão para asyncio (não bloqueia o loop enquanto espera)"""
+        delay = 0.005
+        while True:
+            with self._cond:
+                if self._try_enter():
+                    break
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.05)
+        ticket = Ticket()
+        try:
+            wait = self.bucket.reserve()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            ticket.started = time.monotonic()
+            yield ticket
+        except Exception:
+            if not ticket.recorded:
+                ticket.record(throttled=True)
+            raise
+        finally:
+            self._finish(ticket)
+
+    def _finish(self, ticket: Ticket):
+        latency = time.monotonic() - ticket.started
+        with self._cond:
+            self.in_flight -= 1
+            self._adjust(ticket, latency)
+            self._cond.notify_all()
+
+    def _adjust(self, ticket: Ticket, latency: float):
+        """AIMD: +1/limite por resposta boa, metade diante de sobrecarga"""
+        status = ticket.status
+        if status == 429:
+            reason = 'http_429'
+        elif status is not None and status >= 500:
+            reason = 'http_5xx'
+        elif ticket.throttled:
+            reason = 'timeout'
+        else:
+            reason = None
+
+        if reason is None:
+            self.latency_ewma = latency if self.latency_ewma is None \
+                else 0.8 * self.latency_ewma + 0.2 * latency
+            if self.latency_ewma > self.latency_target:
+                reason = 'latency'
+
+        if reason:
+            THROTTLE_EVENTS.inc(host=self.host, reason=reason)
+            if ticket.retry_after:
+                self.bucket.pause(ticket.retry_after)
+            now = time.monotonic()
+            if now - self._last_decrease >= DECREASE_COOLDOWN:
+                self._last_decrease = now
+                self.limit = max(float(self.min_limit), self.limit / 2)
+                if reason != 'latency':
+                    self.bucket.rate = max(self.max_rate / 16, self.bucket.rate / 2)
+                logger.info("Reduzindo ritmo de %s (%s): %d simultâneas, %.2f req/s", self.host, reason,
+                            int(self.limit), self.bucket.rate, extra={'host': self.host, 'reason': reason})
+        else:
+            # Cresce ~1 por "janela" de respostas, como o TCP
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / max(self.limit, 1.0))
+            self.bucket.rate = min(self.max_rate, self.bucket.rate * 1.05)
+        self._publish()
+
+    def snapshot(self) -> Dict:
+        with self._cond:
+            return {
+                'rps': round(self.bucket.rate, 3),
+                'concurrency': int(self.limit),
+                'in_flight': self.in_flight,
+                'latency_ewma_s': round(self.latency_ewma, 3) if self.latency_ewma is not None else None,
+            }
+
+
+class _UnlimitedSlot:
+    """Limiter desligado (RATE_LIMIT=false): só mede, não limita"""
+
+    @contextmanager
+    def slot(self):
+        yield Ticket()
+
+    @asynccontextmanager
+    async def async_slot(self):
+        yield Ticket()
+
+    def snapshot(self) -> Dict:
+        return {}
+
+
+_UNLIMITED = _UnlimitedSlot()
+_limiters: Dict[str, HostLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def limiter_for(url: str, kind: str = HTTP):
+    """Limiter do host da URL para o tipo de cliente (criado na primeira requisição)"""
+    if not env_bool('RATE_LIMIT', True):
+        return _UNLIMITED
+    host = urlparse(url).netloc or url
+    key = host if kind == HTTP else f'{host}/{kind}'
+    if kind == BROWSER:
+        latency_target = env_float('RATE_BROWSER_LATENCY_TARGET', 30.0)
+    else:
+        latency_target = env_float('RATE_LATENCY_TARGET', 5.0)
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = _limiters[key] = HostLimiter(
+                key,
+                rate=env_float('RATE_LIMIT_RPS', 10.0),
+                burst=env_float('RATE_LIMIT_BURST', 20.0),
+                initial=env_int('RATE_INITIAL_CONCURRENCY', 4),
+                min_limit=env_int('RATE_MIN_CONCURRENCY', 1),
+                max_limit=env_int('RATE_MAX_CONCURRENCY', 16),
+                latency_target=latency_target,
+            )
+        return limiter
+
+
+def retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Retry-After em segundos (ignora o formato de data HTTP)"""
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+def snapshot() -> Dict[str, Dict]:
+    """Limites atuais de cada host, para inspeção e logs"""
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {host: limiter.snapshot() for host, limiter in limiters.items()}
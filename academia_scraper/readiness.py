@@ -0,0 +1,120 @@
+"""
+Condições de prontidão das páginas (substituem os time.sleep fixos)
+
+Cada condição é avaliada com polling curto e tem seu próprio timeout; o
+resultado informa qual condição foi satisfeita e quanto tempo realmente
+se esperou, para que páginas prontas cedo não paguem a espera inteira.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+from selenium.common.exceptions import WebDriverException
+
+
+logger = logging.getLogger(__name__)
+
+# Timeouts padrão (segundos) por tipo de página
+LIVESCORES_TIMEOUT = 10
+PREVIEW_TIMEOUT = 10
+NETWORK_IDLE_MS = 500
+# Prazo próprio da rede ociosa: páginas com polling contínuo nunca ficam
+# ociosas e não devem pagar o timeout inteiro avaliando essa condição
+NETWORK_IDLE_TIMEOUT = 5
+POLL_INTERVAL = 0.1
+
+
+@dataclass
+class ReadinessResult:
+    condition: Optional[str]  # condição satisfeita (None em caso de timeout)
+    ready: bool
+    waited: float  # segundos efetivamente esperados
+
+
+def livescores_rows_present(driver) -> bool:
+    """Linhas da tabela de livescores já estão no DOM"""
+    return driver.execute_script(
+        "return document.querySelectorAll('.livescores tbody tr, .widget-double tbody tr').length > 0;"
+    )
+
+
+def preview_rendered(driver) -> bool:
+    """Bloco de análise (#_preview / div.preview_bet) renderizado com texto"""
+    return driver.execute_script(
+        "var el = document.querySelector('div.preview_bet') || document.querySelector('#_preview');"
+        "return !!el && el.innerText.trim().length > 0;"
+    )
+
+
+def network_idle(idle_ms: int = NETWORK_IDLE_MS) -> Callable:
+    """Documento carregado e sem novos recursos de rede por idle_ms"""
+    state = {'count': -1, 'since': time.monotonic()}
+
+    def condition(driver) -> bool:
+        ready_state, count = driver.execute_script(
+            "return [document.readyState, performance.getEntriesByType('resource').length];"
+        )
+        now = time.monotonic()
+        if ready_state != 'complete' or count != state['count']:
+            state['count'] = count
+            state['since'] = now
+            return False
+        return (now - state['since']) * 1000 >= idle_ms
+
+    return condition
+
+
+def wait_for_any(driver, conditions: Dict[str, Callable], timeout: float,
+                 label: str = "página", timeouts: Optional[Dict[str, float]] = None) -> ReadinessResult:
+    """Espera até que qualquer uma das condições seja satisfeita (ou timeout)
+
+    As condições são avaliadas na ordem do dicionário, cada uma até o seu
+    prazo (timeouts[nome], padrão timeout); passado o prazo ela deixa de ser
+    avaliada. A espera termina na primeira condição satisfeita ou quando
+    todos os prazos tiverem passado.
+    """
+    start = time.monotonic()
+    deadlines = {name: start + (timeouts or {}).get(name, timeout) for name in conditions}
+    satisfied = None
+
+    while satisfied is None:
+        now = time.monotonic()
+        pending = [name for name in conditions if now < deadlines[name]]
+        if not pending:
+            break
+        for name in pending:
+            try:
+                if conditions[name](driver):
+                    satisfied = name
+                    break
+            except WebDriverException:
+                continue
+        else:
+            time.sleep(POLL_INTERVAL)
+
+    waited = time.monotonic() - start
+    if satisfied:
+        logger.info("%s pronta (%s) em %.2fs", label, satisfied, waited,
+                    extra={'condition': satisfied, 'waited': round(waited, 3)})
+    else:
+        logger.warning("%s: nenhuma condição satisfeita após %.2fs", label, waited,
+                       extra={'waited': round(waited, 3)})
+    return ReadinessResult(condition=satisfied, ready=satisfied is not None, waited=waited)
+
+
+def wait_for_main_page(driver, timeout: float = LIVESCORES_TIMEOUT) -> ReadinessResult:
+    """Página principal: linhas da tabela presentes ou rede ociosa"""
+    return wait_for_any(driver, {
+        'livescores_rows': livescores_rows_present,
+        'network_idle': network_idle(),
+    }, timeout, label="Página principal", timeouts={'network_idle': min(timeout, NETWORK_IDLE_TIMEOUT)})
+
+
+def wait_for_detail_page(driver, timeout: float = PREVIEW_TIMEOUT) -> ReadinessResult:
+    """Página de detalhes: bloco de análise renderizado ou rede ociosa"""
+    return wait_for_any(driver, {
+        'preview': preview_rendered,
+        'network_idle': network_idle(),
+    }, timeout, label="Página de detalhes", timeouts={'network_idle': min(timeout, NETWORK_IDLE_TIMEOUT)})
@@ -0,0 +1,142 @@
+"""
+Revalidação condicional das páginas (ETag / Last-Modified / hash do fragmento)
+
+Para cada URL guarda os validadores HTTP, o hash do fragmento relevante do
+DOM (tbody dos livescores, bloco #_preview) e o resultado já extraído. Se o
+servidor responder 304 ou o fragmento não mudar, o resultado anterior é
+reaproveitado sem refazer o parse. Nas listagens também é guardado o link
+da página seguinte, que um 304 continua enfileirando.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from .config import get_data_dir
+from .rate_limit import limiter_for, retry_after_seconds
+
+
+logger = logging.getLogger(__name__)
+
+
+def fragment_hash(fragment: str) -> str:
+    """Hash do fragmento HTML com espaços normalizados"""
+    normalized = ' '.join(fragment.split())
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+class PageRevalidator:
+    """Guarda validadores e resultados por URL em SQLite"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(get_data_dir(), 'revalidation.sqlite3')
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                fragment_hash TEXT,
+                payload TEXT,
+                checked_at REAL NOT NULL,
+                next_url TEXT
+            )
+            """
+        )
+        # Bancos criados antes da coluna next_url
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(pages)")}
+        if 'next_url' not in columns:
+            self._conn.execute("ALTER TABLE pages ADD COLUMN next_url TEXT")
+        self._conn.commit()
+
+    def _row(self, url: str):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT etag, last_modified, fragment_hash, payload FROM pages WHERE url = ?",
+                (url,)
+            ).fetchone()
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Cabeçalhos If-None-Match / If-Modified-Since para a URL"""
+        row = self._row(url)
+        headers = {}
+        if row and row[3] is not None:
+            if row[0]:
+                headers['If-None-Match'] = row[0]
+            if row[1]:
+                headers['If-Modified-Since'] = row[1]
+        return headers
+
+    def payload(self, url: str):
+        """Último resultado extraído para a URL (None se não houver)"""
+        row = self._row(url)
+        if row and row[3] is not None:
+            return json.loads(row[3])
+        return None
+
+    def next_url(self, url: str) -> Optional[str]:
+        """Página seguinte da listagem guardada junto com o resultado (None se não houver)"""
+        with self._lock:
+            row = self._conn.execute("SELECT next_url FROM pages WHERE url = ?", (url,)).fetchone()
+        return row[0] if row else None
+
+    def unchanged_payload(self, url: str, new_hash: str):
+        """Resultado anterior se o fragmento não mudou (None caso contrário)"""
+        row = self._row(url)
+        if row and row[2] == new_hash and row[3] is not None:
+            return json.loads(row[3])
+        return None
+
+    def conditional_check(self, session, url: str, timeout: int = 10) -> Tuple[bool, Dict[str, str]]:
+        """Faz um GET condicional; retorna (não modificado, validadores novos)
+
+        Os validadores só são gravados junto com o resultado (store), para
+        que um 304 nunca aponte para um resultado de outra versão da página.
+        """
+        headers = self.conditional_headers(url)
+        try:
+            # Mesmo limite por host das demais requisições: 429/503 aqui também reduzem o ritmo
+            with limiter_for(url).slot() as ticket:
+                response = session.get(url, headers=headers, timeout=timeout, stream=True)
+                ticket.record(response.status_code,
+                              retry_after=retry_after_seconds(response.headers.get('Retry-After')))
+                response.close()
+        except Exception as e:
+            logger.warning("Revalidação falhou: %s", e, extra={'url': url})
+            return False, {}
+
+        if response.status_code == 304:
+            logger.info("Página não modificada (304)", extra={'url': url})
+            return True, {}
+
+        return False, {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+        }
+
+    def store(self, url: str, new_hash: Optional[str], payload,
+              etag: Optional[str] = None, last_modified: Optional[str] = None,
+              next_url: Optional[str] = None):
+        """Salva o hash do fragmento, o resultado, os validadores e a página seguinte da URL"""
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO pages
+                    (url, etag, last_modified, fragment_hash, payload, checked_at, next_url)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (url, etag, last_modified, new_hash,
+                 json.dumps(payload, ensure_ascii=False), time.time(), next_url)
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -2,161 +2,374 @@
 Main scraper class for Academia das Apostas Brasil
 """
 
-import requests
-import time
+import logging
 import os
-import uuid
-import re
-import random
-from datetime import datetime
-from typing import List, Dict, Optional
-from dataclasses import asdict
-from selenium import webdriver
+import threading
+import time
+import sys
+from typing import Iterator, List, Dict, Optional
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
 
+from .browser import apply_page_profile, create_chrome_driver, driver_alive, quit_driver
+from .cache import DetailCache
+from .checkpoint import RunCheckpoint, crawl_key
+from .config import env_int, env_bool
+from .dedup import DedupIndex
+from .diagnostics import DETAIL, LISTING_ERROR, MAIN_TABLE, DiagnosticsRing
+from .driver_pool import DriverPool
+from .extraction import (
+    SeleniumPage,
+    snapshot_page,
+    extract_details,
+    extract_odds,
+    extract_description,
+    extract_prediction,
+    extract_league,
+    check_premium
+)
+from .http_engine import HttpDetailFetcher, build_session
+from .frontier import CrawlFrontier, listing_seeds
+from .listing import (
+    MAIN_PAGE_URL,
+    NEXT_PAGE_SELECTORS,
+    TABLE_GENERIC,
+    TABLE_SELECTORS,
+    build_match_data,
+    is_detail_link,
+    parse_table_html,
+    redate_match
+)
+from .metrics import (
+    DETAIL_FETCHES,
+    LAST_RUN,
+    LAST_RUN_SUCCESS,
+    RETRIES,
+    export_metrics,
+    observe_cascade,
+    sample_chrome_rss,
+    start_metrics_server,
+    timed
+)
 from .models import Odds, Tip
+from .outbox import TipOutbox
+from .pipeline import StreamingPipeline
+from .rate_limit import BROWSER, limiter_for, snapshot as rate_limit_snapshot
+from .readiness import wait_for_main_page, wait_for_detail_page
+from .revalidation import PageRevalidator, fragment_hash
+from .selector_stats import ordered, record_hit, save_selector_stats
+from .submission import TipSubmitter
 from .text_utils import (
-    is_match_finished,
-    determine_category,
-    extract_teams_from_text,
-    extract_time_from_text,
-    extract_league_from_text
+    RowClassification,
+    classify_row,
+    is_match_finished
 )
+from .watchdog import SessionWatchdog, driver_pid, reap_orphans, recycle_session
+
+
+logger = logging.getLogger(__name__)
+
+# Fragmento do DOM usado para detectar mudanças nas páginas de detalhes
+PREVIEW_HTML_SCRIPT = "var el = document.querySelector('#_preview'); return el ? el.outerHTML : null;"
 
 
 class AcademiaScraperImproved:
-    def __init__(self, api_base_url: str = "http://localhost:8000"):
+    def __init__(self, api_base_url: str = "http://localhost:8000",
+                 pool_size: Optional[int] = None, max_matches: Optional[int] = None,
+                 detail_engine: Optional[str] = None, main_page_url: Optional[str] = None):
         self.api_base_url = api_base_url
+        # Página de listagem (SCRAPER_BASE_URL permite apontar para um site de testes)
+        self.main_page_url = main_page_url or os.getenv('SCRAPER_BASE_URL', MAIN_PAGE_URL)
+        # Número de sessões do Chrome para páginas de detalhes (1 = serial)
+        self.pool_size = pool_size if pool_size is not None else env_int('SCRAPER_POOL_SIZE', 1)
+        # Limite de partidas válidas por execução
+        self.max_matches = max_matches if max_matches is not None else env_int('MAX_MATCHES', 5)
+        # Envio das tips (Session reutilizada, concorrente ou em lote) com
+        # outbox persistente para reenviar falhas (OUTBOX=false desativa)
+        self.outbox = TipOutbox() if env_bool('OUTBOX', True) else None
+        # Índice de tips já enviadas (DEDUP=false desativa)
+        self.dedup = DedupIndex() if env_bool('DEDUP', True) else None
+        self.submitter = TipSubmitter(outbox=self.outbox, dedup=self.dedup)
+        # Backend dos detalhes: 'http' (requests + lxml, Selenium como fallback) ou 'selenium'
+        detail_engine = detail_engine or os.getenv('DETAIL_ENGINE', 'http')
+        self.http_session = build_session()
+        # Revalidação condicional das páginas (PAGE_REVALIDATION=false desativa)
+        self.revalidator = PageRevalidator() if env_bool('PAGE_REVALIDATION', True) else None
+        self.http_fetcher = HttpDetailFetcher(self.http_session, revalidator=self.revalidator) \
+            if detail_engine == 'http' else None
+        # Cache local dos detalhes por URL (DETAIL_CACHE=false desativa)
+        self.detail_cache = DetailCache() if env_bool('DETAIL_CACHE', True) else None
+        # Checkpoint para retomar uma execução interrompida (CHECKPOINT=false desativa)
+        self.checkpoint = RunCheckpoint() if env_bool('CHECKPOINT', True) else None
+        # Linhas da página principal parseadas de um único outerHTML (BULK_ROW_PARSING=false
+        # volta para as chamadas por linha e por célula ao chromedriver)
+        self.bulk_row_parsing = env_bool('BULK_ROW_PARSING', True)
+        # Capturas de HTML/screenshot só das páginas que falharam (DIAGNOSTICS=false desativa)
+        self.diagnostics = DiagnosticsRing() if env_bool('DIAGNOSTICS', True) else None
+        self.discovery_failed = False
+        # Dia das partidas da listagem em leitura (None = hoje, como na página principal)
+        self.listing_date = None
+        # Reciclagem das sessões por páginas carregadas ou memória (SESSION_MAX_*)
+        self.watchdog = SessionWatchdog()
         self.driver = None
+        self.driver_pool = None
         self.setup_driver()
 
     def setup_driver(self):
         """Configura o driver do Selenium com webdriver-manager"""
-        print("🔧 Configurando ChromeDriver...")
-
-        chrome_options = Options()
-        # Executa sem interface gráfica
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1920,1080")
-        chrome_options.add_argument(
-            "--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+        logger.info("Configurando ChromeDriver")
+        # Chromes de uma execução que caiu ainda seguram memória e perfis
+        reap_orphans(keep=self.session_pids())
 
         try:
-            # Verifica se está rodando no Docker (variáveis de ambiente)
-            chrome_bin = os.getenv('CHROME_BIN')
-            chromedriver_path = os.getenv('CHROMEDRIVER_PATH')
-            
-            if chrome_bin and chromedriver_path:
-                # Modo Docker: usa ChromeDriver do sistema
-                print("🐳 Detectado ambiente Docker")
-                chrome_options.binary_location = chrome_bin
-                service = Service(chromedriver_path)
-                self.driver = webdriver.Chrome(
-                    service=service, options=chrome_options)
-            else:
-                # Modo local: usa webdriver-manager
-                print("💻 Modo local: usando webdriver-manager")
-                service = Service(ChromeDriverManager().install())
-                self.driver = webdriver.Chrome(
-                    service=service, options=chrome_options)
-            
-            self.driver.set_page_load_timeout(30)
-            print("✅ ChromeDriver configurado com sucesso!")
+            with timed('setup_driver'):
+                self.driver = create_chrome_driver()
+            logger.info("ChromeDriver configurado com sucesso")
         except Exception as e:
-            print(f"❌ Erro ao configurar o driver: {e}")
-            print("Certifique-se de que o Google Chrome está instalado")
+            logger.error("Erro ao configurar o driver: %s (o Google Chrome está instalado?)", e)
             raise
 
+        # Sessões extras para buscar detalhes em paralelo (opcional)
+        if self.pool_size > 1:
+            try:
+                with timed('setup_pool'):
+                    self.driver_pool = DriverPool(self.pool_size, watchdog=self.watchdog).start()
+            except Exception as e:
+                logger.warning("Pool de sessões indisponível, seguindo em modo serial: %s", e)
+                self.driver_pool = None
+
+    def session_pids(self) -> List[int]:
+        """PIDs dos chromedrivers das sessões abertas (não são órfãos)"""
+        drivers = [self.driver] + (self.driver_pool.drivers if self.driver_pool else [])
+        return [pid for pid in map(driver_pid, filter(None, drivers)) if pid]
+
+    def ensure_browser(self) -> bool:
+        """Recria o driver principal e as sessões do pool que tiverem morrido
+
+        Usado pelo modo daemon entre execuções; retorna True se algo foi reiniciado.
+        """
+        restarted = False
+        reap_orphans(keep=self.session_pids())
+        if self.driver is None or not driver_alive(self.driver):
+            logger.warning("Chrome não responde, reiniciando o driver principal")
+            if self.driver:
+                quit_driver(self.driver)
+            with timed('setup_driver'):
+                self.driver = create_chrome_driver()
+            restarted = True
+
+        if self.driver_pool:
+            restarted = self.driver_pool.heal() > 0 or restarted
+            if not self.driver_pool.active_sessions:
+                self.driver_pool = None
+        elif self.pool_size > 1:
+            # O pool pode ter falhado ao subir na primeira vez
+            try:
+                with timed('setup_pool'):
+                    self.driver_pool = DriverPool(self.pool_size, watchdog=self.watchdog).start()
+                restarted = True
+            except Exception as e:
+                logger.warning("Pool de sessões indisponível, seguindo em modo serial: %s", e)
+        return restarted
+
+    def recycle_if_needed(self) -> bool:
+        """Troca o driver principal se ele passou dos limites do watchdog
+
+        Só é chamado entre páginas: as listagens são lidas por inteiro
+        (iter_main_page_rows) antes do enriquecimento, então nenhum
+        WebElement da sessão antiga continua em uso.
+        """
+        reason = self.watchdog.recycle_reason(self.driver)
+        if not reason:
+            return False
+        replacement = recycle_session(self.driver, create_chrome_driver, reason)
+        recycled = replacement is not self.driver
+        self.driver = replacement
+        return recycled
+
     def is_match_finished(self, text: str) -> bool:
         """Verifica se a partida já terminou baseado no texto"""
         return is_match_finished(text)
 
     def get_main_page_data(self) -> List[Dict]:
-        """Extrai dados da página principal"""
-        try:
-            print("🌐 Acessando a página principal...")
-            self.driver.get("https://www.academiadasapostasbrasil.com/")
-
-            # Aguarda a página carregar
-            WebDriverWait(self.driver, 20).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
+        """Extrai dados da página principal (com detalhes)"""
+        match_data = list(self.iter_main_page_rows())
+        return self.enrich_matches(match_data)
+
+    def iter_main_page_rows(self) -> Iterator[Dict]:
+        """Gera as partidas válidas das listagens da execução, uma a uma (sem detalhes)
+
+        A fronteira começa pelas listagens de LISTING_URLS (padrão: a página
+        principal), segue a paginação e para em FRONTIER_MAX_PAGES páginas ou
+        max_matches partidas.
+        """
+        self.discovery_failed = False
+        known = self.detail_cache.contains if self.detail_cache else None
+        frontier = CrawlFrontier(listing_seeds(self.main_page_url), max_matches=self.max_matches, known=known)
+        while True:
+            url = frontier.next_listing()
+            if url is None:
+                break
+            rows = list(self.iter_listing_rows(url, frontier))
+            yield from frontier.accept(rows)
+        logger.info("Fronteira: %d listagens visitadas, %d partidas, %d repetidas ignoradas",
+                    frontier.pages_visited, frontier.accepted, frontier.duplicates, extra=frontier.summary())
+
+    def find_next_page(self) -> Optional[str]:
+        """Link para a próxima página da listagem aberta no driver principal"""
+        for selector in NEXT_PAGE_SELECTORS:
+            for link in self.driver.find_elements(By.CSS_SELECTOR, selector):
+                href = link.get_attribute('href')
+                if href and not href.startswith('javascript:'):
+                    return href
+        return None
 
-            # Aguarda um pouco mais para o JavaScript carregar
-            time.sleep(5)
+    def iter_listing_rows(self, url: str, frontier: Optional[CrawlFrontier] = None) -> Iterator[Dict]:
+        """Gera as partidas válidas de uma listagem (sem detalhes)
 
-            # Salva screenshot para debug (opcional)
-            try:
-                self.driver.save_screenshot("debug_page.png")
-                print("📸 Screenshot salvo como debug_page.png")
-            except:
-                pass
-
-            # Procura pela tabela usando diferentes seletores
-            table_selectors = [
-                ".widget-double-container-left.mb-content .widget-double.livescores.large .tabs_framed.small_tabs .fh_main_tab tbody",
-                ".livescores tbody",
-                ".widget-double tbody",
-                ".mb-content tbody",
-                "tbody"
-            ]
+        Com uma fronteira, a próxima página da listagem é enfileirada nela.
+        """
+        validators = {}
+        # Dia das partidas desta listagem (create_basic_match_data e o parse em lote)
+        self.listing_date = frontier.listing_date(url) if frontier else None
+        # Parse local é barato: lê a tabela inteira e deixa a fronteira escolher
+        limit = sys.maxsize if self.bulk_row_parsing else (frontier.remaining if frontier else self.max_matches)
+        try:
+            # Pergunta ao servidor se a página mudou antes de renderizá-la
+            if self.revalidator:
+                not_modified, validators = self.revalidator.conditional_check(self.http_session, url)
+                stored_rows = self.revalidator.payload(url) if not_modified else None
+                if stored_rows:
+                    logger.info("Página não modificada, reaproveitando %d partidas da última execução", len(stored_rows))
+                    # As páginas seguintes podem ter mudado mesmo com esta igual
+                    if frontier and env_bool('FOLLOW_PAGINATION', True):
+                        frontier.add_next_page(self.revalidator.next_url(url), url)
+                    for match_info in stored_rows:
+                        yield redate_match(match_info, self.listing_date)
+                    return
+
+            self.recycle_if_needed()
+            logger.info("Acessando listagem", extra={'url': url})
+            with timed('main_page_load'):
+                apply_page_profile(self.driver, 'main')
+                self.driver.get(url)
+                self.watchdog.note_page(self.driver)
+
+                # Aguarda a página carregar
+                WebDriverWait(self.driver, 20).until(
+                    EC.presence_of_element_located((By.TAG_NAME, "body"))
+                )
+
+                # Aguarda o JavaScript montar a tabela (ou a rede ficar ociosa)
+                wait_for_main_page(self.driver)
+            sample_chrome_rss()
+
+            # Guardada com o resultado para que um 304 continue a paginação
+            next_url = self.find_next_page() if frontier or self.revalidator else None
+            if frontier and env_bool('FOLLOW_PAGINATION', True):
+                frontier.add_next_page(next_url, url)
 
             table = None
-            for selector in table_selectors:
+            winner = None
+            candidates = ordered('main_table', TABLE_SELECTORS)
+            for selector in candidates:
                 try:
                     table = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    print(f"✅ Tabela encontrada com seletor: {selector}")
+                    logger.debug("Tabela encontrada com seletor: %s", selector)
+                    winner = selector
                     break
                 except NoSuchElementException:
                     continue
+            observe_cascade('main_table', TABLE_SELECTORS.index(winner) if winner else None)
+            record_hit('main_table', winner, candidates, TABLE_GENERIC)
 
             if not table:
-                print(
-                    "⚠️ Tabela específica não encontrada. Tentando método alternativo...")
-                return self.get_data_alternative_method()
+                logger.warning("Tabela específica não encontrada. Tentando método alternativo")
+                if self.diagnostics:
+                    self.diagnostics.capture_driver(self.driver, url, MAIN_TABLE, fallback='alternative',
+                                                    selectors=TABLE_SELECTORS)
+                yield from self.iter_alternative_rows()
+                return
+
+            # HTML da tabela inteira em uma única chamada ao chromedriver
+            table_html = ''
+            if self.revalidator or self.bulk_row_parsing:
+                table_html = table.get_attribute('outerHTML') or ''
+
+            # Tabela idêntica à da última execução: reaproveita as partidas
+            table_hash = None
+            if self.revalidator:
+                table_hash = fragment_hash(table_html)
+                stored_rows = self.revalidator.unchanged_payload(url, table_hash)
+                if stored_rows:
+                    logger.info("Tabela inalterada, reaproveitando %d partidas", len(stored_rows))
+                    for match_info in stored_rows:
+                        yield redate_match(match_info, self.listing_date)
+                    return
+
+            if self.bulk_row_parsing and table_html:
+                with timed('main_page_parse'):
+                    found = parse_table_html(table_html, limit, self.driver.current_url, self.listing_date)
+                logger.info("Tabela processada localmente: %d partidas válidas", len(found))
+                if self.revalidator and found:
+                    self.revalidator.store(url, table_hash, found, next_url=next_url, **validators)
+                # Cópias: o enriquecimento altera os dicionários entregues
+                for match_info in found:
+                    yield dict(match_info)
+                return
 
             # Busca todas as linhas disponíveis
             all_rows = table.find_elements(By.TAG_NAME, "tr")
-            print(f"📊 Encontradas {len(all_rows)} linhas na tabela")
+            logger.info("Encontradas %d linhas na tabela", len(all_rows))
+
+            # Processa linhas até conseguir o limite de partidas válidas (não terminadas)
+            found = []
+            max_matches = limit
 
-            # Processa linhas até conseguir 5 partidas válidas (não terminadas)
-            match_data = []
-            max_matches = 5
-            
             for i, row in enumerate(all_rows):
-                # Para quando já tiver 5 partidas válidas
-                if len(match_data) >= max_matches:
+                # Para quando já tiver max_matches partidas válidas
+                if len(found) >= max_matches:
                     break
                     
                 try:
-                    print(f"🔄 Processando linha {i+1}...")
-                    match_info = self.extract_row_data(row, i+1)
-                    if match_info:
-                        match_data.append(match_info)
-                        print(f"   ✅ Partida válida adicionada ({len(match_data)}/{max_matches})")
+                    logger.debug("Processando linha %d", i + 1)
+                    match_info = self.extract_row_data(row, i+1, fetch_details=False)
                 except Exception as e:
-                    print(f"❌ Erro ao processar linha {i+1}: {e}")
+                    logger.warning("Erro ao processar linha %d: %s", i + 1, e)
                     continue
 
-            return match_data
+                if match_info:
+                    # Guarda uma cópia dos dados básicos antes do enriquecimento
+                    found.append(dict(match_info))
+                    logger.debug("Partida válida adicionada (%d/%d)", len(found), max_matches,
+                                 extra={'match_id': match_info['id']})
+                    yield match_info
+
+            # Guarda a tabela inteira (parse local do mesmo HTML), não só as linhas
+            # lidas até o limite desta execução: uma execução com limite maior
+            # reaproveita todas as partidas
+            if self.revalidator and found and table_html:
+                self.revalidator.store(url, table_hash,
+                                       parse_table_html(table_html, sys.maxsize, self.driver.current_url,
+                                                        self.listing_date),
+                                       next_url=next_url, **validators)
 
         except Exception as e:
-            print(f"❌ Erro ao acessar página principal: {e}")
-            return []
+            self.discovery_failed = True
+            logger.exception("Erro ao acessar listagem: %s", e, extra={'url': url})
+            if self.diagnostics:
+                self.diagnostics.capture_driver(self.driver, url, LISTING_ERROR, error=str(e))
 
     def get_data_alternative_method(self) -> List[Dict]:
         """Método alternativo para extrair dados quando a tabela específica não é encontrada"""
+        return self.enrich_matches(list(self.iter_alternative_rows()))
+
+    def iter_alternative_rows(self) -> Iterator[Dict]:
+        """Gera partidas a partir de elementos alternativos da página (sem detalhes)"""
         try:
-            print("🔍 Procurando elementos de partida alternativos...")
+            logger.info("Procurando elementos de partida alternativos")
 
             # Procura por diferentes tipos de elementos que podem conter dados de partidas
             selectors_to_try = [
@@ -177,55 +390,55 @@ class AcademiaScraperImproved:
                 elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
                 if elements:
                     match_elements.extend(elements)
-                    print(
-                        f"✅ Encontrados {len(elements)} elementos com seletor: {selector}")
+                    logger.debug("Encontrados %d elementos com seletor: %s", len(elements), selector)
 
             # Remove duplicatas
             match_elements = list(set(match_elements))
-            print(
-                f"📊 Total de elementos únicos encontrados: {len(match_elements)}")
+            logger.info("Total de elementos únicos encontrados: %d", len(match_elements))
 
-            # Processa elementos até conseguir 5 partidas válidas (não terminadas)
-            match_data = []
-            max_matches = 5
+            # Processa elementos até conseguir max_matches partidas válidas (não terminadas)
+            found = 0
+            max_matches = self.max_matches
             
             for i, element in enumerate(match_elements):
-                # Para quando já tiver 5 partidas válidas
-                if len(match_data) >= max_matches:
+                # Para quando já tiver max_matches partidas válidas
+                if found >= max_matches:
                     break
                     
                 try:
-                    print(f"🔄 Processando elemento {i+1}...")
-                    match_info = self.extract_element_data(element, i+1)
-                    if match_info:
-                        match_data.append(match_info)
-                        print(f"   ✅ Partida válida adicionada ({len(match_data)}/{max_matches})")
+                    logger.debug("Processando elemento %d", i + 1)
+                    match_info = self.extract_element_data(element, i+1, fetch_details=False)
                 except Exception as e:
-                    print(f"❌ Erro ao processar elemento {i+1}: {e}")
+                    logger.warning("Erro ao processar elemento %d: %s", i + 1, e)
                     continue
 
-            return match_data
+                if match_info:
+                    found += 1
+                    logger.debug("Partida válida adicionada (%d/%d)", found, max_matches,
+                                 extra={'match_id': match_info['id']})
+                    yield match_info
 
         except Exception as e:
-            print(f"❌ Erro no método alternativo: {e}")
-            return []
+            logger.exception("Erro no método alternativo: %s", e)
 
-    def extract_row_data(self, row, row_number: int) -> Optional[Dict]:
+    def extract_row_data(self, row, row_number: int, fetch_details: bool = True) -> Optional[Dict]:
         """Extrai dados de uma linha da tabela"""
         try:
             cells = row.find_elements(By.TAG_NAME, "td")
             if len(cells) < 2:
-                print(
-                    f"⚠️ Linha {row_number} tem poucas colunas ({len(cells)})")
+                logger.debug("Linha %d tem poucas colunas (%d)", row_number, len(cells))
                 return None
 
             # Extrai informações básicas da linha
             row_text = row.text.strip()
-            print(f"📝 Texto da linha: {row_text[:100]}...")
+            logger.debug("Texto da linha %d: %s", row_number, row_text[:100])
             
+            # Classifica a linha de uma vez (status, esporte, liga e times)
+            classification = classify_row(row_text)
+
             # Verifica se a partida já terminou (ignora jogos terminados)
-            if self.is_match_finished(row_text):
-                print(f"⏭️  Partida terminada detectada na linha {row_number} - Ignorando...")
+            if classification.finished:
+                logger.debug("Partida terminada na linha %d - ignorando", row_number)
                 return None
 
             # Procura por link na linha
@@ -237,7 +450,7 @@ class AcademiaScraperImproved:
                     links = cell.find_elements(By.TAG_NAME, "a")
                     for link in links:
                         href = link.get_attribute("href")
-                        if href and ("match" in href.lower() or "game" in href.lower() or "fixture" in href.lower()):
+                        if is_detail_link(href):
                             link_element = link
                             link_url = href
                             break
@@ -247,474 +460,364 @@ class AcademiaScraperImproved:
                     continue
 
             if not link_url:
-                print(f"⚠️ Link não encontrado na linha {row_number}")
+                logger.debug("Link não encontrado na linha %d", row_number)
                 # Tenta usar o texto da linha mesmo sem link
-                return self.create_basic_match_data(row_text, row_number)
+                return self.create_basic_match_data(row_text, row_number, classification=classification)
 
-            print(f"🔗 Link encontrado: {link_url}")
+            logger.debug("Link encontrado: %s", link_url)
 
             # Cria dados básicos
             match_data = self.create_basic_match_data(
-                row_text, row_number, link_url)
+                row_text, row_number, link_url, classification)
 
             # Tenta acessar a página de detalhes
-            try:
-                detail_data = self.get_match_details(link_url)
-                if detail_data:
-                    match_data.update(detail_data)
-            except Exception as e:
-                print(f"⚠️ Erro ao acessar detalhes da partida: {e}")
+            if fetch_details:
+                try:
+                    detail_data = self.get_match_details(link_url)
+                    if detail_data:
+                        match_data.update(detail_data)
+                except Exception as e:
+                    logger.warning("Erro ao acessar detalhes da partida: %s", e, extra={'url': link_url})
 
             return match_data
 
         except Exception as e:
-            print(f"❌ Erro ao extrair dados da linha: {e}")
+            logger.warning("Erro ao extrair dados da linha %d: %s", row_number, e)
             return None
 
-    def extract_element_data(self, element, element_number: int) -> Optional[Dict]:
+    def extract_element_data(self, element, element_number: int, fetch_details: bool = True) -> Optional[Dict]:
         """Extrai dados de um elemento de partida"""
         try:
             link_url = element.get_attribute("href")
             element_text = element.text.strip()
 
-            print(f"📝 Elemento {element_number}: {element_text[:100]}...")
+            logger.debug("Elemento %d: %s", element_number, element_text[:100])
 
             if not link_url and not element_text:
                 return None
             
+            classification = classify_row(element_text)
+
             # Verifica se a partida já terminou (ignora jogos terminados)
-            if self.is_match_finished(element_text):
-                print(f"⏭️  Partida terminada detectada no elemento {element_number} - Ignorando...")
+            if classification.finished:
+                logger.debug("Partida terminada no elemento %d - ignorando", element_number)
                 return None
 
             match_data = self.create_basic_match_data(
-                element_text, element_number, link_url)
+                element_text, element_number, link_url, classification)
 
             # Tenta acessar detalhes se houver link
-            if link_url:
+            if link_url and fetch_details:
                 try:
                     detail_data = self.get_match_details(link_url)
                     if detail_data:
                         match_data.update(detail_data)
                 except Exception as e:
-                    print(f"⚠️ Erro ao acessar detalhes: {e}")
+                    logger.warning("Erro ao acessar detalhes: %s", e, extra={'url': link_url})
 
             return match_data
 
         except Exception as e:
-            print(f"❌ Erro ao extrair dados do elemento: {e}")
+            logger.warning("Erro ao extrair dados do elemento %d: %s", element_number, e)
             return None
 
-    def create_basic_match_data(self, text: str, number: int, link_url: str = None) -> Dict:
-        """Cria dados básicos de uma partida"""
-        # Gera ID único
-        match_id = f"match_{uuid.uuid4().hex[:8]}_{int(time.time())}"
-
-        # Determina categoria
-        category = determine_category(text)
-
-        # Extrai times
-        teams = extract_teams_from_text(text)
-
-        # Extrai horário e adiciona data atual
-        match_time = extract_time_from_text(text)
-        current_date = datetime.now().strftime("%Y-%m-%d")
-        match_time = f"{current_date} {match_time}"
-
-        # Extrai liga
-        league = extract_league_from_text(text)
-        
-        # Gera confidence aleatório entre 60 e 90
-        confidence = random.randint(60, 90)
-
-        return {
-            'id': match_id,
-            'category': category,
-            'league': league,
-            'teams': teams,
-            'matchTime': match_time,
-            'prediction': 'Predição não disponível',
-            'description': '',
-            'odds': [],
-            'confidence': confidence,
-            'detail_url': link_url
-        }
-
-    def get_match_details(self, url: str) -> Optional[Dict]:
-        """Acessa a página de detalhes da partida"""
-        try:
-            print(f"🔍 Acessando detalhes: {url}")
-
-            # Abre nova aba
-            self.driver.execute_script("window.open('');")
-            self.driver.switch_to.window(self.driver.window_handles[1])
-
-            self.driver.get(url)
-            WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
-
-            time.sleep(3)  # Aguarda carregamento
-
-            # Extrai informações da página de detalhes
-            details = {}
-
-            # Procura por odds
-            odds = self.extract_odds_from_page()
-            details['odds'] = [asdict(odd) for odd in odds]
-
-            # Procura por predição
-            prediction = self.extract_prediction_from_page()
-            if prediction:
-                details['prediction'] = prediction
-
-            # Procura por description (nova propriedade)
-            description = self.extract_description_from_page()
-            if description:
-                details['description'] = description
-
-            # Procura por liga
-            league = self.extract_league_from_page()
-            if league:
-                details['league'] = league
-
-            # Verifica se é premium (DESABILITADO)
-            # details['isPremium'] = self.check_if_premium()
-
-            # Fecha a aba de detalhes
-            self.driver.close()
-            self.driver.switch_to.window(self.driver.window_handles[0])
+    def create_basic_match_data(self, text: str, number: int, link_url: str = None,
+                                classification: Optional[RowClassification] = None) -> Dict:
+        """Cria dados básicos de uma partida (com o dia da listagem em leitura)"""
+        return build_match_data(text, number, link_url, classification, self.listing_date)
 
+    def enrich_match(self, match: Dict, driver=None) -> Dict:
+        """Completa uma partida com os dados da página de detalhes"""
+        link_url = match.get('detail_url')
+        if not link_url:
+            return match
+        try:
+            detail_data = self.get_match_details(link_url, driver=driver)
+            if detail_data:
+                match.update(detail_data)
+        except Exception as e:
+            logger.warning("Erro ao acessar detalhes da partida: %s", e, extra={'url': link_url})
+        return match
+
+    def enrich_matches(self, matches: List[Dict]) -> List[Dict]:
+        """Completa as partidas com detalhes (em paralelo se houver pool)"""
+        if self.driver_pool:
+            return self.fetch_details_parallel(matches)
+        for match in matches:
+            self.enrich_match(match)
+        return matches
+
+    def fetch_details_parallel(self, matches: List[Dict]) -> List[Dict]:
+        """Busca os detalhes das partidas usando o pool de sessões (ordem preservada)"""
+        pending = [match for match in matches if match.get('detail_url')]
+        if not pending:
+            return matches
+
+        logger.info("Buscando detalhes de %d partidas com %d sessões em paralelo",
+                    len(pending), self.driver_pool.active_sessions)
+        self.driver_pool.map_ordered(
+            lambda match, driver: self.enrich_match(match, driver=driver),
+            pending
+        )
+        return matches
+
+    def get_match_details(self, url: str, driver=None) -> Optional[Dict]:
+        """Retorna os detalhes da partida, usando o cache local quando possível"""
+        if self.detail_cache:
+            cached = self.detail_cache.get(url)
+            if cached is not None:
+                logger.debug("Detalhes em cache", extra={'url': url})
+                DETAIL_FETCHES.inc(engine='cache', outcome='hit')
+                return cached
+
+        with timed('detail_fetch'):
+            details = self._fetch_match_details(url, driver)
+
+        # Só guarda páginas que renderam algum conteúdo útil
+        if self.detail_cache and details and (details.get('odds') or details.get('prediction')):
+            self.detail_cache.set(url, details)
+
+        return details
+
+    def _fetch_match_details(self, url: str, driver=None) -> Optional[Dict]:
+        """Acessa a página de detalhes da partida
+
+        Sem driver, abre uma nova aba no driver principal; com um driver do
+        pool, navega diretamente na sessão recebida.
+        """
+        # Tenta primeiro o HTML estático (sem navegador)
+        if self.http_fetcher:
+            details = self.http_fetcher.get_match_details(url)
+            if details is not None:
+                DETAIL_FETCHES.inc(engine='http', outcome='ok')
+                return details
+            logger.info("Usando Selenium como fallback para os detalhes", extra={'url': url})
+            DETAIL_FETCHES.inc(engine='http', outcome='fallback')
+            RETRIES.inc(kind='selenium_fallback')
+
+        use_tab = driver is None
+        driver = driver or self.driver
+        try:
+            logger.debug("Acessando detalhes", extra={'url': url})
+
+            if use_tab:
+                # Abre nova aba
+                driver.execute_script("window.open('');")
+                driver.switch_to.window(driver.window_handles[1])
+
+            apply_page_profile(driver, 'detail')
+            # Limiter próprio do navegador (latências de segundos não freiam o motor HTTP);
+            # só timeouts e erros do WebDriver contam como sobrecarga do site
+            with limiter_for(url, BROWSER).slot():
+                driver.get(url)
+                self.watchdog.note_page(driver)
+                WebDriverWait(driver, 15).until(
+                    EC.presence_of_element_located((By.TAG_NAME, "body"))
+                )
+
+            # Aguarda a análise renderizar (ou a rede ficar ociosa); página sem
+            # #_preview não é sinal de sobrecarga
+            wait_for_detail_page(driver)
+
+            # Bloco #_preview inalterado desde a última visita: pula o parse
+            details = None
+            preview_hash = None
+            if self.revalidator:
+                preview_html = driver.execute_script(PREVIEW_HTML_SCRIPT)
+                if preview_html:
+                    preview_hash = fragment_hash(preview_html)
+                    details = self.revalidator.unchanged_payload(url, preview_hash)
+                    if details is not None:
+                        logger.info("Bloco #_preview inalterado, reaproveitando detalhes", extra={'url': url})
+
+            if details is None:
+                # Extrai informações da página de detalhes (uma única ida ao navegador)
+                try:
+                    page = snapshot_page(driver)
+                except Exception as e:
+                    logger.warning("Snapshot em lote falhou, usando seletores individuais: %s", e)
+                    page = SeleniumPage(driver)
+                details = extract_details(page)
+                if self.diagnostics and not (details.get('odds') or details.get('prediction')):
+                    # Nenhuma cascata de seletores dos detalhes encontrou conteúdo
+                    self.diagnostics.capture_driver(driver, url, DETAIL)
+                if preview_hash:
+                    self.revalidator.store(url, preview_hash, details)
+
+            if use_tab:
+                # Fecha a aba de detalhes
+                driver.close()
+                driver.switch_to.window(driver.window_handles[0])
+
+            DETAIL_FETCHES.inc(engine='selenium', outcome='ok')
+            sample_chrome_rss()
+            if use_tab:
+                self.recycle_if_needed()
             return details
 
         except Exception as e:
-            print(f"❌ Erro ao acessar detalhes da partida: {e}")
+            logger.error("Erro ao acessar detalhes da partida: %s", e, extra={'url': url})
+            DETAIL_FETCHES.inc(engine='selenium', outcome='error')
             # Tenta voltar para a aba principal
-            try:
-                if len(self.driver.window_handles) > 1:
-                    self.driver.close()
-                    self.driver.switch_to.window(self.driver.window_handles[0])
-            except:
-                pass
+            if use_tab:
+                try:
+                    if len(driver.window_handles) > 1:
+                        driver.close()
+                        driver.switch_to.window(driver.window_handles[0])
+                except:
+                    pass
             return None
 
-    def extract_odds_from_page(self) -> List[Odds]:
+    def extract_odds_from_page(self, driver=None) -> List[Odds]:
         """Extrai odds da página de detalhes"""
-        odds = []
-
-        # Seletores ESPECÍFICOS para odds
-        odds_selectors = [
-            # Seletor específico fornecido
-            "bet-suggestion > preview_bet_odd > div.preview_bet > p.preview_odd",
-            ".bet-suggestion .preview_bet_odd .preview_bet p.preview_odd",
-            ".preview_bet p.preview_odd",
-            "p.preview_odd",
-            
-            # Seletores genéricos como fallback
-            "[class*='odd']",
-            "[class*='bet']",
-            "[class*='quote']",
-            "[class*='price']",
-            ".odds",
-            ".bet-odds"
-        ]
-
-        for selector in odds_selectors:
-            try:
-                odds_elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                print(f"🎲 Testando seletor de odds '{selector}': {len(odds_elements)} elementos")
-                
-                # Pega apenas o PRIMEIRO elemento (apenas 1 odd)
-                if odds_elements:
-                    element = odds_elements[0]
-                    try:
-                        odd_text = element.text.strip()
-                        
-                        # Extrai números do texto (ex: "Odd 1.95" -> "1.95")
-                        match = re.search(r'\d+\.?\d*', odd_text)
-                        if match:
-                            odd_value = float(match.group())
-                            odds.append(Odds(house="Bet365", value=odd_value))
-                            print(f"   ✅ Odd encontrada: {odd_value} (texto original: '{odd_text}')")
-                    except:
-                        pass
-                        
-                if odds:
-                    print(f"✅ Odd cadastrada com seletor '{selector}'")
-                    break
-            except Exception as e:
-                continue
+        return extract_odds(SeleniumPage(driver or self.driver))
 
-        if not odds:
-            print("⚠️ Nenhuma odd encontrada")
-            
-        return odds
-
-    def extract_description_from_page(self) -> Optional[str]:
+    def extract_description_from_page(self, driver=None) -> Optional[str]:
         """Extrai description da página de detalhes (Sugestão de aposta + Previsão)"""
-        descriptions = []
-        
-        # PRIMEIRA INFORMAÇÃO: Sugestão de aposta
-        suggestion_selectors = [
-            "#_preview div.preview_main_container article div.preview_resume div.preview_intro.toggle_content",
-            "div.preview_resume div.preview_intro.toggle_content",
-            "div.preview_intro.toggle_content",
-            ".preview_intro.toggle_content"
-        ]
-        
-        suggestion_text = None
-        for selector in suggestion_selectors:
-            try:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                print(f"📝 Testando seletor de sugestão '{selector}': {len(elements)} elementos")
-                if elements:
-                    suggestion_text = elements[0].text.strip()
-                    if suggestion_text and len(suggestion_text) > 3:
-                        print(f"✅ Sugestão de aposta encontrada: {suggestion_text[:50]}...")
-                        break
-            except Exception as e:
-                continue
-        
-        if suggestion_text:
-            descriptions.append(f"**Sugestão de aposta:**\n{suggestion_text}")
-        
-        # SEGUNDA INFORMAÇÃO: Previsão
-        preview_selectors = [
-            "#_preview div.preview_main_container article div.preview_pre_intro div.preview_body",
-            "div.preview_pre_intro div.preview_body",
-            "div.preview_body"
-        ]
-        
-        preview_text = None
-        for selector in preview_selectors:
-            try:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                print(f"📝 Testando seletor de previsão '{selector}': {len(elements)} elementos")
-                if elements:
-                    preview_text = elements[0].text.strip()
-                    if preview_text and len(preview_text) > 3:
-                        print(f"✅ Previsão encontrada: {preview_text[:50]}...")
-                        break
-            except Exception as e:
-                continue
-        
-        if preview_text:
-            descriptions.append(f"**Previsão:**\n{preview_text}")
-        
-        # Concatena as duas informações
-        if descriptions:
-            final_description = "\n\n".join(descriptions)
-            print(f"✅ Description completa extraída com sucesso ({len(final_description)} caracteres)")
-            return final_description
-        
-        print("⚠️ Nenhuma description encontrada")
-        return ""
-
-    def extract_prediction_from_page(self) -> Optional[str]:
+        return extract_description(SeleniumPage(driver or self.driver))
+
+    def extract_prediction_from_page(self, driver=None) -> Optional[str]:
         """Extrai predição da página de detalhes (APENAS a sugestão de aposta curta)"""
-        
-        # PREDICTION = APENAS a Sugestão de aposta (texto curto)
-        # Seletor específico fornecido pelo usuário como PRIORIDADE
-        # Busca diretamente o primeiro <p> dentro de div.preview_bet (ignora p.preview_odd)
-        suggestion_selectors = [
-            "#_preview div.preview_main_container article div.preview_container div.preview_resume div.bet-suggestion div.preview_bet_odd div.preview_bet p:not(.preview_odd)",
-            "#_preview div.preview_main_container article div.bet-suggestion div.preview_bet_odd div.preview_bet p:not(.preview_odd)",
-            "div.bet-suggestion div.preview_bet_odd div.preview_bet p:not(.preview_odd)",
-            "div.preview_bet_odd div.preview_bet p:not(.preview_odd)",
-            "div.preview_bet p:not(.preview_odd)",
-            # Fallback: pega o primeiro p de qualquer forma
-            "div.preview_bet p:first-child",
-            "div.preview_bet p",
-        ]
-        
-        for selector in suggestion_selectors:
-            try:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                print(f"🔮 Testando seletor de predição '{selector}': {len(elements)} elementos")
-                if elements:
-                    suggestion_text = elements[0].text.strip()
-                    # Verifica se não é a odd (não deve começar com "Odd" nem ser só número)
-                    if suggestion_text and len(suggestion_text) > 3 and not suggestion_text.lower().startswith('odd') and not re.match(r'^\d+\.?\d*$', suggestion_text):
-                        print(f"✅ Predição (sugestão) encontrada: {suggestion_text[:50]}...")
-                        return suggestion_text
-            except Exception as e:
-                continue
-        
-        # FALLBACK: Seletores antigos caso os novos não funcionem
-        print("⚠️ Tentando seletores de fallback para predição...")
-        prediction_selectors = [
-            "bet-suggestion > preview_bet_odd > div.preview_bet > p",
-            ".bet-suggestion .preview_bet_odd .preview_bet > p",
-            ".preview_bet > p",
-            "div.preview_bet p",
-            "[class*='prediction']",
-            "[class*='tip']",
-            "[class*='recommendation']",
-            "[class*='forecast']",
-            ".prediction",
-            ".tip",
-            ".recommendation"
-        ]
-
-        for selector in prediction_selectors:
-            try:
-                pred_elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                print(f"🔮 Testando seletor de fallback '{selector}': {len(pred_elements)} elementos")
-                
-                for pred_element in pred_elements:
-                    prediction = pred_element.text.strip()
-                    if prediction and len(prediction) > 3 and not re.match(r'^\d+\.?\d*$', prediction):
-                        print(f"✅ Predição encontrada com fallback '{selector}': {prediction[:50]}...")
-                        return prediction
-                        
-            except NoSuchElementException:
-                continue
-
-        print("⚠️ Nenhuma predição encontrada")
-        return None
+        return extract_prediction(SeleniumPage(driver or self.driver))
 
-    def extract_league_from_page(self) -> Optional[str]:
-        try:
-            print("🔍 Procurando por li.gamehead...")
-            gamehead_elements = self.driver.find_elements(
-                By.CSS_SELECTOR, "td.stats-game-head-date ul li.gamehead")
-
-            if len(gamehead_elements) > 1:
-                # Pula o primeiro e tenta os seguintes
-                for element in gamehead_elements[2:]:  # [1:] pula o primeiro
-                    league = element.text.strip()
-                    if league and len(league) > 3:
-                        print(
-                            f"✅ Liga encontrada pulando o primeiro li.gamehead: {league}")
-                        return league
-            elif len(gamehead_elements) == 1:
-                print(f"⚠️ Apenas 1 li.gamehead encontrado")
-            else:
-                print(f"⚠️ Nenhum li.gamehead encontrado")
-        except Exception as e:
-            print(f"⚠️ Erro ao buscar li.gamehead: {e}")
-
-        # ESTRATÉGIA 2: Seletores alternativos
-        league_selectors = [
-            ".stats-game-head-date ul li.gamehead",
-            "ul li.gamehead",
-            "[class*='league']",
-            "[class*='competition']",
-            "[class*='tournament']",
-            "[class*='championship']",
-            ".league",
-            ".competition"
-        ]
-
-        for selector in league_selectors:
-            try:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                if len(elements) > 1:
-                    # Pula o primeiro
-                    league = elements[1].text.strip()
-                    if league and len(league) > 3:
-                        print(
-                            f"✅ Liga encontrada com seletor '{selector}' (2º elemento): {league}")
-                        return league
-            except:
-                continue
-
-        print("⚠️ Nenhum seletor de liga funcionou")
-        return None
+    def extract_league_from_page(self, driver=None) -> Optional[str]:
+        """Extrai a liga da página de detalhes"""
+        return extract_league(SeleniumPage(driver or self.driver))
 
-    def check_if_premium(self) -> bool:
+    def check_if_premium(self, driver=None) -> bool:
         """Verifica se o conteúdo é premium"""
-        premium_indicators = [
-            "[class*='premium']",
-            "[class*='vip']",
-            "[class*='pro']",
-            "[class*='paid']",
-            ".premium",
-            ".vip"
-        ]
-
-        for selector in premium_indicators:
-            try:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                if elements:
-                    return True
-            except:
-                continue
-
-        return False
+        return check_premium(SeleniumPage(driver or self.driver))
 
     def send_to_api(self, tip_data: Dict) -> bool:
         """Envia dados para a API local"""
+        return self.submitter.submit(tip_data).ok
+
+    def print_match(self, match: Dict, number: int, total: int):
+        """Mostra o resumo de uma partida antes do envio"""
+        logger.info("Enviando partida %d/%d: %s", number, total, match['teams'], extra={
+            'tip_id': match['id'],
+            'category': match['category'],
+            'league': match['league'],
+            'match_time': match['matchTime'],
+            'prediction': match['prediction'],
+            'odds': match['odds'],
+            'confidence': match['confidence'],
+        })
+        # A descrição completa só aparece no nível DEBUG
+        logger.debug("Descrição da partida %s: %s", match['id'], match['description'])
+
+    def run(self, keep_alive: bool = False) -> bool:
+        """Executa o processo completo (descoberta, detalhes e envio em streaming)
+
+        Com keep_alive, o navegador e os armazenamentos continuam abertos para
+        a próxima execução (modo daemon). Retorna True se a execução concluiu.
+        """
+        start_metrics_server()
+        success = False
         try:
-            api_url = f"https://sportstips-mu.vercel.app/api/tips"
-
-            # Remove campos que não devem ser enviados
-            clean_data = {k: v for k, v in tip_data.items() if k !=
-                          'detail_url'}
-
-            response = requests.post(
-                api_url,
-                json=clean_data,
-                headers={'Content-Type': 'application/json'},
-                timeout=10
-            )
-
-            if response.status_code in [200, 201]:
-                print(f"✅ Tip cadastrada com sucesso: {tip_data['id']}")
-                return True
-            else:
-                print(
-                    f"❌ Erro ao cadastrar tip: {response.status_code} - {response.text}")
-                return False
-
-        except Exception as e:
-            print(f"❌ Erro na requisição para API: {e}")
-            return False
-
-    def run(self):
-        """Executa o processo completo"""
-        try:
-            print("🚀 Iniciando robô da Academia das Apostas Brasil...")
-            print("=" * 60)
-
-            # Extrai dados da página principal
-            match_data = self.get_main_page_data()
-
-            if not match_data:
-                print("❌ Nenhum dado foi extraído da página")
-                return
-
-            print(f"📊 Encontrados {len(match_data)} partidas")
-            print("=" * 60)
-
-            # Envia dados para a API
-            success_count = 0
-            for i, match in enumerate(match_data, 1):
-                print(f"\n📤 Enviando partida {i}/{len(match_data)}...")
-                print(f"   ID: {match['id']}")
-                print(f"   Times: {match['teams']}")
-                print(f"   Categoria: {match['category']}")
-                print(f"   Liga: {match['league']}")
-                print(f"   Horário: {match['matchTime']}")
-                print(f"   Predição: {match['prediction']}")
-                print(f"   Descrição: {match['description']}")
-                print(f"   Odds: {match['odds']}")
-                print(f"   Confidence: {match['confidence']}%")
-
-                if self.send_to_api(match):
-                    success_count += 1
-
-                # Pequena pausa entre requisições
-                time.sleep(1)
-
-            print("\n" + "=" * 60)
-            print(
-                f"✅ Processo concluído! {success_count}/{len(match_data)} partidas cadastradas com sucesso")
+            logger.info("Iniciando robô da Academia das Apostas Brasil")
+
+            # Modo daemon: cada execução começa sem as tips vistas na anterior
+            if self.dedup:
+                self.dedup.begin_run()
+            if self.diagnostics:
+                self.diagnostics.begin_run()
+
+            # Reenvia em paralelo as tips que falharam em execuções anteriores
+            # (os envios desta execução esperam o reenvio terminar)
+            replay_thread = None
+            if self.outbox:
+                self.submitter.begin_replay()
+                replay_thread = threading.Thread(
+                    target=self.submitter.replay_outbox, name="outbox-replay", daemon=True)
+                replay_thread.start()
+
+            if self.checkpoint:
+                # A mesma página com outras listagens é outra descoberta
+                self.checkpoint.begin(crawl_key(self.main_page_url,
+                                                (url for url, _ in listing_seeds(self.main_page_url))))
+
+            pipeline = StreamingPipeline(self)
+            with timed('pipeline'):
+                results = pipeline.run()
+
+            if replay_thread:
+                replay_thread.join()
+
+            if pipeline.resumed:
+                logger.info("%d partidas retomadas do checkpoint sem nova renderização", pipeline.resumed)
+
+            if not results:
+                if pipeline.discovered:
+                    # Todas as partidas já tinham sido enviadas sem alterações
+                    logger.info("Nenhuma tip nova ou alterada entre %d partidas", pipeline.discovered)
+                    success = True
+                    if self.checkpoint:
+                        self.checkpoint.finish()
+                else:
+                    logger.error("Nenhum dado foi extraído da página")
+                return success
+
+            for result in results:
+                if not result.ok:
+                    logger.error("Tip não cadastrada: status=%s erro=%s", result.status_code, result.error,
+                                 extra={'tip_id': result.tip_id})
+
+            success_count = sum(result.ok for result in results)
+            logger.info("Processo concluído: %d/%d partidas cadastradas com sucesso",
+                        success_count, len(results),
+                        extra={'sent': success_count, 'total': len(results)})
+            success = True
+            if self.checkpoint:
+                self.checkpoint.finish()
 
         except Exception as e:
-            print(f"❌ Erro durante execução: {e}")
+            logger.exception("Erro durante execução: %s", e)
         finally:
-            if self.driver:
-                self.driver.quit()
-                print("🔒 Driver fechado")
+            sample_chrome_rss(force=True)
+            save_selector_stats()
+            limits = rate_limit_snapshot()
+            if limits:
+                logger.info("Limites por host ao fim da execução", extra={'rate_limits': limits})
+            if not keep_alive:
+                self.close()
+            LAST_RUN.set(time.time())
+            LAST_RUN_SUCCESS.set(1 if success else 0)
+            export_metrics()
+        return success
+
+    def close(self):
+        """Fecha o driver principal, as sessões do pool e a sessão HTTP"""
+        self.http_session.close()
+        self.submitter.close()
+        if self.outbox:
+            pending = self.outbox.pending_count()
+            if pending:
+                logger.info("%d tips aguardando reenvio no outbox", pending)
+            self.outbox.close()
+            self.outbox = None
+        if self.dedup:
+            if self.dedup.skipped:
+                logger.info("%d tips repetidas ou inalteradas não foram reenviadas", self.dedup.skipped)
+            self.dedup.close()
+            self.dedup = None
+        if self.revalidator:
+            self.revalidator.close()
+            self.revalidator = None
+        if self.checkpoint:
+            self.checkpoint.close()
+            self.checkpoint = None
+        if self.detail_cache:
+            logger.info("Cache de detalhes: %d acertos, %d falhas", self.detail_cache.hits,
+                        self.detail_cache.misses)
+            self.detail_cache.close()
+            self.detail_cache = None
+        if self.driver_pool:
+            self.driver_pool.close()
+            self.driver_pool = None
+            logger.info("Pool de sessões fechado")
+        if self.driver:
+            quit_driver(self.driver)
+            self.driver = None
+            logger.info("Driver fechado")
 
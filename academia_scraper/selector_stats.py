@@ -0,0 +1,292 @@
+"""
+Estatísticas das cascatas de seletores, para pular o que parou de funcionar
+
+Cada cascata (tabela da listagem, odds, predição, description, liga)
+registra qual seletor encontrou o conteúdo e quais foram testados antes
+dele sem sucesso. Com as contagens persistidas em
+DATA_DIR/selector_stats.sqlite3, um seletor que falhou nas últimas
+SELECTOR_SKIP_AFTER tentativas seguidas deixa de ser testado. Quando o site
+muda de layout, as páginas deixam de pagar pelas falhas dos seletores que
+não servem mais antes de chegar ao que serve.
+
+Só conta como falha de um seletor a tentativa vencida por outro seletor
+específico da mesma cascata. Se nada serviu, ou se venceu um fallback
+genérico (qualquer tbody, [class*='odd']...), a página provavelmente não
+tem aquele conteúdo, e os seletores específicos não são penalizados: uma
+página com o conteúdo continua sendo lida por eles.
+
+A ordem da cascata nunca muda: a prioridade dos seletores específicos
+sobre os genéricos é mantida, e o resultado é o mesmo da cascata completa
+enquanto os seletores pulados continuarem sem encontrar nada. A cada
+SELECTOR_REPROBE_EVERY tentativas a cascata roda inteira; um seletor pulado
+que voltou a funcionar vence essa tentativa e volta a ser testado.
+Seletores que já venceram e não vencem há SELECTOR_STALE_DAYS dias (o
+layout que eles cobriam provavelmente mudou) são relatados ao fim da
+execução e por:
+
+    python -m academia_scraper.selector_stats
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
+
+from .config import env_bool, env_float, env_int, get_data_dir
+
+
+logger = logging.getLogger(__name__)
+
+# Registros entre duas gravações no SQLite (além da gravação no fim da execução)
+AUTOSAVE_EVERY = 100
+
+
+class _Entry:
+    __slots__ = ('hits', 'miss_streak', 'last_hit_at', 'first_seen_at')
+
+    def __init__(self, hits=0, miss_streak=0, last_hit_at=None, first_seen_at=None):
+        self.hits = hits
+        # Tentativas seguidas em que o seletor foi testado e não serviu
+        self.miss_streak = miss_streak
+        self.last_hit_at = last_hit_at
+        self.first_seen_at = first_seen_at or time.time()
+
+
+class SelectorStats:
+    """Acertos e falhas seguidas por seletor de cada cascata, em memória e em SQLite"""
+
+    def __init__(self, path: Optional[str] = None, reprobe_every: Optional[int] = None,
+                 skip_after: Optional[int] = None):
+        self.path = path or os.path.join(get_data_dir(), 'selector_stats.sqlite3')
+        self.reprobe_every = reprobe_every if reprobe_every is not None \
+            else env_int('SELECTOR_REPROBE_EVERY', 50)
+        # Falhas seguidas para um seletor deixar de ser testado (0 = nunca pula)
+        self.skip_after = skip_after if skip_after is not None else env_int('SELECTOR_SKIP_AFTER', 20)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS selector_streaks (
+                cascade TEXT NOT NULL,
+                selector TEXT NOT NULL,
+                hits INTEGER NOT NULL,
+                miss_streak INTEGER NOT NULL,
+                last_hit_at REAL,
+                first_seen_at REAL NOT NULL,
+                PRIMARY KEY (cascade, selector)
+            );
+            CREATE TABLE IF NOT EXISTS selector_cascades (
+                cascade TEXT PRIMARY KEY,
+                attempts INTEGER NOT NULL,
+                misses INTEGER NOT NULL,
+                last_attempt_at REAL
+            );
+            """
+        )
+        self._conn.commit()
+        self._entries: Dict[str, Dict[str, _Entry]] = {}
+        self._cascades: Dict[str, Dict] = {}
+        self._calls: Dict[str, int] = {}
+        self._unsaved = 0
+        self._load()
+
+    def _load(self):
+        for cascade, attempts, misses, last_attempt_at in self._conn.execute(
+                "SELECT cascade, attempts, misses, last_attempt_at FROM selector_cascades"):
+            self._cascades[cascade] = {'attempts': attempts, 'misses': misses,
+                                       'last_attempt_at': last_attempt_at}
+        for cascade, selector, hits, miss_streak, last_hit_at, first_seen_at in self._conn.execute(
+                "SELECT cascade, selector, hits, miss_streak, last_hit_at, first_seen_at FROM selector_streaks"):
+            self._entries.setdefault(cascade, {})[selector] = _Entry(hits, miss_streak, last_hit_at,
+                                                                     first_seen_at)
+
+    def _cascade(self, cascade: str) -> Dict:
+        return self._cascades.setdefault(cascade, {'attempts': 0, 'misses': 0, 'last_attempt_at': None})
+
+    def _entry(self, cascade: str, selector: str) -> _Entry:
+        entries = self._entries.setdefault(cascade, {})
+        entry = entries.get(selector)
+        if entry is None:
+            entry = entries[selector] = _Entry()
+        return entry
+
+    def order(self, cascade: str, selectors: List[str]) -> List[str]:
+        """Seletores a testar, na ordem original, sem os que vêm falhando seguidamente"""
+        with self._lock:
+            calls = self._calls[cascade] = self._calls.get(cascade, 0) + 1
+            # Reprova periódica: a cascata inteira
+            if self.skip_after <= 0 or (self.reprobe_every > 0 and calls % self.reprobe_every == 0):
+                return list(selectors)
+            entries = self._entries.get(cascade, {})
+            candidates = [selector for selector in selectors
+                          if selector not in entries or entries[selector].miss_streak < self.skip_after]
+        # Todos pulados: a cascata inteira (nenhum seletor serve, nada a economizar com segurança)
+        return candidates or list(selectors)
+
+    def record(self, cascade: str, selector: Optional[str], tried: List[str],
+               generic: Iterable[str] = ()):
+        """Registra uma tentativa da cascata
+
+        selector é o que acertou (None = nenhum); tried é a lista devolvida
+        por order(), testada na ordem até o vencedor; generic são os
+        fallbacks genéricos da cascata, cuja vitória não conta como falha
+        dos seletores testados antes.
+        """
+        now = time.time()
+        if selector is None or selector in generic or selector not in tried:
+            missed = []
+        else:
+            missed = tried[:tried.index(selector)]
+        with self._lock:
+            state = self._cascade(cascade)
+            state['attempts'] += 1
+            state['last_attempt_at'] = now
+            for miss in missed:
+                self._entry(cascade, miss).miss_streak += 1
+            if selector is None:
+                state['misses'] += 1
+            else:
+                entry = self._entry(cascade, selector)
+                entry.miss_streak = 0
+                entry.hits += 1
+                entry.last_hit_at = now
+            self._unsaved += 1
+            autosave = self._unsaved >= AUTOSAVE_EVERY
+        if autosave:
+            self.save()
+
+    def stale(self, max_age: Optional[float] = None) -> List[Dict]:
+        """Seletores que já acertaram mas não acertam há max_age segundos (padrão: SELECTOR_STALE_DAYS)"""
+        if max_age is None:
+            max_age = env_float('SELECTOR_STALE_DAYS', 7.0) * 86400
+        now = time.time()
+        found = []
+        with self._lock:
+            for cascade, entries in self._entries.items():
+                last_attempt = self._cascade(cascade)['last_attempt_at'] or 0
+                for selector, entry in entries.items():
+                    # Só conta como parado se a cascata continuou sendo usada depois
+                    if entry.last_hit_at and now - entry.last_hit_at > max_age and last_attempt > entry.last_hit_at:
+                        found.append({'cascade': cascade, 'selector': selector, 'hits': entry.hits,
+                                      'last_hit_at': entry.last_hit_at,
+                                      'days_since_hit': round((now - entry.last_hit_at) / 86400, 1)})
+        return found
+
+    def report(self) -> Dict[str, Dict]:
+        """Tentativas, falhas e acertos por seletor de cada cascata"""
+        with self._lock:
+            report = {}
+            for cascade, state in self._cascades.items():
+                entries = self._entries.get(cascade, {})
+                report[cascade] = {
+                    'attempts': state['attempts'],
+                    'misses': state['misses'],
+                    'selectors': {
+                        selector: {'hits': entry.hits,
+                                   'miss_streak': entry.miss_streak,
+                                   'skipped': 0 < self.skip_after <= entry.miss_streak,
+                                   'last_hit_at': entry.last_hit_at}
+                        for selector, entry in sorted(entries.items(), key=lambda item: -item[1].hits)
+                    },
+                }
+            return report
+
+    def save(self):
+        """Grava as estatísticas em memória no SQLite"""
+        with self._lock:
+            if not self._unsaved:
+                return
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO selector_cascades (cascade, attempts, misses, last_attempt_at) "
+                "VALUES (?, ?, ?, ?)",
+                [(cascade, state['attempts'], state['misses'], state['last_attempt_at'])
+                 for cascade, state in self._cascades.items()])
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO selector_streaks "
+                "(cascade, selector, hits, miss_streak, last_hit_at, first_seen_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(cascade, selector, entry.hits, entry.miss_streak, entry.last_hit_at, entry.first_seen_at)
+                 for cascade, entries in self._entries.items() for selector, entry in entries.items()])
+            self._conn.commit()
+            self._unsaved = 0
+
+    def close(self):
+        self.save()
+        with self._lock:
+            self._conn.close()
+
+
+_stats: Optional[SelectorStats] = None
+_stats_lock = threading.Lock()
+
+
+def selector_stats() -> Optional[SelectorStats]:
+    """Registro compartilhado do processo (None com SELECTOR_STATS=false)"""
+    global _stats
+    if not env_bool('SELECTOR_STATS', True):
+        return None
+    with _stats_lock:
+        if _stats is None:
+            _stats = SelectorStats()
+        return _stats
+
+
+@contextmanager
+def isolated_stats():
+    """Estatísticas descartáveis (em memória) dentro do bloco, sem tocar nas persistidas
+
+    Para reprocessamentos offline: as cascatas rodam inteiras e o resultado
+    não altera o que a próxima execução vai pular.
+    """
+    global _stats
+    with _stats_lock:
+        previous, _stats = _stats, SelectorStats(path=':memory:')
+    try:
+        yield _stats
+    finally:
+        with _stats_lock:
+            throwaway, _stats = _stats, previous
+        throwaway.close()
+
+
+def ordered(cascade: str, selectors: List[str]) -> List[str]:
+    """Seletores da cascata a testar (ordem original, sem os que vêm falhando)"""
+    stats = selector_stats()
+    return stats.order(cascade, selectors) if stats else selectors
+
+
+def record_hit(cascade: str, selector: Optional[str], tried: List[str], generic: Iterable[str] = ()):
+    """Registra o seletor vencedor da cascata (None = nenhum serviu) e os testados antes dele
+
+    generic são os fallbacks genéricos da cascata (ver SelectorStats.record).
+    """
+    stats = selector_stats()
+    if stats:
+        stats.record(cascade, selector, tried, generic)
+
+
+def save_selector_stats():
+    """Grava as estatísticas e relata os seletores que deixaram de funcionar (fim da execução)"""
+    stats = selector_stats()
+    if not stats:
+        return
+    stats.save()
+    for item in stats.stale():
+        logger.warning("Seletor %s da cascata %s não vence há %.1f dias", item['selector'],
+                       item['cascade'], item['days_since_hit'], extra=item)
+
+
+def main() -> int:
+    stats = SelectorStats()
+    print(json.dumps({'cascades': stats.report(), 'stale': stats.stale()}, ensure_ascii=False, indent=2))
+    stats.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,221 @@
+"""
+Envio das tips para a API (Session reutilizada, envio concorrente e em lote)
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .config import env_bool, env_int
+from .metrics import RETRIES, TIPS_SUBMITTED, timed
+from .outbox import batch_idempotency_key, idempotency_key, is_retryable
+from .rate_limit import limiter_for, retry_after_seconds
+
+
+logger = logging.getLogger(__name__)
+
+
+TIPS_API_URL = "https://sportstips-mu.vercel.app/api/tips"
+
+# Status que indicam que o endpoint não aceita uma lista de tips
+BULK_UNSUPPORTED_STATUS = (400, 404, 405, 413, 415, 422)
+
+
+@dataclass
+class SubmissionResult:
+    tip_id: str
+    ok: bool
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+
+
+def clean_tip(tip_data: Dict) -> Dict:
+    """Remove campos que não devem ser enviados"""
+    return {k: v for k, v in tip_data.items() if k != 'detail_url'}
+
+
+def build_api_session(pool_size: int) -> requests.Session:
+    """Session com keep-alive e pool do tamanho do limite de envios simultâneos"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(pool_size, 1))
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update({'Content-Type': 'application/json'})
+    return session
+
+
+class TipSubmitter:
+    """Envia tips com no máximo max_in_flight requisições simultâneas.
+
+    No modo bulk, envia listas de até batch_size tips em um único POST; se o
+    endpoint recusar listas, o lote é reenviado tip a tip. Com um outbox,
+    as falhas ficam guardadas para reenvio nas próximas execuções; o reenvio
+    roda em paralelo com a descoberta, mas os envios da execução esperam ele
+    terminar, para que uma versão antiga de uma tip nunca chegue à API depois
+    da nova.
+    """
+
+    def __init__(self, api_url: str = TIPS_API_URL, max_in_flight: Optional[int] = None,
+                 bulk: Optional[bool] = None, batch_size: Optional[int] = None,
+                 session: Optional[requests.Session] = None, timeout: int = 10,
+                 outbox=None, dedup=None):
+        self.api_url = api_url
+        self.max_in_flight = max_in_flight if max_in_flight is not None else env_int('API_MAX_IN_FLIGHT', 4)
+        self.bulk = bulk if bulk is not None else env_bool('API_BULK', False)
+        self.batch_size = batch_size if batch_size is not None else env_int('API_BATCH_SIZE', 50)
+        self.session = session or build_api_session(self.max_in_flight)
+        self.timeout = timeout
+        self.outbox = outbox
+        self.dedup = dedup
+        # Liberado (set) quando não há reenvio do outbox em andamento
+        self._replay_idle = threading.Event()
+        self._replay_idle.set()
+
+    def should_send(self, tip_data: Dict) -> bool:
+        """Consulta o índice de deduplicação (sem índice, sempre envia)"""
+        return self.dedup.should_send(tip_data) if self.dedup else True
+
+    def already_sent(self, tip_data: Dict) -> bool:
+        """Consulta só os envios persistidos (sem índice, nunca foi enviada)"""
+        return self.dedup.already_sent(tip_data) if self.dedup else False
+
+    def seen_in_run(self, tip_data: Dict) -> bool:
+        """True se esta execução já tem a partida (com conteúdo mais novo que o do outbox)"""
+        return self.dedup.seen_in_run(tip_data['id']) if self.dedup else False
+
+    def begin_replay(self):
+        """Marca o reenvio do outbox como em andamento (antes de iniciar a thread)"""
+        if self.outbox:
+            self._replay_idle.clear()
+
+    def replay_outbox(self) -> Tuple[int, int]:
+        """Reenvia as tips vencidas do outbox e libera os envios da execução ao terminar"""
+        try:
+            return self.outbox.replay(self) if self.outbox else (0, 0)
+        finally:
+            self._replay_idle.set()
+
+    @property
+    def replaying(self) -> bool:
+        return not self._replay_idle.is_set()
+
+    def wait_for_replay(self):
+        """Espera o reenvio do outbox (limitado por OUTBOX_REPLAY_BUDGET) terminar"""
+        self._replay_idle.wait()
+
+    def submit(self, tip_data: Dict) -> SubmissionResult:
+        """Envia uma tip e retorna o status (depois do reenvio do outbox)"""
+        self.wait_for_replay()
+        return self.send(tip_data)
+
+    def send(self, tip_data: Dict) -> SubmissionResult:
+        """Envia uma tip sem esperar o outbox (usado pelo próprio reenvio)"""
+        tip_id = tip_data.get('id')
+        key = idempotency_key(tip_data)
+        try:
+            with timed('send_to_api'), limiter_for(self.api_url).slot() as ticket:
+                response = self.session.post(self.api_url, json=clean_tip(tip_data),
+                                             headers={'Idempotency-Key': key}, timeout=self.timeout)
+                ticket.record(response.status_code,
+                              retry_after=retry_after_seconds(response.headers.get('Retry-After')))
+        except Exception as e:
+            logger.error("Erro na requisição para API: %s", e, extra={'tip_id': tip_id})
+            return self.record_result(tip_data, SubmissionResult(tip_id, False, error=str(e)))
+
+        if response.status_code in [200, 201]:
+            logger.info("Tip cadastrada com sucesso",
+                        extra={'tip_id': tip_id, 'status_code': response.status_code})
+            return self.record_result(tip_data, SubmissionResult(tip_id, True, response.status_code))
+
+        logger.error("Erro ao cadastrar tip: %d - %s", response.status_code, response.text[:500],
+                     extra={'tip_id': tip_id, 'status_code': response.status_code})
+        return self.record_result(tip_data, SubmissionResult(tip_id, False, response.status_code, response.text[:500]))
+
+    def record_result(self, tip_data: Dict, result: SubmissionResult) -> SubmissionResult:
+        """Atualiza o outbox e o índice de deduplicação com o resultado do envio"""
+        TIPS_SUBMITTED.inc(outcome='ok' if result.ok else 'error')
+        if self.dedup and result.ok:
+            self.dedup.mark_sent(tip_data)
+        if self.outbox:
+            key = idempotency_key(tip_data)
+            if result.ok:
+                self.outbox.mark_sent(key)
+            else:
+                error = result.error or f"HTTP {result.status_code}"
+                self.outbox.record_failure(key, tip_data, error, is_retryable(result.status_code))
+        return result
+
+    def submit_many(self, tips: List[Dict]) -> List[SubmissionResult]:
+        """Envia várias tips novas ou alteradas (ordem dos resultados = ordem das tips)"""
+        tips = [tip for tip in tips if self.should_send(tip)]
+        if not tips:
+            return []
+
+        if self.bulk:
+            batches = [tips[i:i + self.batch_size] for i in range(0, len(tips), self.batch_size)]
+            with ThreadPoolExecutor(max_workers=max(self.max_in_flight, 1)) as executor:
+                return [result for batch in executor.map(self.submit_batch, batches) for result in batch]
+
+        with ThreadPoolExecutor(max_workers=max(self.max_in_flight, 1)) as executor:
+            return list(executor.map(self.submit, tips))
+
+    def submit_batch(self, tips: List[Dict]) -> List[SubmissionResult]:
+        """Envia um lote em um único POST com status por tip"""
+        ids = [tip.get('id') for tip in tips]
+        self.wait_for_replay()
+        try:
+            with timed('send_batch'), limiter_for(self.api_url).slot() as ticket:
+                response = self.session.post(
+                    self.api_url, json=[clean_tip(tip) for tip in tips],
+                    headers={'Idempotency-Key': batch_idempotency_key(tips)}, timeout=self.timeout)
+                ticket.record(response.status_code,
+                              retry_after=retry_after_seconds(response.headers.get('Retry-After')))
+        except Exception as e:
+            logger.error("Erro no envio em lote (%d tips): %s", len(tips), e)
+            return [self.record_result(tip, SubmissionResult(tip_id, False, error=str(e)))
+                    for tip, tip_id in zip(tips, ids)]
+
+        if response.status_code in BULK_UNSUPPORTED_STATUS:
+            logger.warning("Endpoint recusou o lote (%d), enviando individualmente", response.status_code)
+            RETRIES.inc(len(tips), kind='bulk_fallback')
+            return [self.submit(tip) for tip in tips]
+
+        if response.status_code not in (200, 201, 207):
+            logger.error("Erro no envio em lote: %d - %s", response.status_code, response.text[:500])
+            return [self.record_result(tip, SubmissionResult(tip_id, False, response.status_code, response.text[:500]))
+                    for tip, tip_id in zip(tips, ids)]
+
+        results = [self.record_result(tip, result)
+                   for tip, result in zip(tips, self._parse_batch_response(response, ids))]
+        logger.info("Lote enviado: %d/%d tips cadastradas", sum(r.ok for r in results), len(results))
+        return results
+
+    def _parse_batch_response(self, response: requests.Response, ids: List[str]) -> List[SubmissionResult]:
+        """Lê o status por tip da resposta (lista alinhada às tips), se houver"""
+        try:
+            body = response.json()
+        except ValueError:
+            body = None
+
+        if isinstance(body, dict):
+            body = body.get('results')
+
+        if not isinstance(body, list) or len(body) != len(ids):
+            return [SubmissionResult(tip_id, True, response.status_code) for tip_id in ids]
+
+        results = []
+        for tip_id, item in zip(ids, body):
+            item = item if isinstance(item, dict) else {}
+            status = item.get('status', response.status_code)
+            ok = item.get('ok', isinstance(status, int) and 200 <= status < 300)
+            results.append(SubmissionResult(tip_id, bool(ok), status if isinstance(status, int) else None,
+                                            item.get('error')))
+        return results
+
+    def close(self):
+        self.session.close()
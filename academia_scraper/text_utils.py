@@ -3,82 +3,170 @@ Text extraction and processing utilities
 """
 
 import re
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
-
-
-def is_match_finished(text: str) -> bool:
-    """Verifica se a partida já terminou baseado no texto"""
+from typing import FrozenSet, List
+
+
+# Se contém "ao vivo" ou "live", definitivamente NÃO está terminada
+LIVE_KEYWORDS = ['ao vivo', 'live']
+
+# Palavras-chave que indicam que a partida já terminou ou foi adiada
+FINISHED_KEYWORDS = [
+    'terminado',
+    'finalizado',
+    'encerrado',
+    'finished',
+    'ended',
+    'adiado',
+    'adiada',
+    'postponed',
+    'cancelado',
+    'cancelada',
+    'cancelled',
+    'canceled',
+    'completed',
+    'ft',  # Full Time
+]
+
+FOOTBALL_KEYWORDS = ['futebol', 'football', 'soccer',
+                     'brasileirão', 'champions', 'liga', 'serie a', 'serie b']
+BASKETBALL_KEYWORDS = ['basquete', 'basketball', 'nba', 'euroleague']
+TENNIS_KEYWORDS = ['tênis', 'tennis',
+                   'wimbledon', 'roland garros', 'us open']
+
+LEAGUE_KEYWORDS = [
+    'brasileirão', 'serie a', 'serie b', 'champions', 'europa league',
+    'copa do brasil', 'libertadores', 'sul-americana', 'nba', 'euroleague'
+]
+
+# Palavras que NÃO são nomes de times e devem ser ignoradas
+IGNORE_WORDS = frozenset([
+    'previsão', 'previsao', 'terminado', 'finalizado', 'ao vivo',
+    'adiado', 'adiada', 'postponed', 'cancelado', 'cancelada',
+    'cancelled', 'canceled', 'encerrado',
+    'live', 'hoje', 'amanhã', 'amanha',
+    'preview', 'resultado', 'placar', 'transmissão', 'transmissao'
+])
+
+
+def _build_keyword_scanner():
+    """Monta uma única alternância com todas as palavras-chave.
+
+    Status (ao vivo/terminado) exige palavra inteira (aceitando plural), para
+    que 'ft' não case dentro de "draft" nem 'live' dentro de "Oliveira";
+    esporte e liga mantêm a busca por trecho, como antes. A confirmação de
+    palavra inteira só roda para os acertos de status, que são raros.
+    """
+    whole_word = set(LIVE_KEYWORDS + FINISHED_KEYWORDS)
+    keywords = whole_word | set(FOOTBALL_KEYWORDS + BASKETBALL_KEYWORDS
+                                + TENNIS_KEYWORDS + LEAGUE_KEYWORDS)
+
+    # Mais longas primeiro: na mesma posição vence a palavra mais específica
+    ordered = sorted(keywords, key=lambda keyword: (-len(keyword), keyword))
+    pattern = re.compile('|'.join(re.escape(keyword) for keyword in ordered))
+    whole_word_patterns = {
+        keyword: re.compile(rf'\b{re.escape(keyword)}s?\b') for keyword in whole_word
+    }
+    return pattern, whole_word_patterns
+
+
+_KEYWORD_PATTERN, _WHOLE_WORD_PATTERNS = _build_keyword_scanner()
+
+_LIVE_SET = frozenset(LIVE_KEYWORDS)
+_FINISHED_SET = frozenset(FINISHED_KEYWORDS)
+_FOOTBALL_SET = frozenset(FOOTBALL_KEYWORDS)
+_BASKETBALL_SET = frozenset(BASKETBALL_KEYWORDS)
+_TENNIS_SET = frozenset(TENNIS_KEYWORDS)
+
+_TIME_RE = re.compile(r'\d{1,2}:\d{2}')
+_SEPARATOR_RE = re.compile(r'\s+(?:vs\.?|versus)\s+', re.IGNORECASE)
+_TRAILING_SCORE_RE = re.compile(r'\s*\d+[\-\.\s:]*\d*[\.\s]*$')
+_SPECIAL_CHARS_RE = re.compile(r'[^\w\s-]')
+_TIME_PATTERNS = [
+    re.compile(r'\d{1,2}:\d{2}'),  # HH:MM
+    re.compile(r'\d{1,2}h\d{2}'),  # HHhMM
+    re.compile(r'\d{1,2}:\d{2}:\d{2}')  # HH:MM:SS
+]
+
+
+@dataclass
+class RowClassification:
+    finished: bool
+    category: str
+    league: str
+    teams: str
+
+
+def _scan_keywords(text: str) -> FrozenSet[str]:
+    """Todas as palavras-chave presentes no texto (uma passada)"""
     text_lower = text.lower()
-    
-    # Se contém "ao vivo" ou "live", definitivamente NÃO está terminada
-    if 'ao vivo' in text_lower or 'live' in text_lower:
-        return False
-    
-    # Palavras-chave que indicam que a partida já terminou ou foi adiada
-    finished_keywords = [
-        'terminado',
-        'finalizado',
-        'encerrado',
-        'finished',
-        'ended',
-        'adiado',
-        'adiada',
-        'postponed',
-        'cancelado',
-        'cancelada',
-        'cancelled',
-        'canceled',
-        'completed',
-        'ft',  # Full Time
-    ]
-    
-    # Verifica se contém alguma palavra-chave de partida terminada
-    for keyword in finished_keywords:
-        if keyword in text_lower:
-            return True
-    
-    return False
+    hits = set(_KEYWORD_PATTERN.findall(text_lower))
+    for keyword in hits & _WHOLE_WORD_PATTERNS.keys():
+        if not _WHOLE_WORD_PATTERNS[keyword].search(text_lower):
+            hits.discard(keyword)
+    return frozenset(hits)
 
 
-def determine_category(text: str) -> str:
-    """Determina a categoria do esporte baseada no texto"""
-    text_lower = text.lower()
+def _finished_from_hits(hits: FrozenSet[str]) -> bool:
+    if hits & _LIVE_SET:
+        return False
+    return bool(hits & _FINISHED_SET)
 
-    football_keywords = ['futebol', 'football', 'soccer',
-                         'brasileirão', 'champions', 'liga', 'serie a', 'serie b']
-    basketball_keywords = ['basquete', 'basketball', 'nba', 'euroleague']
-    tennis_keywords = ['tênis', 'tennis',
-                       'wimbledon', 'roland garros', 'us open']
 
-    if any(word in text_lower for word in football_keywords):
+def _category_from_hits(hits: FrozenSet[str]) -> str:
+    if hits & _FOOTBALL_SET:
         return 'football'
-    elif any(word in text_lower for word in basketball_keywords):
+    elif hits & _BASKETBALL_SET:
         return 'basketball'
-    elif any(word in text_lower for word in tennis_keywords):
+    elif hits & _TENNIS_SET:
         return 'tennis'
     else:
         return 'football'  # Default
 
 
+def _league_from_hits(hits: FrozenSet[str]) -> str:
+    for keyword in LEAGUE_KEYWORDS:
+        if keyword in hits:
+            return keyword.title()
+    return 'Liga não identificada'
+
+
+def is_match_finished(text: str) -> bool:
+    """Verifica se a partida já terminou baseado no texto"""
+    return _finished_from_hits(_scan_keywords(text))
+
+
+def determine_category(text: str) -> str:
+    """Determina a categoria do esporte baseada no texto"""
+    return _category_from_hits(_scan_keywords(text))
+
+
+def classify_row(text: str) -> RowClassification:
+    """Classifica uma linha da listagem (status, esporte, liga e times) de uma vez"""
+    hits = _scan_keywords(text)
+    return RowClassification(
+        finished=_finished_from_hits(hits),
+        category=_category_from_hits(hits),
+        league=_league_from_hits(hits),
+        teams=extract_teams_from_text(text),
+    )
+
+
+def classify_rows(texts: List[str]) -> List[RowClassification]:
+    """Classifica várias linhas da listagem"""
+    return [classify_row(text) for text in texts]
+
+
 def extract_teams_from_text(text: str) -> str:
     """Extrai nomes dos times do texto"""
-    # Palavras que NÃO são nomes de times e devem ser ignoradas
-    ignore_words = [
-        'previsão', 'previsao', 'terminado', 'finalizado', 'ao vivo', 
-        'adiado', 'adiada', 'postponed', 'cancelado', 'cancelada', 
-        'cancelled', 'canceled', 'encerrado',
-        'live', 'hoje', 'amanhã', 'amanha',
-        'preview', 'resultado', 'placar', 'transmissão', 'transmissao'
-    ]
+    ignore_words = IGNORE_WORDS
     
     # Remove horários (formato HH:MM)
-    clean_text = re.sub(r'\d{1,2}:\d{2}', '', text)
+    clean_text = _TIME_RE.sub('', text)
     
     # Procura pelo separador "vs" ou "versus" (case insensitive)
-    # Tenta diferentes padrões de separadores
-    separator_pattern = r'\s+(?:vs\.?|versus)\s+'
-    parts = re.split(separator_pattern, clean_text, flags=re.IGNORECASE)
+    parts = _SEPARATOR_RE.split(clean_text)
     
     if len(parts) >= 2:
         # Encontrou o separador, extrai os dois times
@@ -91,10 +179,10 @@ def extract_teams_from_text(text: str) -> str:
             team_text = ' '.join(team_text.split())
             
             # Remove placares e números no final (ex: "2-1", "3...", "1-", etc)
-            team_text = re.sub(r'\s*\d+[\-\.\s:]*\d*[\.\s]*$', '', team_text)
+            team_text = _TRAILING_SCORE_RE.sub('', team_text)
             
             # Remove caracteres especiais mantendo apenas letras, números e hífens
-            team_text = re.sub(r'[^\w\s-]', ' ', team_text)
+            team_text = _SPECIAL_CHARS_RE.sub(' ', team_text)
             
             # Divide em palavras
             words = team_text.split()
@@ -115,7 +203,7 @@ def extract_teams_from_text(text: str) -> str:
     
     # Fallback: método antigo se não encontrar "vs"
     # Remove caracteres especiais e números
-    clean_text = re.sub(r'[^\w\s-]', ' ', clean_text)
+    clean_text = _SPECIAL_CHARS_RE.sub(' ', clean_text)
     
     # Filtra palavras válidas (maiores que 2 caracteres e não estão na lista de ignorar)
     words = [
@@ -133,35 +221,24 @@ def extract_teams_from_text(text: str) -> str:
     return "Times não identificados"
 
 
-def extract_time_from_text(text: str) -> str:
-    """Extrai horário do texto"""
-    # Procura por padrões de horário
-    time_patterns = [
-        r'\d{1,2}:\d{2}',  # HH:MM
-        r'\d{1,2}h\d{2}',  # HHhMM
-        r'\d{1,2}:\d{2}:\d{2}'  # HH:MM:SS
-    ]
+def extract_time_from_text(text: str, fallback_to_now: bool = True) -> str:
+    """Extrai horário do texto
 
-    for pattern in time_patterns:
-        match = re.search(pattern, text)
+    Sem horário no texto, retorna o horário atual (ou '' com
+    fallback_to_now=False).
+    """
+    # Procura por padrões de horário
+    for pattern in _TIME_PATTERNS:
+        match = pattern.search(text)
         if match:
             return match.group().replace('h', ':')
 
+    if not fallback_to_now:
+        return ''
     # Se não encontrar, retorna horário atual
     return datetime.now().strftime("%H:%M")
 
 
 def extract_league_from_text(text: str) -> str:
     """Extrai liga do texto"""
-    league_keywords = [
-        'brasileirão', 'serie a', 'serie b', 'champions', 'europa league',
-        'copa do brasil', 'libertadores', 'sul-americana', 'nba', 'euroleague'
-    ]
-
-    text_lower = text.lower()
-    for keyword in league_keywords:
-        if keyword in text_lower:
-            return keyword.title()
-
-    return 'Liga não identificada'
-
+    return _league_from_hits(_scan_keywords(text))
@@ -0,0 +1,189 @@
+"""
+Watchdog de memória do Chrome: reciclagem de sessões e limpeza de órfãos
+
+Cada sessão (chromedriver + Chrome + renderers) conta as páginas que
+carregou; passando de SESSION_MAX_PAGES páginas ou de SESSION_MAX_RSS_MB de
+memória residente, ela é trocada por uma nova entre duas páginas, nunca no
+meio de uma. Assim uma execução longa termina em vez de ser morta pelo OOM
+do container (limite de 1G no docker-compose).
+
+Processos do Chrome deixados por uma execução que caiu (reparentados para
+o PID 1) são encerrados antes de abrir novas sessões: além da memória, eles
+seguram o diretório de perfil que a nova sessão vai usar. Quando o scraper
+é o próprio PID 1 (modo daemon no Docker), os órfãos são filhos dele: só
+as sessões ainda em uso ficam de fora, e só os PIDs encerrados são
+recolhidos (os filhos do subprocess/chromedriver continuam com o status
+de saída deles).
+"""
+
+import logging
+import os
+import signal
+import time
+from typing import Iterable, List, Optional
+
+from .config import env_bool, env_int
+from .metrics import REGISTRY
+from .procfs import descendants, parent_map, read_cmdline, read_rss_bytes, read_state
+
+
+logger = logging.getLogger(__name__)
+
+SESSION_RECYCLES = REGISTRY.counter(
+    'scraper_session_recycles_total', 'Sessões do Chrome trocadas pelo watchdog por motivo', ('reason',))
+ORPHANS_REAPED = REGISTRY.counter(
+    'scraper_orphan_processes_reaped_total', 'Processos do Chrome órfãos encerrados')
+
+# Nomes (comm) dos processos que o scraper cria
+BROWSER_PROCESS_NAMES = ('chromedriver', 'chrome', 'chromium', 'chromium-browser', 'headless_shell')
+
+# O Chrome iniciado pelo chromedriver sempre recebe estas flags
+AUTOMATION_FLAGS = ('--enable-automation', '--remote-debugging-port')
+
+
+def driver_pid(driver) -> Optional[int]:
+    """PID do chromedriver de uma sessão (None se indisponível)"""
+    try:
+        return driver.service.process.pid
+    except AttributeError:
+        return None
+
+
+def session_rss_bytes(driver) -> int:
+    """Memória residente do chromedriver e de todos os processos do Chrome dele"""
+    pid = driver_pid(driver)
+    if not pid:
+        return 0
+    return read_rss_bytes(pid) + sum(read_rss_bytes(child) for child in descendants(pid))
+
+
+class SessionWatchdog:
+    """Decide quando uma sessão deve ser reciclada (páginas ou memória)"""
+
+    def __init__(self, max_pages: Optional[int] = None, max_rss_mb: Optional[int] = None,
+                 rss_check_every: int = 5):
+        self.max_pages = max_pages if max_pages is not None else env_int('SESSION_MAX_PAGES', 100)
+        self.max_rss_bytes = (max_rss_mb if max_rss_mb is not None else env_int('SESSION_MAX_RSS_MB', 500)) \
+            * 1024 * 1024
+        # Ler o /proc a cada página seria desperdício: a memória cresce devagar
+        self.rss_check_every = max(rss_check_every, 1)
+
+    def note_page(self, driver):
+        """Conta uma página carregada pela sessão"""
+        driver._pages_loaded = getattr(driver, '_pages_loaded', 0) + 1
+
+    def recycle_reason(self, driver) -> Optional[str]:
+        """'pages' ou 'rss' se a sessão deve ser trocada, None caso contrário"""
+        pages = getattr(driver, '_pages_loaded', 0)
+        if not pages:
+            return None
+        if self.max_pages > 0 and pages >= self.max_pages:
+            return 'pages'
+        if self.max_rss_bytes > 0 and pages % self.rss_check_every == 0:
+            rss = session_rss_bytes(driver)
+            if rss > self.max_rss_bytes:
+                logger.info("Sessão do Chrome com %.0f MB após %d páginas", rss / 1024 / 1024, pages,
+                            extra={'rss_bytes': rss, 'pages': pages})
+                return 'rss'
+        return None
+
+
+def recycle_session(driver, factory, reason: str):
+    """Abre uma sessão nova e só então encerra a antiga (mantém a antiga se falhar)"""
+    from .browser import quit_driver
+
+    try:
+        replacement = factory()
+    except Exception as e:
+        logger.error("Falha ao reciclar sessão do Chrome (%s): %s", reason, e)
+        return driver
+    logger.info("Sessão do Chrome reciclada (%s) após %d páginas", reason,
+                getattr(driver, '_pages_loaded', 0), extra={'reason': reason})
+    quit_driver(driver)
+    SESSION_RECYCLES.inc(reason=reason)
+    return replacement
+
+
+def reap_orphans_enabled() -> bool:
+    # Padrão ligado só no Docker: numa máquina de desenvolvimento pode haver
+    # outros Chromes automatizados que não são do scraper
+    return env_bool('REAP_ORPHANS', bool(os.getenv('CHROMEDRIVER_PATH')))
+
+
+def find_orphans(keep: Iterable[int] = ()) -> List[int]:
+    """chromedriver/Chrome automatizados cujo pai morreu (reparentados para o PID 1)
+
+    keep são os PIDs dos chromedrivers das sessões em uso: eles e seus
+    descendentes nunca são órfãos. Como PID 1, os órfãos são filhos do
+    próprio scraper e só keep os distingue das sessões vivas.
+    """
+    me = os.getpid()
+    parents = parent_map()
+    kept = {pid for session in keep for pid in [session] + descendants(session)}
+    if me != 1:
+        kept.update(descendants(me))
+    orphans = []
+    for pid, ppid in parents.items():
+        if ppid != 1 or pid in kept or pid == me:
+            continue
+        try:
+            with open(f'/proc/{pid}/comm', encoding='utf-8', errors='ignore') as f:
+                name = f.read().strip()
+        except OSError:
+            continue
+        if name not in BROWSER_PROCESS_NAMES:
+            continue
+        # Um zumbi não tem mais linha de comando: o nome basta
+        if name != 'chromedriver' and read_state(pid) != 'Z' \
+                and not any(arg.startswith(AUTOMATION_FLAGS) for arg in read_cmdline(pid)):
+            continue
+        orphans.append(pid)
+    return orphans
+
+
+def _signal_all(pids: List[int], sig: int):
+    for pid in pids:
+        try:
+            os.kill(pid, sig)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+
+def reap_zombies(pids: Iterable[int]):
+    """Recolhe, entre os pids, os que são filhos deste processo e já terminaram
+
+    Só acontece como PID 1 (órfãos reparentados para o scraper). Nunca usa
+    waitpid(-1): o status de saída dos outros filhos é de quem os criou.
+    """
+    for pid in pids:
+        try:
+            os.waitpid(pid, os.WNOHANG)
+        except ChildProcessError:
+            continue
+
+
+def reap_orphans(grace: float = 3.0, keep: Iterable[int] = ()) -> int:
+    """Encerra os Chromes órfãos (e seus filhos); retorna quantos processos foram encerrados
+
+    keep são os PIDs dos chromedrivers das sessões em uso (ver find_orphans).
+    """
+    if not reap_orphans_enabled():
+        return 0
+    orphans = find_orphans(keep)
+    if not orphans:
+        return 0
+
+    targets = sorted({pid for orphan in orphans for pid in [orphan] + descendants(orphan)})
+    logger.warning("Encerrando %d processos do Chrome deixados por uma execução anterior", len(targets),
+                   extra={'pids': targets})
+    _signal_all(targets, signal.SIGTERM)
+    deadline = time.monotonic() + grace
+    while time.monotonic() < deadline:
+        reap_zombies(targets)
+        if not any(os.path.exists(f'/proc/{pid}') for pid in targets):
+            break
+        time.sleep(0.1)
+    _signal_all([pid for pid in targets if os.path.exists(f'/proc/{pid}')], signal.SIGKILL)
+    reap_zombies(targets)
+    ORPHANS_REAPED.inc(len(targets))
+    return len(targets)
@@ -7,14 +7,23 @@ Este arquivo é o ponto de entrada do scraper.
 O código foi refatorado e organizado em módulos separados.
 """
 
+import asyncio
+import logging
 import os
+import sys
 from academia_scraper import AcademiaScraperImproved
+from academia_scraper.daemon import ScraperDaemon
+from academia_scraper.logging_setup import setup_logging
+
+
+logger = logging.getLogger("academia_scraper.main")
 
 
 def main():
     """Função principal"""
-    print("🤖 Robô Academia das Apostas Brasil - Versão Melhorada")
-    print("=" * 60)
+    # Logs em JSON (LOG_LEVEL, LOG_FORMAT, LOG_FILE...) escritos por uma thread própria
+    setup_logging()
+    logger.info("Robô Academia das Apostas Brasil - Versão Melhorada")
 
     # Configurações
     # Verifica se API_URL foi definida como variável de ambiente (Docker)
@@ -33,8 +42,18 @@ def main():
     if not api_url:
         api_url = "http://localhost:3000"
 
-    print(f"🌐 API configurada para: {api_url}")
-    print("")
+    logger.info("API configurada para: %s", api_url)
+
+    # Modo daemon: processo contínuo com o Chrome aquecido e agendador interno
+    if '--daemon' in sys.argv[1:] or os.getenv('SCRAPER_MODE', 'cron') == 'daemon':
+        ScraperDaemon(lambda: AcademiaScraperImproved(api_url)).run_forever()
+        return
+
+    # Motor assíncrono sem navegador (só HTML estático, sem fallback para o Selenium)
+    if os.getenv('SCRAPER_ENGINE', 'selenium') == 'async':
+        from academia_scraper.async_engine import AsyncAcademiaScraper
+        asyncio.run(AsyncAcademiaScraper(api_url).run())
+        return
 
     # Executa o scraper
     scraper = AcademiaScraperImproved(api_url)
@@ -0,0 +1,298 @@
+"""
+Benchmarks offline do scraper (fixtures gravadas + site local)
+
+Mede cada etapa isoladamente, sem depender do site real:
+  - text_utils: classificação das linhas da página principal
+  - listing: parse da tabela inteira a partir do outerHTML (caminho em lote)
+  - extract_*: regras de extraction.py sobre o HTML estático (lxml) e sobre
+    um snapshot (como o execute_script em lote do Selenium)
+  - rate_limit: custo de um slot do HostLimiter (o limite fica desligado
+    nas demais etapas)
+  - http_details: HttpDetailFetcher contra o site local
+  - submit: TipSubmitter contra o /api/tips local
+  - com --selenium: get_main_page_data, get_match_details e os
+    extract_*_from_page do scraper usando o Chrome
+
+Os resultados (p50/p95 em ms e páginas/s) são salvos em JSON com o commit
+atual; --compare aponta regressões em relação a um resultado anterior.
+
+Uso:
+    python benchmarks/run_benchmarks.py --rows 50 --latency-ms 50 --output bench.json
+    python benchmarks/run_benchmarks.py --compare bench.json --max-regression 0.15
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urljoin
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from stand_in_site import StandInSite, load_fixture  # noqa: E402
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Percentil por posição (nearest-rank) de uma lista de amostras"""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def summarize(samples: List[float], pages: int = 0) -> Dict:
+    """Resumo de uma etapa (tempos em ms; páginas/s quando a etapa processa páginas)"""
+    total = sum(samples)
+    summary = {
+        'runs': len(samples),
+        'p50_ms': round(percentile(samples, 50) * 1000, 3),
+        'p95_ms': round(percentile(samples, 95) * 1000, 3),
+        'mean_ms': round(total / len(samples) * 1000, 3),
+    }
+    if pages and total > 0:
+        summary['pages_per_s'] = round(pages / total, 2)
+    return summary
+
+
+def measure(func: Callable, iterations: int, quiet: bool = True) -> List[float]:
+    """Executa func `iterations` vezes e retorna a duração de cada execução (s)"""
+    samples = []
+    for _ in range(iterations):
+        sink = io.StringIO() if quiet else None
+        with contextlib.redirect_stdout(sink) if quiet else contextlib.nullcontext():
+            start = time.perf_counter()
+            func()
+            samples.append(time.perf_counter() - start)
+    return samples
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+
+def listing_rows(html: str, base_url: str):
+    """(texto, link) de cada linha da tabela, como o scraper as enxerga"""
+    from academia_scraper.http_engine import LxmlPage, element_text
+
+    page = LxmlPage(html)
+    rows = []
+    for tr in page.select('.livescores tbody tr'):
+        text = ' '.join(element_text(td) for td in tr.findall('td'))
+        links = [a.get('href') for a in tr.iter('a') if a.get('href')]
+        rows.append((text, urljoin(base_url, links[0]) if links else None))
+    return rows
+
+
+def bench_text_utils(rows, iterations: int) -> Dict:
+    from academia_scraper import text_utils
+
+    texts = [text for text, _ in rows]
+    stages = {}
+    for name in ('classify_row', 'is_match_finished', 'determine_category',
+                 'extract_teams_from_text', 'extract_time_from_text', 'extract_league_from_text'):
+        func = getattr(text_utils, name)
+        samples = measure(lambda: [func(text) for text in texts], iterations)
+        stages[f'text_utils.{name}'] = summarize(samples)
+    return stages
+
+
+def bench_listing(site: StandInSite, iterations: int) -> Dict:
+    import lxml.html
+    from academia_scraper.http_engine import LxmlPage
+    from academia_scraper.listing import parse_table_html
+
+    # O mesmo outerHTML que o scraper pede ao Chrome em uma única chamada
+    tbody = LxmlPage(site.main_page).select('.livescores tbody')[0]
+    table_html = lxml.html.tostring(tbody, encoding='unicode')
+    samples = measure(lambda: parse_table_html(table_html, len(tbody), site.base_url), iterations)
+    return {'listing.parse_table_html': summarize(samples, iterations)}
+
+
+def bench_extraction(iterations: int) -> Dict:
+    from academia_scraper import extraction
+    from academia_scraper.http_engine import LxmlPage
+
+    html = load_fixture('detail_page.html').encode('utf-8')
+    page = LxmlPage(html)
+    stages = {
+        'extract.lxml_parse': summarize(measure(lambda: LxmlPage(html), iterations), iterations),
+    }
+    for name in ('extract_odds', 'extract_description', 'extract_prediction',
+                 'extract_league', 'check_premium', 'extract_details'):
+        func = getattr(extraction, name)
+        stages[f'extract.lxml.{name}'] = summarize(measure(lambda: func(page), iterations))
+
+    # Snapshot equivalente ao que o BATCH_SNAPSHOT_SCRIPT devolve no Chrome
+    texts = {selector: [page.text(el) for el in page.select(selector)][:extraction.SNAPSHOT_MAX_ELEMENTS]
+             for selector in extraction.DETAIL_SELECTORS}
+    snapshot = extraction.SnapshotPage(texts)
+    stages['extract.snapshot.extract_details'] = summarize(
+        measure(lambda: extraction.extract_details(snapshot), iterations))
+    return stages
+
+
+def bench_rate_limit(iterations: int) -> Dict:
+    from academia_scraper.rate_limit import HostLimiter
+
+    # Bucket que nunca esvazia: mede só a contabilidade do slot (lock, AIMD, métricas)
+    limiter = HostLimiter('bench.local', rate=1e9, burst=1e9, initial=4, min_limit=1,
+                          max_limit=16, latency_target=5.0)
+
+    def slots():
+        for _ in range(100):
+            with limiter.slot() as ticket:
+                ticket.record(200)
+
+    return {'rate_limit.slot': summarize(measure(slots, iterations))}
+
+
+def bench_http(site: StandInSite, rows, iterations: int) -> Dict:
+    from academia_scraper.http_engine import HttpDetailFetcher
+
+    urls = [url for _, url in rows if url]
+    fetcher = HttpDetailFetcher()
+    try:
+        samples = measure(lambda: [fetcher.get_match_details(url) for url in urls], iterations)
+    finally:
+        fetcher.close()
+    return {'http_details.get_match_details': summarize(samples, len(urls) * iterations)}
+
+
+def bench_submit(site: StandInSite, rows, iterations: int) -> Dict:
+    from academia_scraper.submission import TipSubmitter
+
+    tips = [{'id': f'match_bench{i:04d}', 'teams': text, 'detail_url': url}
+            for i, (text, url) in enumerate(rows)]
+    stages = {}
+    for mode, bulk in (('single', False), ('bulk', True)):
+        submitter = TipSubmitter(api_url=site.api_url, bulk=bulk)
+        try:
+            samples = measure(lambda: submitter.submit_many(tips), iterations)
+        finally:
+            submitter.close()
+        stages[f'submit.{mode}'] = summarize(samples, len(tips) * iterations)
+    return stages
+
+
+def bench_selenium(site: StandInSite, rows, iterations: int, detail_engine: str) -> Dict:
+    # Sem estado persistente: cada execução mede o trabalho completo
+    os.environ.update({'OUTBOX': 'false', 'DEDUP': 'false', 'DETAIL_CACHE': 'false',
+                       'PAGE_REVALIDATION': 'false', 'DATA_DIR': tempfile.mkdtemp(prefix='bench-')})
+    from academia_scraper import AcademiaScraperImproved
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        scraper = AcademiaScraperImproved(max_matches=len(rows), detail_engine=detail_engine,
+                                          main_page_url=site.base_url)
+        startup = time.perf_counter() - start
+
+    stages = {'selenium.setup_driver': summarize([startup])}
+    try:
+        main_pages = measure(scraper.get_main_page_data, iterations)
+        stages['selenium.get_main_page_data'] = summarize(main_pages, iterations)
+
+        url = next(url for _, url in rows if url)
+        stages[f'selenium.get_match_details[{detail_engine}]'] = summarize(
+            measure(lambda: scraper.get_match_details(url), iterations), iterations)
+
+        scraper.driver.get(url)
+        for name in ('extract_odds_from_page', 'extract_description_from_page',
+                     'extract_prediction_from_page', 'extract_league_from_page', 'check_if_premium'):
+            func = getattr(scraper, name)
+            stages[f'selenium.{name}'] = summarize(measure(func, iterations))
+    finally:
+        with contextlib.redirect_stdout(io.StringIO()):
+            scraper.close()
+    return stages
+
+
+def compare(results: Dict, baseline_path: str, max_regression: float) -> bool:
+    """Compara o p50 de cada etapa com um resultado anterior; retorna False se houver regressão"""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    print(f"\n📊 Comparação com {baseline.get('commit') or baseline_path}:")
+    ok = True
+    for stage, summary in results['stages'].items():
+        previous = baseline.get('stages', {}).get(stage)
+        if not previous or not previous.get('p50_ms'):
+            print(f"   {stage:<55} (novo)")
+            continue
+        change = summary['p50_ms'] / previous['p50_ms'] - 1
+        flag = '❌' if change > max_regression else '✅'
+        ok = ok and change <= max_regression
+        print(f"   {flag} {stage:<53} {previous['p50_ms']:>10.3f} -> {summary['p50_ms']:>10.3f} ms ({change:+.1%})")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks offline do scraper")
+    parser.add_argument('--rows', type=int, default=12, help="Linhas na página principal do site local")
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--latency-ms', type=float, default=0.0, help="Latência simulada por resposta")
+    parser.add_argument('--selenium', action='store_true', help="Inclui as etapas com o Chrome")
+    parser.add_argument('--detail-engine', default='http', choices=('http', 'selenium'))
+    parser.add_argument('--output', help="Arquivo JSON para salvar os resultados")
+    parser.add_argument('--compare', help="JSON de uma execução anterior para comparar")
+    parser.add_argument('--max-regression', type=float, default=0.10,
+                        help="Aumento máximo tolerado do p50 (fração) no --compare")
+    args = parser.parse_args()
+
+    # Resultados reproduzíveis: nada de estado persistente de execuções anteriores
+    # (estatísticas de seletores, caches) nem gravações dentro dos laços medidos.
+    # Sem limite por host: as etapas mediriam o time.sleep do token bucket
+    # (o custo do próprio limiter é a etapa rate_limit.slot)
+    os.environ.update({'SELECTOR_STATS': 'false', 'RATE_LIMIT': 'false',
+                       'DATA_DIR': tempfile.mkdtemp(prefix='bench-')})
+
+    site = StandInSite(rows=args.rows, latency_ms=args.latency_ms).start()
+    try:
+        rows = listing_rows(site.main_page.decode('utf-8'), site.base_url)
+        stages = {}
+        stages.update(bench_text_utils(rows, args.iterations))
+        stages.update(bench_listing(site, args.iterations))
+        stages.update(bench_extraction(args.iterations))
+        stages.update(bench_rate_limit(args.iterations))
+        stages.update(bench_http(site, rows, max(1, args.iterations // 4)))
+        stages.update(bench_submit(site, rows, max(1, args.iterations // 4)))
+        if args.selenium:
+            stages.update(bench_selenium(site, rows, max(1, args.iterations // 4), args.detail_engine))
+    finally:
+        site.close()
+
+    results = {
+        'commit': git_commit(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'config': {'rows': args.rows, 'iterations': args.iterations,
+                   'latency_ms': args.latency_ms, 'selenium': args.selenium,
+                   'detail_engine': args.detail_engine},
+        'stages': stages,
+    }
+
+    print(f"⏱️  Benchmarks @ {results['commit'] or 'sem commit'}")
+    for stage, summary in stages.items():
+        rate = f"  {summary['pages_per_s']:>8.2f} pág/s" if 'pages_per_s' in summary else ''
+        print(f"   {stage:<55} p50 {summary['p50_ms']:>10.3f} ms  p95 {summary['p95_ms']:>10.3f} ms{rate}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"💾 Resultados salvos em {args.output}")
+
+    if args.compare and not compare(results, args.compare, args.max_regression):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Site local que imita a Academia das Apostas a partir das fixtures gravadas
+
+Serve a página principal (com quantas linhas forem pedidas), as páginas de
+detalhes e um endpoint /api/tips que aceita tips individuais ou em lote. A
+latência de cada resposta é configurável para simular a rede.
+
+Uso direto:
+    python benchmarks/stand_in_site.py --port 8765 --rows 50 --latency-ms 80
+"""
+
+import argparse
+import json
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+_TBODY_RE = re.compile(r'(<tbody>)(.*?)(</tbody>)', re.S)
+_ROW_RE = re.compile(r'<tr\b.*?</tr>', re.S)
+_MATCH_ID_RE = re.compile(r'/(\d+)"')
+
+
+def load_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as f:
+        return f.read()
+
+
+def build_main_page(rows: int) -> str:
+    """Página principal com `rows` linhas (repete as linhas gravadas com IDs únicos)"""
+    html = load_fixture('main_page.html')
+    match = _TBODY_RE.search(html)
+    recorded = _ROW_RE.findall(match.group(2))
+
+    generated = []
+    for i in range(rows):
+        row = recorded[i % len(recorded)]
+        # Cada cópia aponta para uma página de detalhes diferente
+        generated.append(_MATCH_ID_RE.sub(lambda m: f'/{int(m.group(1)) + i}"', row, count=1))
+
+    body = '\n            '.join(generated)
+    return html[:match.start(2)] + '\n            ' + body + '\n          ' + html[match.end(2):]
+
+
+class StandInSite:
+    """Servidor HTTP em thread com as fixtures de benchmark"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, rows: int = 12,
+                 latency_ms: float = 0.0):
+        self.latency = latency_ms / 1000.0
+        self.main_page = build_main_page(rows).encode('utf-8')
+        self.detail_page = load_fixture('detail_page.html').encode('utf-8')
+        self.tips_received = 0
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self._handler_class())
+        self.server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    @property
+    def api_url(self) -> str:
+        return self.base_url + 'api/tips'
+
+    def _handler_class(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Cabeçalho e corpo saem em writes separados; sem isso o keep-alive
+            # soma ~40 ms de ACK atrasado a cada resposta
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def _reply(self, status: int, body: bytes, content_type: str):
+                if site.latency:
+                    time.sleep(site.latency)
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                path = self.path.split('?')[0]
+                if path in ('/', '/index.html'):
+                    self._reply(200, site.main_page, 'text/html; charset=utf-8')
+                elif path.startswith('/stats/match/'):
+                    self._reply(200, site.detail_page, 'text/html; charset=utf-8')
+                else:
+                    self._reply(404, b'', 'text/plain')
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                payload = json.loads(self.rfile.read(length) or b'null')
+                if self.path != '/api/tips':
+                    self._reply(404, b'', 'text/plain')
+                    return
+
+                tips = payload if isinstance(payload, list) else [payload]
+                with site._lock:
+                    site.tips_received += len(tips)
+                if isinstance(payload, list):
+                    body = json.dumps({'results': [{'ok': True, 'status': 201} for _ in tips]})
+                    self._reply(207, body.encode('utf-8'), 'application/json')
+                else:
+                    self._reply(201, b'{"ok": true}', 'application/json')
+
+        return Handler
+
+    def start(self) -> 'StandInSite':
+        self._thread = threading.Thread(target=self.server.serve_forever, name="stand-in-site",
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Site local com as fixtures de benchmark")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--rows', type=int, default=12)
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    args = parser.parse_args()
+
+    site = StandInSite(args.host, args.port, args.rows, args.latency_ms).start()
+    print(f"🧪 Site de testes em {site.base_url} (API em {site.api_url})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        site.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,7 @@
 set -e
 
 echo "🚀 Iniciando Academia Scraper com agendamento automático..."
-echo "⏰ O scraper será executado todos os dias às 00:01"
+echo "⏰ O scraper será executado todos os dias às 06:00"
 echo "📍 Horário do container: $(date)"
 echo "🌐 API configurada: $API_URL"
 echo ""
@@ -15,6 +15,14 @@ echo ""
 # Cria diretórios necessários
 mkdir -p /app/logs /app/data
 
+# Modo daemon: um único processo Python com o Chrome aquecido e agendador
+# interno (DAEMON_SCHEDULES); o RUN_ON_START é tratado pelo próprio daemon
+if [ "$SCRAPER_MODE" = "daemon" ]; then
+    echo "♻️  Modo daemon: agendas ${DAEMON_SCHEDULES:-full=06:00}"
+    cd /app
+    exec /usr/local/bin/python3 academia_scraper_improved.py --daemon
+fi
+
 # Substitui a variável API_URL no arquivo Python não é necessário,
 # pois já está sendo passada como variável de ambiente
 
@@ -30,15 +38,16 @@ if [ "$RUN_ON_START" = "true" ]; then
     echo ""
 fi
 
-# Cria o arquivo de log se não existir
-touch /app/logs/cron.log
+# Cria os arquivos de log se não existirem
+touch /app/logs/cron.log /app/logs/scraper.log
 
 # Inicia o cron em foreground (para o container não finalizar)
 echo "✅ Cron iniciado! Container em execução..."
-echo "📊 Logs serão salvos em: /app/logs/cron.log"
+echo "📊 Logs serão salvos em: /app/logs/scraper.log (JSON, com rotação) e /app/logs/cron.log"
 echo "💡 Para ver os logs: docker-compose logs -f scraper"
 echo ""
 
 # Inicia o cron e mantém o container rodando
-cron && tail -f /app/logs/cron.log
+# (-F acompanha o scraper.log mesmo depois da rotação)
+cron && tail -F /app/logs/cron.log /app/logs/scraper.log
 
@@ -32,7 +32,7 @@ pip install --upgrade pip
 # Instala dependências
 echo "📦 Instalando dependências Python..."
 pip install selenium requests beautifulsoup4 webdriver-manager flask
-pip install --upgrade lxml
+pip install --upgrade lxml cssselect
 
 # Instala ChromeDriver usando webdriver-manager
 echo "🌐 Configurando ChromeDriver..."
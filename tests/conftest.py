@@ -0,0 +1,11 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_env(tmp_path, monkeypatch):
+    """Dados em um diretório temporário e sem os recursos globais do processo"""
+    monkeypatch.setenv('DATA_DIR', str(tmp_path))
+    monkeypatch.setenv('SELECTOR_STATS', 'false')
+    monkeypatch.setenv('RATE_LIMIT', 'false')
+    monkeypatch.setenv('LEAN_BROWSING', 'false')
+    monkeypatch.delenv('LISTING_URLS', raising=False)
@@ -0,0 +1,112 @@
+"""
+Dublês do Selenium e do requests para os testes (sem Chrome nem rede)
+"""
+
+from typing import Dict, Optional
+
+from selenium.webdriver.common.by import By
+
+from academia_scraper.revalidation import PageRevalidator
+from academia_scraper.scraper import AcademiaScraperImproved
+from academia_scraper.watchdog import SessionWatchdog
+
+
+def listing_table(*rows) -> str:
+    """tbody de uma listagem com linhas (hora, casa, fora, liga, id da partida)"""
+    cells = ''.join(
+        f'<tr><td class="hour">{hour}</td><td class="team-a">{home}</td>'
+        f'<td class="score"><a href="/stats/match/x/{match_id}">vs</a></td>'
+        f'<td class="team-b">{away}</td><td class="league">{league}</td></tr>'
+        for hour, home, away, league, match_id in rows)
+    return f'<tbody>{cells}</tbody>'
+
+
+class FakeElement:
+    def __init__(self, html: str = '', href: Optional[str] = None):
+        self.html = html
+        self.href = href
+
+    def get_attribute(self, name: str):
+        return {'outerHTML': self.html, 'href': self.href}.get(name)
+
+
+class FakeDriver:
+    """Navegador com uma listagem por URL: {url: (tbody, próxima página)}"""
+
+    def __init__(self, pages: Dict[str, tuple]):
+        self.pages = pages
+        self.current_url = None
+        self.loaded = []
+
+    def get(self, url: str):
+        self.current_url = url
+        self.loaded.append(url)
+
+    def execute_script(self, script, *args):
+        return True
+
+    def find_element(self, by, selector):
+        if by == By.TAG_NAME:
+            return FakeElement()
+        return FakeElement(self.pages[self.current_url][0])
+
+    def find_elements(self, by, selector):
+        next_url = self.pages[self.current_url][1]
+        return [FakeElement(href=next_url)] if next_url else []
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, headers: Optional[Dict] = None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.text = ''
+
+    def close(self):
+        pass
+
+
+class FakeSession:
+    """Servidor com ETag por URL: responde 304 quando o If-None-Match confere"""
+
+    def __init__(self, etags: Dict[str, str]):
+        self.etags = etags
+
+    def get(self, url, headers=None, **kwargs):
+        etag = self.etags[url]
+        if (headers or {}).get('If-None-Match') == etag:
+            return FakeResponse(304)
+        return FakeResponse(200, {'ETag': etag})
+
+
+def offline_scraper(tmp_path, driver: FakeDriver, session: FakeSession, main_page_url: str,
+                    max_matches: int = 50) -> AcademiaScraperImproved:
+    """Scraper sem Chrome: só o necessário para percorrer as listagens"""
+    scraper = AcademiaScraperImproved.__new__(AcademiaScraperImproved)
+    scraper.main_page_url = main_page_url
+    scraper.max_matches = max_matches
+    scraper.http_session = session
+    scraper.revalidator = PageRevalidator(str(tmp_path / 'revalidation.sqlite3'))
+    scraper.detail_cache = None
+    scraper.bulk_row_parsing = True
+    scraper.diagnostics = None
+    scraper.discovery_failed = False
+    scraper.listing_date = None
+    scraper.watchdog = SessionWatchdog()
+    scraper.driver = driver
+    scraper.driver_pool = None
+    return scraper
+
+
+class FakeApi:
+    """Endpoint de tips que aceita tudo e registra a ordem dos POSTs"""
+
+    def __init__(self, status_code: int = 201):
+        self.status_code = status_code
+        self.posts = []
+
+    def post(self, url, json=None, headers=None, timeout=None):
+        self.posts.append(json)
+        return FakeResponse(self.status_code)
+
+    def close(self):
+        pass
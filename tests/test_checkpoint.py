@@ -0,0 +1,19 @@
+from academia_scraper.checkpoint import RunCheckpoint, crawl_key
+from academia_scraper.frontier import listing_seeds
+
+BASE = 'https://site.test/'
+
+
+def key_for(spec: str) -> str:
+    return crawl_key(BASE, (url for url, _ in listing_seeds(BASE, spec)))
+
+
+def test_resume_only_with_the_same_listing_set(tmp_path):
+    checkpoint = RunCheckpoint(str(tmp_path / 'checkpoint.sqlite3'))
+    assert not checkpoint.begin(key_for('/,/stats/livescores/{date}'))
+    checkpoint.record({'id': 'match_1'})
+
+    assert not checkpoint.begin(key_for('/'))
+    assert checkpoint.record({'id': 'match_1'})[0] == 'pending'
+    assert checkpoint.begin(key_for('/'))
+    checkpoint.close()
@@ -0,0 +1,35 @@
+import threading
+
+from academia_scraper.daemon import ScraperDaemon, parse_schedules
+
+
+class FakeScraper:
+    max_matches = 5
+
+    def __init__(self):
+        self.runs = []
+
+    def ensure_browser(self):
+        return False
+
+    def run(self, keep_alive=False):
+        self.runs.append(self.max_matches)
+        return True
+
+    def close(self):
+        pass
+
+
+def test_run_on_start_fires_a_single_run():
+    scraper = FakeScraper()
+    daemon = ScraperDaemon(lambda: scraper, parse_schedules('full=06:00*50,refresh=30m*10'),
+                           run_on_start=True, health_interval=0.05)
+    # Fora da thread principal o daemon não instala os handlers de sinal
+    worker = threading.Thread(target=daemon.run_forever)
+    worker.start()
+    worker.join(0.3)
+    daemon.stop()
+    worker.join()
+
+    # Só a primeira agenda no boot; a refresh espera os 30 minutos dela
+    assert scraper.runs == [50]
@@ -0,0 +1,31 @@
+from datetime import date, datetime
+
+from academia_scraper import text_utils
+from academia_scraper.identity import content_hash
+from academia_scraper.listing import build_match_data
+
+
+class _Clock(datetime):
+    current = datetime(2026, 10, 17, 10, 0)
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.current
+
+
+def test_row_without_hour_keeps_its_hash_between_runs(monkeypatch):
+    monkeypatch.setattr(text_utils, 'datetime', _Clock)
+    text = "Ao vivo 67' Arsenal vs Chelsea Premier League"
+    link = 'https://site.test/stats/match/inglaterra/premier-league/arsenal/chelsea/4501205'
+
+    first = build_match_data(text, 1, link, listing_date=date(2026, 10, 17))
+    _Clock.current = datetime(2026, 10, 17, 11, 30)
+    second = build_match_data(text, 1, link, listing_date=date(2026, 10, 17))
+
+    assert first['matchTime'] == '2026-10-17'
+    assert content_hash(first) == content_hash(second)
+
+
+def test_row_with_hour_keeps_it():
+    match = build_match_data('13:00 Grêmio vs Internacional', 1, listing_date=date(2026, 10, 17))
+    assert match['matchTime'] == '2026-10-17 13:00'
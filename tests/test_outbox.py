@@ -0,0 +1,52 @@
+import threading
+
+from academia_scraper.dedup import DedupIndex
+from academia_scraper.outbox import TipOutbox
+from academia_scraper.submission import TipSubmitter
+from tests.fakes import FakeApi
+
+
+def tip(prediction: str) -> dict:
+    return {'id': 'match_0123456789abcdef', 'teams': 'Grêmio vs Internacional', 'league': 'Brasileirão',
+            'matchTime': '2026-10-17 13:00', 'prediction': prediction, 'odds': []}
+
+
+def submitter_for(tmp_path, api: FakeApi) -> TipSubmitter:
+    outbox = TipOutbox(str(tmp_path / 'outbox.sqlite3'), base_delay=0)
+    dedup = DedupIndex(str(tmp_path / 'sent_tips.sqlite3'))
+    return TipSubmitter(api_url='https://api.test/tips', session=api, outbox=outbox, dedup=dedup)
+
+
+def test_outbox_entry_superseded_by_this_run_is_not_replayed(tmp_path):
+    api = FakeApi()
+    submitter = submitter_for(tmp_path, api)
+    submitter.outbox.record_failure(tip('Casa vence')['id'], tip('Casa vence'), 'HTTP 503')
+
+    # A execução atual já tem a versão nova da partida
+    fresh = tip('Empate')
+    assert submitter.should_send(fresh)
+    submitter.begin_replay()
+    assert submitter.replay_outbox() == (0, 0)
+    submitter.submit(fresh)
+
+    assert [post['prediction'] for post in api.posts] == ['Empate']
+    assert submitter.outbox.pending_count() == 0
+
+
+def test_run_submissions_wait_for_the_replay(tmp_path):
+    api = FakeApi()
+    submitter = submitter_for(tmp_path, api)
+    submitter.outbox.record_failure(tip('Casa vence')['id'], tip('Casa vence'), 'HTTP 503')
+
+    submitter.begin_replay()
+    fresh = tip('Empate')
+    assert submitter.should_send(fresh)
+    sender = threading.Thread(target=submitter.submit, args=(fresh,))
+    sender.start()
+    sender.join(0.2)
+    # O envio novo fica parado até o reenvio terminar
+    assert sender.is_alive() and not api.posts
+    submitter.replay_outbox()
+    sender.join()
+
+    assert [post['prediction'] for post in api.posts] == ['Empate']
@@ -0,0 +1,26 @@
+from tests.fakes import FakeDriver, FakeSession, listing_table, offline_scraper
+
+FIRST = 'https://site.test/'
+SECOND = 'https://site.test/?page=2'
+
+
+def test_unchanged_first_page_still_follows_pagination(tmp_path, monkeypatch):
+    monkeypatch.setenv('FOLLOW_PAGINATION', 'true')
+    driver = FakeDriver({
+        FIRST: (listing_table(('13:00', 'Grêmio', 'Internacional', 'Brasileirão Serie A', 1)), SECOND),
+        SECOND: (listing_table(('16:00', 'Flamengo', 'Palmeiras', 'Brasileirão Serie A', 2)), None),
+    })
+    session = FakeSession({FIRST: '"v1"', SECOND: '"v1"'})
+    scraper = offline_scraper(tmp_path, driver, session, FIRST)
+    assert len(list(scraper.iter_main_page_rows())) == 2
+
+    # Segunda execução: a primeira página responde 304, a segunda mudou
+    session.etags[SECOND] = '"v2"'
+    driver.pages[SECOND] = (listing_table(('16:00', 'Flamengo', 'Palmeiras', 'Brasileirão Serie A', 2),
+                                          ('18:30', 'Juventus', 'AC Milan', 'Serie A Itália', 3)), None)
+    driver.loaded.clear()
+    rows = list(scraper.iter_main_page_rows())
+
+    assert driver.loaded == [SECOND]
+    assert [row['detail_url'].rsplit('/', 1)[1] for row in rows] == ['1', '2', '3']
+    scraper.revalidator.close()
@@ -0,0 +1,33 @@
+from academia_scraper import selector_stats
+from academia_scraper.extraction import extract_odds
+from academia_scraper.http_engine import LxmlPage
+from academia_scraper.selector_stats import SelectorStats
+
+# Página sem análise: só o cabeçalho casa com o fallback genérico [class*='odd']
+CONTENT_LESS = '<html><body><div class="odds-header">Odds 2</div></body></html>'
+NORMAL = ('<html><body><div class="odds-header">Odds 2</div>'
+          '<div class="preview_bet"><p class="preview_odd">Odd 1.95</p></div></body></html>')
+
+
+def test_fallback_wins_on_content_less_pages_do_not_skip_specific_selectors(monkeypatch):
+    monkeypatch.setenv('SELECTOR_STATS', 'true')
+    stats = SelectorStats(':memory:', reprobe_every=0, skip_after=20)
+    monkeypatch.setattr(selector_stats, '_stats', stats)
+
+    for _ in range(50):
+        assert [odd.value for odd in extract_odds(LxmlPage(CONTENT_LESS))] == [2.0]
+
+    # Sem reprova periódica: a página normal ainda passa pelo seletor específico
+    assert [odd.value for odd in extract_odds(LxmlPage(NORMAL))] == [1.95]
+    assert not any(entry['skipped'] for entry in stats.report()['odds']['selectors'].values())
+    stats.close()
+
+
+def test_specific_winner_still_skips_dead_selectors():
+    stats = SelectorStats(':memory:', reprobe_every=0, skip_after=3)
+    cascade = ['.old-layout p', '.new-layout p', 'p']
+    for _ in range(3):
+        tried = stats.order('odds', cascade)
+        stats.record('odds', '.new-layout p', tried, generic={'p'})
+    assert stats.order('odds', cascade) == ['.new-layout p', 'p']
+    stats.close()